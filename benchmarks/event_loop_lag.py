@@ -0,0 +1,94 @@
+"""
+Measure the event loop lag caused by the CPU-bound steps of the Remote Settings
+checks, when run on the loop or in the CPU pool.
+
+Usage::
+
+    poetry run python benchmarks/event_loop_lag.py --attachments 20 --changesets 20
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import sys
+import time
+import zipfile
+
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from checks.remotesettings.attachments_bundles import count_zip_files  # noqa: E402
+from checks.remotesettings.attachments_integrity import sha256_hexdigest  # noqa: E402
+from checks.remotesettings.validate_signatures import serialize  # noqa: E402
+from telescope import utils  # noqa: E402
+
+
+TICK_SECONDS = 0.005
+
+
+def fake_workload(attachments: int, changesets: int):
+    binary = os.urandom(5 * 1024 * 1024)
+    records = [
+        {"id": f"r{i:05d}", "last_modified": i, "field": "x" * 200} for i in range(5000)
+    ]
+    bundle = io.BytesIO()
+    with zipfile.ZipFile(bundle, "w") as z:
+        for i in range(2000):
+            z.writestr(f"file{i}.json", "{}")
+    steps = [(sha256_hexdigest, binary, True)] * attachments
+    steps += [(serialize, records, 42, False)] * changesets
+    steps += [(count_zip_files, bundle.getvalue(), False)] * changesets
+    return steps
+
+
+async def measure(steps, offload: bool):
+    lags = []
+    done = False
+
+    async def ticker():
+        while not done:
+            before = time.perf_counter()
+            await asyncio.sleep(TICK_SECONDS)
+            lags.append(time.perf_counter() - before - TICK_SECONDS)
+
+    async def step(func, *args):
+        *args, threads = args
+        if offload:
+            return await utils.run_in_pool(func, *args, threads=threads)
+        return func(*args)
+
+    task = asyncio.create_task(ticker())
+    before = time.perf_counter()
+    await utils.run_parallel(*[step(*s) for s in steps])
+    elapsed = time.perf_counter() - before
+    done = True
+    await task
+    lags.sort()
+    p99 = lags[int(len(lags) * 0.99)] if lags else 0
+    print(
+        f"{'pool' if offload else 'loop':>5}: total {elapsed * 1000:8.1f}ms, "
+        f"max lag {max(lags, default=0) * 1000:8.1f}ms, "
+        f"p99 lag {p99 * 1000:8.1f}ms"
+    )
+
+
+async def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--attachments", type=int, default=20)
+    parser.add_argument("--changesets", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    steps = fake_workload(args.attachments, args.changesets)
+    # Warm up the pools, so that processes spawning is not measured.
+    await utils.run_in_pool(sum, [])
+    await utils.run_in_pool(sum, [], threads=True)
+    try:
+        await measure(steps, offload=False)
+        await measure(steps, offload=True)
+    finally:
+        utils.shutdown_pools()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
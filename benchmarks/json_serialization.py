@@ -0,0 +1,110 @@
+"""
+Measure the time spent encoding and decoding JSON on realistic payloads of
+checks, with the standard library and with ``orjson``.
+
+Usage::
+
+    poetry run python benchmarks/json_serialization.py --records 20000 --rounds 20
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from telescope import config, utils  # noqa: E402
+
+
+def fake_payloads(records: int):
+    # Upstream Kinto changeset, as fetched by the Remote Settings checks.
+    changeset = {
+        "metadata": {"id": "cid", "signature": {"x5u": "https://x5u", "sig": "a" * 96}},
+        "changes": [
+            {
+                "id": f"r{i:06d}",
+                "last_modified": 1600000000000 + i,
+                "attachment": {
+                    "location": f"main/cid/{i:06d}.bin",
+                    "hash": "f" * 64,
+                    "size": 1024 + i,
+                },
+            }
+            for i in range(records)
+        ],
+        "timestamp": 1600000000000 + records,
+    }
+    # Data returned by checks (missing attachments, approvals, uptake breakdown).
+    missing = [f"https://cdn.example.com/main/cid/{i:06d}.bin" for i in range(records)]
+    approvals = [
+        {
+            "source": f"main-workspace/collection-{i}",
+            "datetime": "2020-01-01T00:00:00+00:00",
+            "by": "account:user@example.com",
+            "changes": {"create": i, "update": i * 2, "delete": 0},
+        }
+        for i in range(records // 20)
+    ]
+    uptake = {
+        f"source-{i}": {f"status-{s}": i * s for s in range(10)}
+        for i in range(records // 20)
+    }
+    results = [
+        {
+            "project": "remotesettings",
+            "name": name,
+            "success": False,
+            "datetime": datetime.now(timezone.utc).isoformat(),
+            "data": data,
+        }
+        for name, data in (
+            ("attachments", {"missing": missing}),
+            ("approvals", approvals),
+            ("uptake", uptake),
+        )
+    ]
+    return changeset, results
+
+
+def measure(func, rounds: int) -> float:
+    before = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - before) / rounds * 1000
+
+
+def main(argv):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    changeset, results = fake_payloads(args.records)
+    upstream_body = utils.json_encode(changeset).encode()
+    cached = (datetime.now(timezone.utc), False, results[0]["data"], 1.5)
+
+    steps = {
+        "decode upstream response": lambda: utils.json_decode(upstream_body),
+        "render checks response": lambda: utils.json_response(results),
+        "log check results": lambda: [utils.json_encode(r["data"]) for r in results],
+        "cache set (serialize)": lambda: utils.json_dumps(cached),
+        "cache round-trip": lambda: utils.json_loads(utils.json_dumps(cached)),
+    }
+    timings = {}
+    for library in ("json", "orjson"):
+        config.JSON_LIBRARY = library
+        timings[library] = {
+            step: measure(func, args.rounds) for step, func in steps.items()
+        }
+
+    print(f"{'':28}{'json':>10}{'orjson':>10}{'speedup':>10}")
+    for step in steps:
+        before, after = timings["json"][step], timings["orjson"][step]
+        print(f"{step:28}{before:8.2f}ms{after:8.2f}ms{before / after:9.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,145 @@
+"""
+Compare the throughput of the Remote Settings client with the ``kinto_http``
+(``requests`` based) client, against a local fake Kinto server.
+
+Usage::
+
+    poetry run python benchmarks/remotesettings_client.py --collections 50 --rounds 5
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import kinto_http
+from aiohttp import web
+
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from checks.remotesettings.utils import KintoClient  # noqa: E402
+from telescope import utils  # noqa: E402
+
+
+PAGE_SIZE = 100
+
+
+def fake_kinto_app(collections: int, records: int) -> web.Application:
+    changes = [
+        {"id": f"c{i}", "bucket": "main", "collection": f"cid{i}", "last_modified": i}
+        for i in range(collections)
+    ]
+    data = [
+        {"id": f"r{i}", "last_modified": i, "field": "x" * 200} for i in range(records)
+    ]
+
+    async def server_info(request):
+        return web.json_response({"project_name": "kinto", "capabilities": {}})
+
+    async def changeset(request):
+        if request.match_info["cid"] == "changes":
+            return web.json_response({"changes": changes, "timestamp": 42})
+        return web.json_response(
+            {"metadata": {}, "changes": data[:PAGE_SIZE], "timestamp": 42}
+        )
+
+    async def list_records(request):
+        offset = int(request.query.get("_token", 0))
+        headers = {"ETag": '"42"'}
+        if offset + PAGE_SIZE < len(data):
+            headers["Next-Page"] = str(
+                request.url.update_query(_token=offset + PAGE_SIZE)
+            )
+        page = {"data": data[offset : offset + PAGE_SIZE]}
+        return web.json_response(page, headers=headers)
+
+    app = web.Application()
+    app.router.add_get("/v1/", server_info)
+    app.router.add_get("/v1/buckets/{bid}/collections/{cid}/changeset", changeset)
+    app.router.add_get("/v1/buckets/{bid}/collections/{cid}/records", list_records)
+    return app
+
+
+async def workload(client):
+    entries = await client.get_monitor_changes()
+    await client.server_info()
+    await utils.run_parallel(
+        *[
+            client.get_changeset(entry["bucket"], entry["collection"])
+            for entry in entries
+        ],
+        *[
+            client.get_records(bucket=entry["bucket"], collection=entry["collection"])
+            for entry in entries
+        ],
+    )
+    return len(entries) * 2 + 2
+
+
+class KintoHttpClient:
+    """
+    The ``kinto_http`` client, as previously wrapped for the checks.
+    """
+
+    def __init__(self, server_url):
+        self._client = kinto_http.AsyncClient(server_url=server_url)
+
+    async def server_info(self):
+        return await self._client.server_info()
+
+    async def get_monitor_changes(self):
+        resp = await self._client.get_changeset(bucket="monitor", collection="changes")
+        return resp["changes"]
+
+    async def get_changeset(self, bucket, collection):
+        return await self._client.get_changeset(bucket=bucket, collection=collection)
+
+    async def get_records(self, **kwargs):
+        return await self._client.get_records(**kwargs)
+
+
+async def bench(name, factory, rounds):
+    durations = []
+    requests = 0
+    for _ in range(rounds):
+        before = time.perf_counter()
+        requests = await workload(factory())
+        durations.append(time.perf_counter() - before)
+    best = min(durations)
+    print(
+        f"{name:>12}: best {best * 1000:8.1f}ms, "
+        f"mean {sum(durations) / rounds * 1000:8.1f}ms "
+        f"({requests / best:.0f} calls/s)"
+    )
+
+
+async def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--collections", type=int, default=50)
+    parser.add_argument("--records", type=int, default=250)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    runner = web.AppRunner(fake_kinto_app(args.collections, args.records))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    server_url = f"http://127.0.0.1:{port}/v1"
+
+    try:
+        await bench("kinto_http", lambda: KintoHttpClient(server_url), args.rounds)
+        async with utils.shared_session():
+            await bench(
+                "aiohttp",
+                lambda: KintoClient(server_url=server_url),
+                args.rounds,
+            )
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
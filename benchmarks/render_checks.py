@@ -0,0 +1,89 @@
+"""
+Measure the requests per second served by ``/checks/remotesettings`` with warm
+caches, with and without the cache of serialized check results
+(see ``RENDER_CACHE_MAX_BYTES``).
+
+Usage::
+
+    poetry run python benchmarks/render_checks.py --records 20000 --requests 200
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from aiohttp.test_utils import TestClient, TestServer
+
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from telescope import config  # noqa: E402
+from telescope.app import Check, Checks, init_app  # noqa: E402
+
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from json_serialization import fake_payloads  # noqa: E402
+
+
+class FakeModule:
+    """Returns the data of a Remote Settings check."""
+
+    def __init__(self, name, data):
+        self.__name__ = f"checks.remotesettings.{name}"
+        self.data = data
+
+    async def run(self):
+        return False, self.data
+
+
+async def measure(records: int, requests: int) -> float:
+    _, results = fake_payloads(records)
+    checks = Checks(
+        [
+            Check(
+                "remotesettings", r["name"], "", module=FakeModule(r["name"], r["data"])
+            )
+            for r in results
+        ]
+    )
+    client = TestClient(TestServer(init_app(checks)))
+    await client.start_server()
+    try:
+        # Warm the caches.
+        await (await client.get("/checks/remotesettings")).read()
+
+        before = time.perf_counter()
+        for _ in range(requests):
+            response = await client.get("/checks/remotesettings")
+            await response.read()
+        return requests / (time.perf_counter() - before)
+    finally:
+        await client.close()
+
+
+def main(argv):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    config.BUGTRACKER_URL = None
+    config.HISTORY_DAYS = 0
+
+    max_bytes = config.RENDER_CACHE_MAX_BYTES
+    timings = {}
+    for label, value in (("before", 0), ("after", max_bytes)):
+        config.RENDER_CACHE_MAX_BYTES = value
+        timings[label] = asyncio.run(measure(args.records, args.requests))
+
+    print(f"{'':10}{'req/s':>10}")
+    for label, rps in timings.items():
+        print(f"{label:10}{rps:10.1f}")
+    print(f"{'speedup':10}{timings['after'] / timings['before']:9.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
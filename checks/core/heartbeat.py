@@ -7,7 +7,12 @@ The remote response is returned.
 import aiohttp
 
 from telescope.typings import CheckResult
-from telescope.utils import ClientSession, retry_decorator
+from telescope.utils import (
+    ClientSession,
+    json_decode,
+    request_slot,
+    retry_decorator,
+)
 
 
 EXPOSED_PARAMETERS = ["url", "expected_status"]
@@ -17,10 +22,11 @@ EXPOSED_PARAMETERS = ["url", "expected_status"]
 async def run(url: str, expected_status: int = 200) -> CheckResult:
     async with ClientSession() as session:
         try:
-            async with session.get(url) as response:
+            async with request_slot(url) as record, session.get(url) as response:
+                record(response)
                 success = response.status == expected_status
                 if "application/json" in response.headers["Content-Type"]:
-                    data = await response.json()
+                    data = await response.json(loads=json_decode)
                 else:
                     data = await response.text()
                 return success, data
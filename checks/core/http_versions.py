@@ -1,35 +1,146 @@
 """
 URL should support the specified versions.
+
+With the ``native`` probe, HTTP/1.x is probed with raw requests, HTTP/2 with the
+ALPN negotiation, and HTTP/3 is considered supported if advertised in the
+``Alt-Svc`` response header, since no QUIC stack is available.
 """
 
-import subprocess
+import asyncio
+import ssl
+import urllib.parse
+from typing import Dict, List, Optional, Set, Tuple
 
 from telescope import config
 from telescope.typings import CheckResult
+from telescope.utils import request_slot, run_parallel
 
 
-EXPOSED_PARAMETERS = ["url", "versions"]
+EXPOSED_PARAMETERS = ["url", "urls", "versions", "probe"]
 
 CURL_VERSION_FLAGS = ["--http1.0", "--http1.1", "--http2", "--http3"]
 
 
-async def run(url: str, versions: list[str] = ["1", "1.1", "2", "3"]) -> CheckResult:
-    supported_versions = set()
-    for flag in CURL_VERSION_FLAGS:
-        result = subprocess.run(
-            [
-                config.CURL_BINARY_PATH,
-                "-sI",
-                flag,
-                url,
-                "-o/dev/null",
-                "-w",
-                "%{http_version}\n",
-            ],
-            capture_output=True,
+async def curl_version(url: str, flag: str) -> str:
+    """
+    Return the HTTP version used by ``curl`` with the specified flag.
+    """
+    timeout = config.REQUESTS_TIMEOUT_SECONDS
+    async with request_slot(url):
+        process = await asyncio.create_subprocess_exec(
+            config.CURL_BINARY_PATH,
+            "-sI",
+            flag,
+            url,
+            "-o/dev/null",
+            "-w",
+            "%{http_version}\n",
+            "--max-time",
+            str(timeout),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
         )
-        supported_versions.add(result.stdout.strip().decode())
+        try:
+            stdout, _ = await asyncio.wait_for(process.communicate(), timeout + 1)
+        except asyncio.TimeoutError:
+            return ""
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+    return stdout.strip().decode()
+
+
+async def curl_versions(url: str) -> Set[str]:
+    results = await run_parallel(*[curl_version(url, f) for f in CURL_VERSION_FLAGS])
+    # Flags that timed out are unsupported.
+    return set(results) - {""}
+
+
+async def _open_connection(url: str, alpn: List[str]):
+    parsed = urllib.parse.urlparse(url)
+    secure = parsed.scheme == "https"
+    ssl_context: Optional[ssl.SSLContext] = None
+    if secure:
+        ssl_context = ssl.create_default_context()
+        ssl_context.set_alpn_protocols(alpn)
+    return await asyncio.open_connection(
+        parsed.hostname, parsed.port or (443 if secure else 80), ssl=ssl_context
+    )
+
+
+async def _head(url: str, protocol: str) -> Tuple[str, Dict[str, str]]:
+    """
+    Send a ``HEAD`` request with the specified protocol, and return the version
+    and headers of the response.
+    """
+    parsed = urllib.parse.urlparse(url)
+    path = (parsed.path or "/") + (f"?{parsed.query}" if parsed.query else "")
+    reader, writer = await _open_connection(url, alpn=["http/1.1"])
+    try:
+        writer.write(
+            (
+                f"HEAD {path} {protocol}\r\n"
+                f"Host: {parsed.netloc}\r\n"
+                "User-Agent: telescope\r\n"
+                "Connection: close\r\n\r\n"
+            ).encode("ascii")
+        )
+        await writer.drain()
+        head = await reader.readuntil(b"\r\n\r\n")
+    finally:
+        writer.close()
+    status_line, *lines = head.decode("latin-1").strip().split("\r\n")
+    headers = {}
+    for line in lines:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return status_line.split(" ", 1)[0], headers
+
+
+async def _negotiates_h2(url: str) -> bool:
+    if urllib.parse.urlparse(url).scheme != "https":
+        return False
+    _, writer = await _open_connection(url, alpn=["h2"])
+    try:
+        return writer.get_extra_info("ssl_object").selected_alpn_protocol() == "h2"
+    finally:
+        writer.close()
+
+
+async def _probe_http1_0(url: str) -> Set[str]:
+    version, _ = await _head(url, "HTTP/1.0")
+    return {"1"} if version.startswith("HTTP/1.") else set()
+
 
+async def _probe_http1_1(url: str) -> Set[str]:
+    version, headers = await _head(url, "HTTP/1.1")
+    if version != "HTTP/1.1":
+        return set()
+    # Clients discover HTTP/3 from this header.
+    protocols = [p.strip() for p in headers.get("alt-svc", "").split(",")]
+    return {"1.1", "3"} if any(p.startswith("h3") for p in protocols) else {"1.1"}
+
+
+async def _probe_http2(url: str) -> Set[str]:
+    return {"2"} if await _negotiates_h2(url) else set()
+
+
+async def native_probe(url: str, probe) -> Set[str]:
+    async with request_slot(url):
+        try:
+            return await asyncio.wait_for(probe(url), config.REQUESTS_TIMEOUT_SECONDS)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+            return set()
+
+
+async def native_versions(url: str) -> Set[str]:
+    probes = [_probe_http1_0, _probe_http1_1, _probe_http2]
+    results = await run_parallel(*[native_probe(url, probe) for probe in probes])
+    return set().union(*results)
+
+
+def compare(supported_versions: Set[str], versions: List[str]) -> CheckResult:
     if missing_versions := set(versions).difference(supported_versions):
         return False, f"HTTP version(s) {', '.join(missing_versions)} unsupported"
 
@@ -40,3 +151,27 @@ async def run(url: str, versions: list[str] = ["1", "1.1", "2", "3"]) -> CheckRe
         )
 
     return True, list(supported_versions)
+
+
+async def run(
+    url: str = "",
+    versions: list[str] = ["1", "1.1", "2", "3"],
+    urls: list[str] = [],
+    probe: str = "curl",
+) -> CheckResult:
+    all_urls = ([url] if url else []) + urls
+    if not all_urls:
+        return False, "No URL specified, use the url or urls parameter"
+    probes = {"curl": curl_versions, "native": native_versions}
+    if probe not in probes:
+        return False, f"Unknown probe {probe!r}, use one of {', '.join(probes)}"
+    probe_versions = probes[probe]
+    results = await run_parallel(*[probe_versions(u) for u in all_urls])
+
+    if urls:
+        # Report by URL when several are probed.
+        compared = {u: compare(s, versions) for u, s in zip(all_urls, results)}
+        success = all(success for success, _ in compared.values())
+        return success, {u: data for u, (_, data) in compared.items()}
+
+    return compare(results[0], versions)
@@ -9,7 +9,7 @@ import time
 import aiohttp
 
 from telescope.typings import CheckResult
-from telescope.utils import ClientSession
+from telescope.utils import ClientSession, request_slot
 
 
 EXPOSED_PARAMETERS = ["url", "max_milliseconds"]
@@ -20,7 +20,8 @@ async def run(url: str, max_milliseconds: int) -> CheckResult:
     async with ClientSession() as session:
         try:
             before = time.time()
-            async with session.get(url):
+            async with request_slot(url) as record, session.get(url) as response:
+                record(response)
                 elapsed = round((time.time() - before) * 1000)
                 return elapsed < max_milliseconds, elapsed
         except aiohttp.client_exceptions.ClientError as e:
@@ -14,6 +14,8 @@ from telescope import config
 from telescope.typings import CheckResult
 from telescope.utils import (
     ClientSession,
+    json_decode,
+    request_slot,
     retry_decorator,
     run_parallel,
     utcfromisoformat,
@@ -39,8 +41,13 @@ async def pulls_info(session, repo):
         if config.GITHUB_TOKEN:
             headers["Authorization"] = config.GITHUB_TOKEN
         logger.debug(f"Fetch list of pull requests from {url}")
-        async with session.get(url, headers=headers, raise_for_status=True) as response:
-            page = await response.json()
+        async with (
+            request_slot(url) as record,
+            session.get(url, headers=headers) as response,
+        ):
+            record(response)
+            response.raise_for_status()
+            page = await response.json(loads=json_decode)
             next = response.links.get("next", {}).get("url")
             return page, next
 
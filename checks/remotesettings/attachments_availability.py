@@ -4,12 +4,13 @@ Every attachment in every collection should be avaailable.
 The URLs of unreachable attachments is returned along with the number of checked records.
 """
 
+import functools
 import math
 
 import aiohttp
 
 from telescope.typings import CheckResult
-from telescope.utils import fetch_head, run_parallel
+from telescope.utils import DeadlineExceeded, fetch_head, iter_parallel, run_parallel
 
 from .utils import KintoClient
 
@@ -53,8 +54,21 @@ async def run(server: str, slice_percent: tuple[int, int] = (0, 100)) -> CheckRe
     lower_idx = math.floor(slice_percent[0] / 100.0 * len(urls))
     upper_idx = math.ceil(slice_percent[1] / 100.0 * len(urls))
 
-    futures = [test_url(url) for url in urls[lower_idx:upper_idx]]
-    results = await run_parallel(*futures)
-    missing = [url for url, success in zip(urls, results) if not success]
+    checked_urls = urls[lower_idx:upper_idx]
+    factories = (functools.partial(test_url, url) for url in checked_urls)
+    missing_indices = []
+    processed = 0
+    timed_out = False
+    try:
+        async for i, success in iter_parallel(factories):
+            processed += 1
+            if not success:
+                missing_indices.append(i)
+    except DeadlineExceeded:
+        timed_out = True
+    missing = [checked_urls[i] for i in sorted(missing_indices)]
 
-    return len(missing) == 0, {"missing": missing, "checked": len(urls)}
+    data = {"missing": missing, "checked": len(urls)}
+    if timed_out:
+        data["timed_out"] = f"Timed out, {processed} of {len(checked_urls)} processed"
+    return len(missing) == 0 and not timed_out, data
@@ -8,12 +8,14 @@ import io
 import logging
 import urllib.parse
 import zipfile
-from typing import Any
+from typing import Any, Optional
 
 from telescope.typings import CheckResult
 from telescope.utils import (
     ClientSession,
+    request_slot,
     retry_decorator,
+    run_in_pool,
     run_parallel,
     utcfromhttpdate,
     utcfromtimestamp,
@@ -31,8 +33,9 @@ logger = logging.getLogger(__name__)
 async def fetch_binary(url: str, **kwargs) -> tuple[int, str, bytes]:
     human_url = urllib.parse.unquote(url)
     logger.debug(f"Fetch binary from '{human_url}'")
-    async with ClientSession() as session:
+    async with request_slot(url) as record, ClientSession() as session:
         async with session.get(url, **kwargs) as response:
+            record(response)
             return (
                 response.status,
                 response.headers.get("Last-Modified", "Mon, 01 Jan 1970 00:00:00 GMT"),
@@ -40,6 +43,16 @@ async def fetch_binary(url: str, **kwargs) -> tuple[int, str, bytes]:
             )
 
 
+def count_zip_files(binary: bytes) -> Optional[int]:
+    """
+    Number of files in the specified zip archive, ``None`` if it is invalid.
+    """
+    try:
+        return len(zipfile.ZipFile(io.BytesIO(binary)).namelist())
+    except zipfile.BadZipFile:
+        return None
+
+
 async def run(
     server: str, auth: str, margin_publication_hours: int = 12
 ) -> CheckResult:
@@ -92,10 +105,8 @@ async def run(
             success = False
             continue
 
-        try:
-            z = zipfile.ZipFile(io.BytesIO(binary))
-            nfiles = len(z.namelist())
-        except zipfile.BadZipFile:
+        nfiles = await run_in_pool(count_zip_files, binary)
+        if nfiles is None:
             result[f"{bid}/{cid}"] = {"status": "bad zip"}
             success = False
             continue
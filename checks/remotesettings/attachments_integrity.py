@@ -4,21 +4,34 @@ Every attachment in every collection has the right size and hash.
 The URLs of invalid attachments is returned along with the number of checked records.
 """
 
+import functools
 import hashlib
 import math
 
 import aiohttp
 
 from telescope.typings import CheckResult
-from telescope.utils import ClientSession, run_parallel
+from telescope.utils import (
+    ClientSession,
+    DeadlineExceeded,
+    iter_parallel,
+    request_slot,
+    run_in_pool,
+    run_parallel,
+)
 
 from .utils import KintoClient
 
 
+def sha256_hexdigest(binary: bytes) -> str:
+    return hashlib.sha256(binary).hexdigest()
+
+
 async def test_attachment(session, attachment):
     url = attachment["location"]
     try:
-        async with session.get(url) as response:
+        async with request_slot(url) as record, session.get(url) as response:
+            record(response)
             binary = await response.read()
     except aiohttp.client_exceptions.ClientError as exc:
         return {"url": url, "error": str(exc)}, False
@@ -26,8 +39,9 @@ async def test_attachment(session, attachment):
     if (bz := len(binary)) != (az := attachment["size"]):
         return {"url": url, "error": f"size differ ({bz}!={az})"}, False
 
-    h = hashlib.sha256(binary)
-    if (bh := h.hexdigest()) != (ah := attachment["hash"]):
+    # hashlib releases the GIL, no need to copy the binary to another process.
+    bh = await run_in_pool(sha256_hexdigest, binary, threads=True)
+    if bh != (ah := attachment["hash"]):
         return {"url": url, "error": f"hash differ ({bh}!={ah})"}, False
 
     return {}, True
@@ -65,11 +79,27 @@ async def run(server: str, slice_percent: tuple[int, int] = (0, 100)) -> CheckRe
     lower_idx = math.floor(slice_percent[0] / 100.0 * len(attachments))
     upper_idx = math.ceil(slice_percent[1] / 100.0 * len(attachments))
 
+    # Only keep the failures, since there can be a lot of attachments.
+    bad_by_index = {}
+    checked_attachments = attachments[lower_idx:upper_idx]
+    processed = 0
+    timed_out = False
     async with ClientSession() as session:
-        futures = [
-            test_attachment(session, attachment)
-            for attachment in attachments[lower_idx:upper_idx]
-        ]
-        results = await run_parallel(*futures)
-    bad = [result for result, success in results if not success]
-    return len(bad) == 0, {"bad": bad, "checked": len(attachments)}
+        factories = (
+            functools.partial(test_attachment, session, attachment)
+            for attachment in checked_attachments
+        )
+        try:
+            async for i, (result, success) in iter_parallel(factories):
+                processed += 1
+                if not success:
+                    bad_by_index[i] = result
+        except DeadlineExceeded:
+            timed_out = True
+    bad = [bad_by_index[i] for i in sorted(bad_by_index)]
+
+    data = {"bad": bad, "checked": len(attachments)}
+    if timed_out:
+        total = len(checked_attachments)
+        data["timed_out"] = f"Timed out, {processed} of {total} processed"
+    return len(bad) == 0 and not timed_out, data
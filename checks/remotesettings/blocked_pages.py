@@ -8,12 +8,13 @@ timestamps.
 
 import logging
 import re
+from typing import List
 
 import aiohttp
 from bs4 import BeautifulSoup
 
 from telescope.typings import CheckResult
-from telescope.utils import fetch_head, fetch_text, run_parallel
+from telescope.utils import fetch_head, fetch_text, run_in_pool, run_parallel
 
 from .utils import KintoClient
 
@@ -31,13 +32,15 @@ async def test_url(url):
         return False
 
 
+def extract_links(html: str) -> List[str]:
+    soup = BeautifulSoup(html, features="html.parser")
+    return [str(link["href"]) for link in soup.find_all("a", href=re.compile(".html$"))]
+
+
 async def run(remotesettings_server: str, blocked_pages: str) -> CheckResult:
     # Read blocked page index to obtain the links.
     blocked_index = await fetch_text(blocked_pages)
-    soup = BeautifulSoup(blocked_index, features="html.parser")
-    urls = []
-    for link in soup.find_all("a", href=re.compile(".html$")):
-        urls.append(link["href"])
+    urls = await run_in_pool(extract_links, blocked_index)
 
     # Make sure no link is broken.
     futures = [test_url(f"{blocked_pages}/{url}") for url in urls]
@@ -14,7 +14,7 @@ from autograph_utils import split_pem
 from cryptography.hazmat.backends import default_backend as crypto_default_backend
 
 from telescope.typings import CheckResult
-from telescope.utils import fetch_text, run_parallel, utcnow
+from telescope.utils import fetch_text, run_in_pool, run_parallel, utcnow
 
 from .utils import KintoClient
 
@@ -34,17 +34,21 @@ LOWER_MIN_REMAINING_DAYS = 7
 UPPER_MIN_REMAINING_DAYS = 60
 
 
-async def fetch_certs(x5u):
-    cert_pem = await fetch_text(x5u)
-    logger.debug(f"Parse PEM file from {x5u}")
+def parse_certs(cert_pem: str):
     pems = split_pem(cert_pem.encode("utf-8"))
-    certs = [
+    return [
         cryptography.x509.load_pem_x509_certificate(
             pem, backend=crypto_default_backend()
         )
         for pem in pems
     ]
-    return certs
+
+
+async def fetch_certs(x5u):
+    cert_pem = await fetch_text(x5u)
+    logger.debug(f"Parse PEM file from {x5u}")
+    # Certificates objects can't be pickled, parse them in a thread.
+    return await run_in_pool(parse_certs, cert_pem, threads=True)
 
 
 async def fetch_collection_metadata(server_url, entry):
@@ -5,12 +5,13 @@ If this check fails, this is very likely to be a software issue. Some insights a
 the consistencies are returned for each concerned collection.
 """
 
+import functools
 import logging
 
 from kinto_http.utils import collection_diff
 
 from telescope.typings import CheckResult
-from telescope.utils import run_parallel
+from telescope.utils import DeadlineExceeded, iter_parallel
 
 from .utils import KintoClient, fetch_signed_resources, human_diff
 
@@ -106,13 +107,27 @@ async def has_inconsistencies(server_url, auth, resource):
 async def run(server: str, auth: str) -> CheckResult:
     resources = await fetch_signed_resources(server, auth)
 
-    futures = [has_inconsistencies(server, auth, resource) for resource in resources]
-    results = await run_parallel(*futures)
+    factories = [
+        functools.partial(has_inconsistencies, server, auth, resource)
+        for resource in resources
+    ]
+    results = {}
+    timed_out = False
+    try:
+        async for i, error_info in iter_parallel(factories, fail_fast=True):
+            results[i] = error_info
+    except DeadlineExceeded:
+        timed_out = True
 
     inconsistent = {
-        "{bucket}/{collection}".format(**resource["destination"]): error_info.strip()
-        for resource, error_info in zip(resources, results)
+        "{bucket}/{collection}".format(
+            **resources[i]["destination"]
+        ): error_info.strip()
+        for i, error_info in sorted(results.items())
         if error_info
     }
 
+    if timed_out:
+        processed = f"{len(results)} of {len(resources)} processed"
+        return False, {**inconsistent, "timed_out": f"Timed out, {processed}"}
     return len(inconsistent) == 0, inconsistent
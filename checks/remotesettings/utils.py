@@ -1,82 +1,333 @@
+import asyncio
 import copy
+import json
+import random
 import re
-from typing import Any, Dict, List
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
+import aiohttp
 import backoff
-import kinto_http
-import requests
-from kinto_http.session import USER_AGENT as KINTO_USER_AGENT
 
 from telescope import config, utils
 
 
-USER_AGENT = f"telescope {KINTO_USER_AGENT}"
+USER_AGENT = f"telescope aiohttp/{aiohttp.__version__}"
 
 
 retry_timeout = backoff.on_exception(
     backoff.expo,
-    (requests.exceptions.Timeout, requests.exceptions.ConnectionError),
+    (aiohttp.ClientConnectionError, asyncio.TimeoutError),
     max_tries=config.REQUESTS_MAX_RETRIES,
 )
 
 
+def _auth_header(auth) -> Optional[str]:
+    """
+    Turn the ``auth`` parameter (``"user:pass"``, ``("user", "pass")`` or
+    ``"Bearer xyz"``) into an ``Authorization`` header value.
+    """
+    if not auth:
+        return None
+    if isinstance(auth, tuple):
+        return aiohttp.BasicAuth(*auth).encode()
+    if ":" in auth:
+        return aiohttp.BasicAuth(*auth.split(":", 1)).encode()
+    if "bearer" in auth.lower():
+        return auth
+    raise ValueError(
+        "Unsupported `auth` parameter value. Must be a tuple() or string "
+        "in the form of `user:pass` or `Bearer xyz`"
+    )
+
+
+def _encode_params(params: Dict[str, Any]) -> Dict[str, str]:
+    # Same querystring encoding as ``kinto_http``.
+    encoded = {}
+    for key, value in params.items():
+        if key.startswith("in_") or key.startswith("exclude_"):
+            encoded[key] = ",".join(value)
+        elif isinstance(value, str):
+            encoded[key] = value
+        else:
+            encoded[key] = json.dumps(value)
+    return encoded
+
+
 class KintoClient:
     """
+    A minimal asynchronous Remote Settings client, for the endpoints used by
+    the checks. Requests go through the pooled session shared with the other
+    HTTP helpers, the server health is tracked in its circuit breaker, and the
+    requests are paced by its rate limiter.
+
     This Kinto client will retry the requests if they fail for timeout, and
     if the server replies with a 5XX.
     """
 
-    def __init__(self, *args, **kwargs):
-        kwargs.setdefault("retry", config.REQUESTS_MAX_RETRIES)
-        kwargs.setdefault("timeout", config.REQUESTS_TIMEOUT_SECONDS)
+    # Exponential back off between retries of error responses.
+    RETRY_BASE_SECONDS = 0.5
+    RETRY_MAX_SECONDS = 10.0
+
+    def __init__(
+        self,
+        server_url: str,
+        auth=None,
+        bucket: Optional[str] = None,
+        collection: Optional[str] = None,
+        retry: int = config.REQUESTS_MAX_RETRIES,
+    ):
+        self.server_url = server_url.rstrip("/")
+        self.bucket_name = bucket
+        self.collection_name = collection
+        self.retry = retry
+        self.headers = {"User-Agent": USER_AGENT, **config.DEFAULT_REQUEST_HEADERS}
+        authorization = _auth_header(auth)
+        if authorization:
+            self.headers["Authorization"] = authorization
+        self._records_timestamp: Dict[str, str] = {}
+
+    def _collection_endpoint(self, bucket, collection) -> str:
+        bucket = bucket or self.bucket_name
+        collection = collection or self.collection_name
+        return f"/buckets/{bucket}/collections/{collection}"
+
+    @retry_timeout
+    async def _request(
+        self, method: str, endpoint: str, params: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Any, Dict[str, str]]:
+        url = endpoint if "://" in endpoint else self.server_url + endpoint
+        params = _encode_params(params or {})
+        breaker = utils.CircuitBreaker.for_url(url)
+        retry = self.retry
+        while True:
+            breaker.before_request()
+            try:
+                async with (
+                    utils.request_slot(url) as record,
+                    utils.ClientSession() as session,
+                ):
+                    async with session.request(
+                        method, url, params=params, headers=self.headers
+                    ) as response:
+                        record(response)
+                        status, headers = response.status, dict(response.headers)
+                        if status >= 400:
+                            body = await response.text()
+                        elif method == "HEAD" or status in (204, 304):
+                            body = None
+                        else:
+                            body = await response.json(
+                                content_type=None, loads=utils.json_decode
+                            )
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                breaker.record_failure()
+                raise
+            if status >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
+            if status < 400:
+                return body, headers
+            if retry > 0 and (status >= 500 or status in (409, 429)):
+                # With full jitter, so that clients don't retry in lockstep.
+                # The rate limiter of the host also waits for its ``Retry-After``.
+                attempt = self.retry - retry
+                retry -= 1
+                delay = min(
+                    self.RETRY_MAX_SECONDS, self.RETRY_BASE_SECONDS * 2**attempt
+                )
+                await asyncio.sleep(random.uniform(0, delay))  # nosec
+                continue
+            raise aiohttp.ClientResponseError(
+                response.request_info,
+                response.history,
+                status=status,
+                message=f"{status} - {body}",
+                headers=response.headers,
+            )
+
+    async def _paginated(self, endpoint: str, **kwargs) -> AsyncIterator[List[Dict]]:
+        """
+        Yield the pages of the specified list endpoint, following the
+        ``Next-Page`` links. Only the first page is fetched if ``_limit`` is
+        specified.
+        """
+        pages = 1 if "_limit" in kwargs else float("inf")
+        url: Optional[str] = endpoint
+        params: Optional[Dict[str, Any]] = kwargs
+        while url is not None and pages > 0:
+            body, headers = await self._request("GET", url, params=params)
+            if url == endpoint:
+                self._records_timestamp[endpoint] = headers.get("ETag", "").strip('"')
+            yield body["data"]
+            # The next page URL already contains the querystring.
+            url, params = headers.get("Next-Page"), None
+            pages -= 1
+
+    async def _collect(self, endpoint: str, **kwargs) -> List[Dict]:
+        # Objects that moved between pages are only returned once.
+        objects: Dict[str, Dict] = {}
+        async for page in self._paginated(endpoint, **kwargs):
+            objects.update((obj["id"], obj) for obj in page)
+        return list(objects.values())
+
+    async def server_info(self) -> Dict:
+        body, _ = await self._request("GET", "/")
+        return body
+
+    async def get_collection(self, *, id=None, bucket=None, **kwargs) -> Dict:
+        endpoint = self._collection_endpoint(bucket, id)
+        body, _ = await self._request("GET", endpoint, params=kwargs)
+        return body
+
+    async def iter_records(
+        self, *, collection=None, bucket=None, **kwargs
+    ) -> AsyncIterator[Dict]:
+        """
+        Yield the records page by page, without holding the whole list in memory.
+        """
+        endpoint = self._collection_endpoint(bucket, collection) + "/records"
+        async for page in self._paginated(endpoint, **kwargs):
+            for record in page:
+                yield record
+
+    async def get_records(
+        self, *, collection=None, bucket=None, **kwargs
+    ) -> List[Dict]:
+        endpoint = self._collection_endpoint(bucket, collection) + "/records"
+        return await self._collect(endpoint, **kwargs)
+
+    async def get_monitor_changes(self, bust_cache=False, **kwargs) -> List[Dict]:
+        """
+        Return the entries of ``monitor/changes``. Unless a custom querystring
+        is specified, the list is shared with the other clients of the same
+        server and must not be modified.
+        """
+        if kwargs:
+            resp = await self.get_changeset(
+                bucket="monitor", collection="changes", bust_cache=bust_cache, **kwargs
+            )
+            return resp["changes"]
+        changes = MonitorChanges.for_server(self.server_url)
+        return await changes.get(self, force=bust_cache)
+
+    async def get_changeset(
+        self, bucket=None, collection=None, bust_cache=False, **kwargs
+    ) -> Dict[str, Any]:
         kwargs.setdefault(
-            "headers", {"User-Agent": USER_AGENT, **config.DEFAULT_REQUEST_HEADERS}
+            "_expected",
+            random.randint(999999000000, 999999999999) if bust_cache else 0,  # nosec
         )
-        self._client = kinto_http.AsyncClient(*args, **kwargs)
+        endpoint = self._collection_endpoint(bucket, collection) + "/changeset"
+        body, _ = await self._request("GET", endpoint, params=kwargs)
+        return body
 
-    @retry_timeout
-    async def server_info(self, *args, **kwargs) -> Dict:
-        return await self._client.server_info(*args, **kwargs)
+    async def get_record(self, *, id, collection=None, bucket=None, **kwargs) -> Dict:
+        endpoint = self._collection_endpoint(bucket, collection) + f"/records/{id}"
+        body, _ = await self._request("GET", endpoint, params=kwargs)
+        return body
 
-    @retry_timeout
-    async def get_collection(self, *args, **kwargs) -> Dict:
-        return await self._client.get_collection(*args, **kwargs)
+    async def get_records_timestamp(self, *, collection=None, bucket=None) -> str:
+        endpoint = self._collection_endpoint(bucket, collection) + "/records"
+        if endpoint not in self._records_timestamp:
+            _, headers = await self._request("HEAD", endpoint)
+            self._records_timestamp[endpoint] = headers.get("ETag", "").strip('"')
+        return self._records_timestamp[endpoint]
 
-    @retry_timeout
-    async def get_records(self, *args, **kwargs) -> List[Dict]:
-        return await self._client.get_records(*args, **kwargs)
+    async def get_history(self, *, bucket=None, **kwargs) -> List[Dict]:
+        endpoint = f"/buckets/{bucket or self.bucket_name}/history"
+        return await self._collect(endpoint, **kwargs)
 
-    @retry_timeout
-    async def get_monitor_changes(self, **kwargs) -> List[Dict]:
-        resp = await self.get_changeset(
-            bucket="monitor", collection="changes", **kwargs
-        )
-        return resp["changes"]
+    async def get_group(self, *, id, bucket=None) -> Dict:
+        endpoint = f"/buckets/{bucket or self.bucket_name}/groups/{id}"
+        body, _ = await self._request("GET", endpoint)
+        return body
 
-    @retry_timeout
-    async def get_changeset(self, *args, **kwargs) -> Dict[str, Any]:
-        return await self._client.get_changeset(*args, **kwargs)
-
-    @retry_timeout
-    async def get_record(self, *args, **kwargs) -> Dict:
-        return await self._client.get_record(*args, **kwargs)
-
-    @retry_timeout
-    async def get_records_timestamp(self, *args, **kwargs) -> str:
-        return await self._client.get_records_timestamp(*args, **kwargs)
 
-    @retry_timeout
-    async def get_history(self, *args, **kwargs) -> List[Dict]:
-        return await self._client.get_history(*args, **kwargs)
+class MonitorChanges:
+    """
+    Server-scoped snapshot of the ``monitor/changes`` entries, fetched at most
+    once per ``MONITOR_CHANGES_TTL_SECONDS`` and shared by all the checks.
+    Concurrent callers wait for the same request.
+    """
 
-    @retry_timeout
-    async def get_group(self, *args, **kwargs) -> Dict:
-        return await self._client.get_group(*args, **kwargs)
+    _registry: Dict[str, "MonitorChanges"] = {}
+
+    def __init__(self, server_url: str, ttl: Optional[int] = None):
+        self.server_url = server_url
+        self.ttl = config.MONITOR_CHANGES_TTL_SECONDS if ttl is None else ttl
+        self._entries: Optional[List[Dict]] = None
+        self._fetched_at = 0.0
+        self._inflight: Dict[bool, asyncio.Task] = {}
+
+    @classmethod
+    def for_server(cls, server_url: str) -> "MonitorChanges":
+        if server_url not in cls._registry:
+            cls._registry[server_url] = cls(server_url)
+        return cls._registry[server_url]
+
+    async def get(self, client: KintoClient, force: bool = False) -> List[Dict]:
+        """
+        Return the current entries, using the specified client to refresh them
+        if they are older than the TTL, or if ``force`` is true.
+        """
+        fresh = time.monotonic() - self._fetched_at < self.ttl
+        if self._entries is not None and fresh and not force:
+            return self._entries
+
+        # Cache-busting callers only join cache-busting requests.
+        inflight = (
+            self._pending(True)
+            if force
+            else (self._pending(False) or self._pending(True))
+        )
+        if inflight is None:
+            inflight = asyncio.create_task(self._fetch(client, force))
+            self._inflight[force] = inflight
+        # Shield the shared request from the cancellation of one of its callers.
+        return await asyncio.shield(inflight)
+
+    def _pending(self, bust_cache: bool) -> Optional[asyncio.Task]:
+        task = self._inflight.get(bust_cache)
+        if (
+            task is None
+            or task.done()
+            or task.get_loop() is not asyncio.get_running_loop()
+        ):
+            return None
+        return task
+
+    async def _fetch(self, client: KintoClient, bust_cache: bool) -> List[Dict]:
+        # The task copied the context of the first caller, but is shared by all.
+        with utils.without_deadline():
+            resp = await client.get_changeset(
+                bucket="monitor", collection="changes", bust_cache=bust_cache
+            )
+        self._entries = resp["changes"]
+        self._fetched_at = time.monotonic()
+        return self._entries
+
+
+# Signed resources per (server, auth), with the monitor/changes timestamp they match.
+_signed_resources: Dict[Tuple[str, str], Tuple[Optional[int], List[Dict]]] = {}
 
 
 async def fetch_signed_resources(server_url: str, auth: str) -> List[Dict[str, Dict]]:
-    # List signed collection using capabilities.
+    """
+    Return the list of signed collections, with their source, preview and
+    destination. The list is shared between callers and reused as long as
+    the ``monitor/changes`` timestamp does not change.
+    """
     client = KintoClient(server_url=server_url, auth=auth)
+    monitored = await client.get_monitor_changes()
+    timestamp = max((e["last_modified"] for e in monitored), default=None)
+    cached = _signed_resources.get((server_url, auth))
+    if cached is not None and cached[0] == timestamp:
+        return cached[1]
+
+    # List signed collection using capabilities.
     info = await client.server_info()
     try:
         resources = info["capabilities"]["signer"]["resources"]
@@ -100,8 +351,7 @@ async def fetch_signed_resources(server_url: str, auth: str) -> List[Dict[str, D
             preview_buckets.add(resource["preview"]["bucket"])
 
     resources = []
-    monitored = await client.get_monitor_changes(_sort="bucket,collection")
-    for entry in monitored:
+    for entry in sorted(monitored, key=lambda e: (e["bucket"], e["collection"])):
         bid = entry["bucket"]
         cid = entry["collection"]
 
@@ -123,6 +373,7 @@ async def fetch_signed_resources(server_url: str, auth: str) -> List[Dict[str, D
 
         resources.append(r)
 
+    _signed_resources[(server_url, auth)] = (timestamp, resources)
     return resources
 
 
@@ -19,7 +19,7 @@ from autograph_utils import (
 )
 
 from telescope.typings import CheckResult
-from telescope.utils import ClientSession, retry_decorator, run_parallel
+from telescope.utils import ClientSession, retry_decorator, run_in_pool, run_parallel
 
 from .utils import KintoClient
 
@@ -27,6 +27,15 @@ from .utils import KintoClient
 logger = logging.getLogger(__name__)
 
 
+def serialize(records, timestamp) -> bytes:
+    return canonicaljson.dumps(
+        {
+            "data": sorted(records, key=operator.itemgetter("id")),
+            "last_modified": str(timestamp),
+        }
+    ).encode("utf-8")
+
+
 @retry_decorator
 async def validate_signature(verifier, metadata, records, timestamp):
     signature = metadata.get("signature")
@@ -34,12 +43,7 @@ async def validate_signature(verifier, metadata, records, timestamp):
     x5u = signature["x5u"]
     signature = signature["signature"]
 
-    data = canonicaljson.dumps(
-        {
-            "data": sorted(records, key=operator.itemgetter("id")),
-            "last_modified": str(timestamp),
-        }
-    ).encode("utf-8")
+    data = await run_in_pool(serialize, records, timestamp)
 
     return await verifier.verify(data, signature, x5u)
 
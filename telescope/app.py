@@ -1,12 +1,18 @@
+import argparse
 import asyncio
+import functools
+import hashlib
 import importlib
 import json
 import logging.config
 import os
-import subprocess
+import sys
 import time
 from typing import Any, Dict, List, Optional, Tuple, Union
 
+# Only used to generate XML, never to parse untrusted input.
+from xml.etree import ElementTree  # nosec B405
+
 import aiohttp_cors
 import sentry_sdk
 from aiohttp import web
@@ -14,7 +20,8 @@ from sentry_sdk import capture_message
 from sentry_sdk.integrations.aiohttp import AioHttpIntegration
 from termcolor import cprint
 
-from . import config, middleware, utils
+from . import config, middleware, subscriptions, utils, workers
+from .scheduler import Scheduler
 
 
 HTML_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "html")
@@ -66,6 +73,11 @@ class Checks:
 
 
 class Check:
+    # Background refreshes of stale results, by cache key.
+    _refreshes: Dict[str, asyncio.Task] = {}
+    # Time left to checks to return partial results once their timeout is reached.
+    DEADLINE_GRACE_SECONDS = 1
+
     def __init__(
         self,
         project: str,
@@ -76,12 +88,18 @@ class Check:
         ttl: Optional[int] = None,
         params: Optional[Dict[str, Any]] = None,
         plot: Optional[str] = None,
+        stale_ttl: Optional[int] = None,
+        timeout: Optional[int] = None,
     ):
         self.project = project
         self.name = name
         self.description = description
         self.tags = tags or []
         self.ttl = ttl or config.DEFAULT_TTL  # ttl=0 is not supported.
+        # Serve expired results for this number of seconds while refreshing.
+        self.stale_ttl = stale_ttl or 0
+        # Cancel the remaining work after this number of seconds.
+        self.timeout = timeout
 
         self.module = (
             importlib.import_module(module) if isinstance(module, str) else module
@@ -100,52 +118,164 @@ class Check:
 
         self._plot = plot
 
+    @property
+    def cache_key(self) -> str:
+        # Caution: the cache key may contain secrets and should never be exposed.
+        # We're fine here since the cache is in memory.
+        identifier = f"{self.project}/{self.name}"
+        return f"{identifier}-" + ",".join(f"{k}:{v}" for k, v in self.params.items())
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Hash of this check configuration, to detect changes between restarts.
+        """
+        conf = [getattr(self.module, "__name__"), self.params, self.ttl, self.stale_ttl]
+        serialized = json.dumps(conf, sort_keys=True, default=repr)
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    def age(self, result) -> float:
+        """
+        Number of seconds since the specified result was obtained.
+        """
+        timestamp, _, _, _ = result
+        return (utils.utcnow() - timestamp).total_seconds()
+
+    def is_stale(self, result) -> bool:
+        return self.stale_ttl > 0 and self.age(result) > self.ttl
+
+    async def remaining(self, cache, result) -> float:
+        """
+        Number of seconds before the specified cached result expires.
+        """
+        ttl = await cache.attl(self.cache_key)
+        if ttl is None:
+            return 0
+        # Results are kept longer in cache to be served stale, errors shorter.
+        return min(ttl, self.ttl - self.age(result))
+
     async def run(
-        self, cache=None, events=None, force=False
+        self, cache=None, events=None, force=False, margin: Optional[float] = None
     ) -> Tuple[Any, bool, Any, float]:
-        identifier = f"{self.project}/{self.name}"
+        """
+        Return the cached result, or execute the check. With ``force``, the
+        check is executed anyway, and with ``margin``, only if its cached result
+        expires within this number of seconds.
+        """
+        cache_key = self.cache_key
+
+        if cache and not force and margin is None:
+            # Don't wait for the lock, held by runs (eg. refreshes ahead of
+            # expiration), while there is a valid result.
+            result = await cache.aget(cache_key)
+            if result is not None:
+                if self.is_stale(result):
+                    # Serve an expired result immediately, and refresh it in background.
+                    self._refresh_in_background(cache, events)
+                return result
 
-        # Caution: the cache key may contain secrets and should never be exposed.
-        # We're fine here since the cache is in memory.
-        cache_key = f"{identifier}-" + ",".join(
-            f"{k}:{v}" for k, v in self.params.items()
-        )
+        return await self._run_locked(cache, events, force, margin)
+
+    async def _run_locked(self, cache, events, force, margin=None):
+        cache_key = self.cache_key
 
         # Wait for any other parallel run of this same check to finish
         # in order to get its result value from the cache.
         async with cache.lock(cache_key) if cache else utils.DummyLock():
-            result = cache.get(cache_key) if cache else None
+            result = await cache.aget(cache_key) if cache else None
 
             last_success = None
             if result is not None:
                 # See last run info.
                 _, last_success, _, _ = result
 
-            if result is None or force:
+            expiring = (
+                margin is not None
+                and result is not None
+                # Unless another process refreshed it meanwhile.
+                and await self.remaining(cache, result) <= margin
+            )
+            if result is None or force or expiring or self.is_stale(result):
                 # Execute the check again.
-                before = time.time()
-                success, data = await self.func(**self.params)
-                duration = time.time() - before
-                result = utils.utcnow(), success, data, duration
-                if cache:
-                    cache.set(cache_key, result, ttl=self.ttl)
-
-                # Notify listeners about check run/state.
-                if events:
-                    payload = {
-                        "check": self,
-                        "result": {
-                            "success": success,
-                            "data": data,
-                        },
-                    }
-                    events.emit("check:run", payload=payload)
-                    is_first_failure = last_success is None and not success
-                    is_check_changed = (
-                        last_success is not None and last_success != success
-                    )
-                    if is_first_failure or is_check_changed:
-                        events.emit("check:state:changed", payload=payload)
+                result = await self._execute(cache, events, last_success)
+
+        return result
+
+    @classmethod
+    async def cancel_refreshes(cls):
+        """
+        Cancel the refreshes of stale results that are still running.
+        """
+        refreshes = dict(cls._refreshes)
+        for task in refreshes.values():
+            task.cancel()
+        await asyncio.gather(*refreshes.values(), return_exceptions=True)
+        # Tasks cancelled before they started did not unregister themselves.
+        for cache_key, task in refreshes.items():
+            if cls._refreshes.get(cache_key) is task:
+                del cls._refreshes[cache_key]
+
+    def _refresh_in_background(self, cache, events):
+        cache_key = self.cache_key
+        if cache_key in self._refreshes:
+            # Already being refreshed.
+            return
+
+        async def refresh():
+            try:
+                await self._run_locked(cache, events, force=False)
+            except Exception as e:
+                logger.exception(e)
+            finally:
+                del self._refreshes[cache_key]
+
+        self._refreshes[cache_key] = asyncio.create_task(refresh())
+
+    async def _execute(self, cache, events, last_success):
+        before = time.time()
+        ttl = self.ttl + self.stale_ttl
+        try:
+            with utils.deadline(self.timeout):
+                async with utils.within_deadline(grace=self.DEADLINE_GRACE_SECONDS):
+                    success, data = await self.func(**self.params)
+        except utils.DeadlineExceeded:
+            logger.warning(f"Check {self.project}/{self.name} timed out")
+            success, data = (
+                False,
+                "Timed out"
+                if self.timeout is None
+                else f"Timed out after {self.timeout}s",
+            )
+            ttl = min(self.ttl, config.ERROR_TTL)
+        except Exception as e:
+            # Cache the error for a short while, in order to avoid hammering
+            # an upstream that is already struggling.
+            logger.exception(e)
+            success, data = False, repr(e)
+            ttl = min(self.ttl, config.ERROR_TTL)
+        duration = time.time() - before
+        result = utils.utcnow(), success, data, duration
+        if cache:
+            await cache.aset(self.cache_key, result, ttl=ttl)
+            # Serve the same result as the next reads from the cache.
+            result = await cache.normalize(result)
+
+        # Notify listeners about check run/state.
+        if events:
+            payload = {
+                "check": self,
+                "result": {
+                    "datetime": result[0],
+                    "success": success,
+                    "data": data,
+                    "duration": duration,
+                },
+            }
+            events.emit("check:run", payload=payload)
+            is_first_failure = last_success is None and not success
+            is_check_changed = last_success is not None and last_success != success
+            if is_first_failure or is_check_changed:
+                events.emit("check:state:changed", payload=payload)
 
         return result
 
@@ -159,7 +289,7 @@ class Check:
         exposed_params = getattr(self.module, "EXPOSED_PARAMETERS", [])
         return {k: v for k, v in self.params.items() if k in exposed_params}
 
-    @property
+    @functools.cached_property
     def info(self):
         troubleshooting_url = config.TROUBLESHOOTING_LINK_TEMPLATE.format(
             project=self.project, check=self.name
@@ -189,6 +319,8 @@ class Check:
             ttl=self.ttl,
             params={**self.params, **query_params},
             plot=self._plot,
+            stale_ttl=self.stale_ttl,
+            timeout=self.timeout,
         )
 
 
@@ -205,33 +337,42 @@ async def hello(request):
         "title": config.SERVICE_TITLE or config.SERVICE_NAME.capitalize(),
         "environment": config.ENV_NAME,
     }
-    return web.json_response(body)
+    return utils.json_response(body)
 
 
 @routes.get("/__lbheartbeat__")
 async def lbheartbeat(request):
-    return web.json_response({})
+    return utils.json_response({})
 
 
 @routes.get("/__heartbeat__")
 async def heartbeat(request):
     checks = {}
-    # Check that `curl` has HTTP2 and HTTP3 for `checks.core.http_versions`
-    curl_cmd = subprocess.run(
-        [config.CURL_BINARY_PATH, "--version"],
-        capture_output=True,
-    )
-    output = curl_cmd.stdout.strip().decode()
-    missing_features = [f for f in ("HTTP2", "HTTP3", "SSL") if f not in output]
-    checks["curl"] = (
-        "ok"
-        if not missing_features
-        else f"missing features {', '.join(missing_features)}"
-    )
-    bz_ping = await request.app["telescope.tracker"].ping()
-    checks["bugzilla"] = "ok" if bz_ping else "Bugzilla ping failed"
+    # Detected once on startup.
+    checks["curl"] = request.app["telescope.curl"]
+    # The ping goes on in background if it takes too long, and its result is cached.
+    try:
+        bz_ping = await asyncio.wait_for(
+            asyncio.shield(request.app["telescope.tracker"].ping()),
+            timeout=config.HEARTBEAT_TIMEOUT_SECONDS,
+        )
+        checks["bugzilla"] = "ok" if bz_ping else "Bugzilla ping failed"
+    except asyncio.TimeoutError:
+        checks["bugzilla"] = "Bugzilla ping timed out"
+    # Health of all workers, from any of them, unless the shared cache is stuck.
+    if "telescope.worker" in request.app:
+        try:
+            workers_status = await asyncio.wait_for(
+                workers.workers_status(request.app["telescope.cache"], config.WORKERS),
+                timeout=config.HEARTBEAT_TIMEOUT_SECONDS,
+            )
+        except asyncio.TimeoutError:
+            workers_status = {
+                f"worker-{w}": "Worker status timed out" for w in range(config.WORKERS)
+            }
+        checks.update(workers_status)
     status = 200 if all(v == "ok" for v in checks.values()) else 503
-    return web.json_response(checks, status=status)
+    return utils.json_response(checks, status=status)
 
 
 @routes.get("/__version__")
@@ -242,14 +383,26 @@ async def version(request):
 
     with open(path) as f:
         content = json.load(f)
-    return web.json_response(content)
+    return utils.json_response(content)
+
+
+@routes.get("/__upstreams__")
+async def upstreams(request):
+    # Live state of the circuit breakers and rate limiters, for debugging.
+    breakers = utils.CircuitBreaker.states()
+    limiters = utils.RateLimiter.states()
+    body = {
+        host: {"circuit": breakers.get(host), "rate_limit": limiters.get(host)}
+        for host in sorted(breakers.keys() | limiters.keys())
+    }
+    return utils.json_response(body)
 
 
 @routes.get("/checks")
 async def checkpoints(request):
     checks = request.app["telescope.checks"]
     info = [c.info for c in checks.all]
-    return web.json_response(info)
+    return utils.json_response(info)
 
 
 @routes.get("/checks/{project}")
@@ -266,7 +419,8 @@ async def project_checkpoints(request):
     except ValueError:
         raise web.HTTPNotFound()
 
-    return await _run_checks_parallel(
+    # Results are rendered or streamed as they come.
+    return _iter_checks_parallel(
         checks=selected, cache=cache, tracker=tracker, history=history, events=events
     )
 
@@ -285,7 +439,8 @@ async def tags_checkpoints(request):
     except ValueError:
         raise web.HTTPNotFound()
 
-    return await _run_checks_parallel(
+    # Results are rendered or streamed as they come.
+    return _iter_checks_parallel(
         checks=selected, cache=cache, tracker=tracker, history=history, events=events
     )
 
@@ -327,6 +482,12 @@ async def checkpoint(request):
     )[0]
 
 
+@routes.get("/events")
+async def events_stream(request):
+    # Push the new results of all checks as Server-Sent Events.
+    return await request.app["telescope.broadcaster"].subscribe(request)
+
+
 @routes.get("/diagram.svg")
 async def svg_diagram(request):
     path = config.DIAGRAM_FILE
@@ -337,27 +498,48 @@ async def svg_diagram(request):
         raise web.HTTPNotFound(reason=f"{path} could not be found.")
 
 
+async def _iter_checks_parallel(checks, cache, tracker, history, events, force=False):
+    """
+    Run the specified checks, and yield ``(index, entry)`` as soon as each of
+    them is done (see ``utils.render_checks()``).
+    """
+    factories = [
+        functools.partial(check.run, cache=cache, events=events, force=force)
+        for check in checks
+    ]
+    async for i, result in utils.iter_parallel(factories):
+        yield i, await _check_entry(checks[i], result, tracker, history)
+
+
+async def _check_entry(check, result, tracker, history):
+    timestamp, success, data, duration = result
+    buglist = await tracker.fetch(check.project, check.name)
+    scalar_history = await history.fetch(check.project, check.name)
+    entry = {
+        **check.info,
+        "datetime": timestamp.isoformat(),
+        "duration": int(duration * 1000),
+        "success": success,
+        "stale": check.is_stale(result),
+        "data": data,
+        "buglist": buglist,
+        "history": scalar_history,
+    }
+    if entry["stale"]:
+        entry["age"] = int(check.age(result))
+    return entry
+
+
 async def _run_checks_parallel(checks, cache, tracker, history, events, force=False):
-    futures = [check.run(cache=cache, events=events, force=force) for check in checks]
-    results = await utils.run_parallel(*futures)
-
-    body = []
-    for check, result in zip(checks, results):
-        timestamp, success, data, duration = result
-        buglist = await tracker.fetch(check.project, check.name)
-        scalar_history = await history.fetch(check.project, check.name)
-        body.append(
-            {
-                **check.info,
-                "datetime": timestamp.isoformat(),
-                "duration": int(duration * 1000),
-                "success": success,
-                "data": data,
-                "buglist": buglist,
-                "history": scalar_history,
-            }
-        )
-    return body
+    entries = dict(
+        [
+            item
+            async for item in _iter_checks_parallel(
+                checks, cache, tracker, history, events, force=force
+            )
+        ]
+    )
+    return [entries[i] for i in range(len(checks))]
 
 
 def _send_sentry(event, payload):
@@ -397,7 +579,7 @@ def _log_result(event, payload):
         "tags": check.tags,
         "success": result["success"],
         # Convert result data to string (for type consistency).
-        "data": json.dumps(result["data"]),
+        "data": utils.json_encode(result["data"]),
         # An optional scalar value (see below)
         "plot": None,
     }
@@ -414,7 +596,7 @@ def _log_result(event, payload):
     results_logger.info("", extra=infos)
 
 
-def init_app(checks: Checks):
+def init_app(checks: Checks, worker: Optional[int] = None):
     app = web.Application(
         middlewares=[middleware.error_middleware, middleware.request_summary]
     )
@@ -425,10 +607,13 @@ def init_app(checks: Checks):
         integrations=[AioHttpIntegration()],
     )
 
-    app["telescope.cache"] = utils.Cache()
+    app["telescope.cache"] = utils.create_cache()
     app["telescope.checks"] = checks
     app["telescope.tracker"] = utils.BugTracker(cache=app["telescope.cache"])
     app["telescope.history"] = utils.History(cache=app["telescope.cache"])
+    if config.RENDER_CACHE_MAX_BYTES > 0:
+        # Serialized check results, local to this process.
+        app["telescope.rendered"] = utils.Cache(max_bytes=config.RENDER_CACHE_MAX_BYTES)
     app["telescope.events"] = utils.EventEmitter()
 
     app.add_routes(routes)
@@ -447,42 +632,297 @@ def init_app(checks: Checks):
     for route in list(app.router.routes()):
         cors.add(route)
 
+    # Check that `curl` has HTTP2 and HTTP3 for `checks.core.http_versions`
+    app.on_startup.append(_detect_curl)
+
+    # Stop refreshing stale results before their resources are released.
+    app.on_cleanup.append(_cancel_refreshes)
+
+    # Reuse HTTP connections for all checks.
+    app.on_startup.append(_open_shared_session)
+    app.on_cleanup.append(_close_shared_session)
+
+    # Stop the pool of CPU-bound steps of checks.
+    app.on_cleanup.append(_shutdown_pools)
+
     # React to check run / state changes.
     app["telescope.events"].on("check:run", _log_result)
     app["telescope.events"].on("check:state:changed", _send_sentry)
 
+    # Push new results to subscribers of `/events`.
+    app["telescope.broadcaster"] = subscriptions.Broadcaster(
+        checks.all,
+        render=functools.partial(
+            _check_entry,
+            tracker=app["telescope.tracker"],
+            history=app["telescope.history"],
+        ),
+        cache=app["telescope.cache"],
+        events=app["telescope.events"],
+    )
+    app["telescope.events"].on("check:run", app["telescope.broadcaster"].on_check_run)
+    app.on_shutdown.append(_close_broadcaster)
+
+    # With several workers, the first one is the only one to run checks in
+    # background, and the others get the results from the shared cache.
+    is_runner = worker is None or worker == 0
+    if worker is not None:
+        app["telescope.worker"] = workers.WorkerHeartbeat(
+            app["telescope.cache"], worker
+        )
+        app.on_startup.append(_start_worker_heartbeat)
+        app.on_cleanup.append(_stop_worker_heartbeat)
+
+    # Persist checks results across restarts. They are restored before the
+    # scheduler starts, and saved once it has stopped.
+    snapshots = config.SNAPSHOT_FILE and is_runner
+    if snapshots:
+        app.on_startup.append(_load_snapshot)
+
+    # Refresh checks results in background before they expire.
+    if config.SCHEDULER_ENABLED and is_runner:
+        app["telescope.scheduler"] = Scheduler(
+            checks.all, cache=app["telescope.cache"], events=app["telescope.events"]
+        )
+        app.on_startup.append(_start_scheduler)
+        app.on_cleanup.append(_stop_scheduler)
+
+    if snapshots:
+        app.on_cleanup.append(_save_snapshot)
+
+    # Last, once nothing uses the cache anymore.
+    app.on_cleanup.append(_close_cache)
+
     return app
 
 
+async def _load_snapshot(app):
+    checks = app["telescope.checks"].all
+    cache = app["telescope.cache"]
+    await utils.load_snapshot(config.SNAPSHOT_FILE, checks, cache)
+
+    async def save_periodically():
+        while True:
+            await asyncio.sleep(config.SNAPSHOT_INTERVAL_SECONDS)
+            try:
+                await utils.save_snapshot(config.SNAPSHOT_FILE, checks, cache)
+            except Exception as e:
+                logger.exception(e)
+
+    app["telescope.snapshot"] = asyncio.create_task(save_periodically())
+
+
+async def _save_snapshot(app):
+    app["telescope.snapshot"].cancel()
+    await utils.save_snapshot(
+        config.SNAPSHOT_FILE, app["telescope.checks"].all, app["telescope.cache"]
+    )
+
+
+async def _detect_curl(app):
+    try:
+        process = await asyncio.create_subprocess_exec(
+            config.CURL_BINARY_PATH, "--version", stdout=asyncio.subprocess.PIPE
+        )
+        stdout, _ = await process.communicate()
+    except OSError as e:
+        app["telescope.curl"] = f"curl unavailable ({e})"
+        return
+    output = stdout.strip().decode()
+    missing_features = [f for f in ("HTTP2", "HTTP3", "SSL") if f not in output]
+    app["telescope.curl"] = (
+        "ok"
+        if not missing_features
+        else f"missing features {', '.join(missing_features)}"
+    )
+
+
+async def _open_shared_session(app):
+    await utils.open_shared_session()
+
+
+async def _close_cache(app):
+    if (cache := app["telescope.cache"]) is not None:
+        cache.close()
+
+
+async def _close_shared_session(app):
+    await utils.close_shared_session()
+
+
+async def _cancel_refreshes(app):
+    await Check.cancel_refreshes()
+
+
+async def _shutdown_pools(app):
+    utils.shutdown_pools()
+
+
+async def _start_scheduler(app):
+    app["telescope.scheduler"].start()
+
+
+async def _stop_scheduler(app):
+    await app["telescope.scheduler"].stop()
+
+
+async def _close_broadcaster(app):
+    await app["telescope.broadcaster"].close()
+
+
+async def _start_worker_heartbeat(app):
+    await app["telescope.worker"].start()
+
+
+async def _stop_worker_heartbeat(app):
+    await app["telescope.worker"].stop()
+
+
 def run_check(check):
     cprint(check.description, "white")
 
-    _, success, data, _ = asyncio.run(check.run())
+    async def run():
+        async with utils.shared_session():
+            return await check.run()
+
+    _, success, data, _ = asyncio.run(run())
 
-    cprint(json.dumps(data, indent=2), "green" if success else "red")
+    cprint(utils.json_encode(data, indent=True), "green" if success else "red")
     return success
 
 
+async def run_checks(checks, parallel: int = 1, output: str = "text") -> bool:
+    """
+    Run the specified checks in a single event loop, sharing the HTTP session,
+    and print their results as they finish, followed by a summary.
+    """
+    # Keep the standard output for the report in machine-readable formats.
+    progress = sys.stdout if output == "text" else sys.stderr
+    before = time.monotonic()
+    results: Dict[int, Tuple[Check, bool, Any, float]] = {}
+
+    async with utils.shared_session():
+        factories = [check.run for check in checks]
+        async for i, (_, success, data, duration) in utils.iter_parallel(
+            factories, parallel_workers=parallel
+        ):
+            check = checks[i]
+            results[i] = check, success, data, duration
+            color = "green" if success else "red"
+            status = "OK" if success else "FAILED"
+            cprint(
+                f"{check.project}/{check.name} {status} ({duration:.2f}s)",
+                color,
+                file=progress,
+            )
+            if output == "text":
+                cprint(check.description, "white")
+                cprint(utils.json_encode(data, indent=True), color)
+
+    total_duration = time.monotonic() - before
+    ordered = [results[i] for i in sorted(results)]
+    failures = sum(1 for _, success, _, _ in ordered if not success)
+
+    if output == "json":
+        report = [
+            {
+                "project": check.project,
+                "name": check.name,
+                "success": success,
+                "duration": duration,
+                "data": data,
+            }
+            for check, success, data, duration in ordered
+        ]
+        print(utils.json_encode(report, indent=True, default=str))
+    elif output == "junit":
+        print(_junit_report(ordered, failures, total_duration))
+    else:
+        print("\nSummary:")
+        for check, success, _, duration in sorted(ordered, key=lambda r: -r[3]):
+            status = "OK" if success else "FAILED"
+            cprint(
+                f"{duration:8.2f}s  {status:6}  {check.project}/{check.name}",
+                "green" if success else "red",
+            )
+    cprint(
+        f"{len(ordered)} checks, {failures} failed, in {total_duration:.2f}s",
+        "red" if failures else "green",
+        file=progress,
+    )
+    return failures == 0
+
+
+def _junit_report(results, failures: int, duration: float) -> str:
+    suite = ElementTree.Element(
+        "testsuite",
+        name=config.SERVICE_NAME,
+        tests=str(len(results)),
+        failures=str(failures),
+        time=f"{duration:.3f}",
+    )
+    for check, success, data, check_duration in results:
+        case = ElementTree.SubElement(
+            suite,
+            "testcase",
+            classname=check.project,
+            name=check.name,
+            time=f"{check_duration:.3f}",
+        )
+        if not success:
+            failure = ElementTree.SubElement(case, "failure", message=check.description)
+            failure.text = utils.json_encode(data, indent=True, default=str)
+    return ElementTree.tostring(suite, encoding="unicode")
+
+
+def setup_event_loop():
+    """
+    Use the event loop implementation specified in configuration.
+    """
+    if config.EVENT_LOOP == "uvloop":
+        try:
+            import uvloop
+        except ImportError:
+            logger.warning("uvloop is not installed, using the asyncio event loop")
+            return
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    elif config.EVENT_LOOP != "asyncio":
+        raise ValueError(f"Unknown event loop '{config.EVENT_LOOP}'")
+
+
 def main(argv):
     logging.config.dictConfig(config.LOGGING)
+    setup_event_loop()
     conf = config.load(config.CONFIG_FILE)
 
     checks = Checks.from_conf(conf)
 
     # If CLI arg is provided, run the check.
     if len(argv) >= 1 and argv[0] == "check":
-        project = None
-        name = None
-        if len(argv) > 1:
-            project = argv[1]
-        if len(argv) > 2:
-            name = argv[2]
+        parser = argparse.ArgumentParser(prog="telescope check")
+        parser.add_argument("project", nargs="?")
+        parser.add_argument("name", nargs="?")
+        parser.add_argument(
+            "--parallel",
+            type=int,
+            help="run the checks concurrently in a single event loop",
+        )
+        parser.add_argument("--output", choices=["text", "json", "junit"])
+        args = parser.parse_args(argv[1:])
         try:
-            selected = checks.lookup(project=project, name=name)
+            selected = checks.lookup(project=args.project, name=args.name)
         except ValueError as e:
             cprint(f"{e} in '{config.CONFIG_FILE}'", "red")
             return 2
 
+        if args.parallel or args.output:
+            success = asyncio.run(
+                run_checks(
+                    selected, parallel=args.parallel or 1, output=args.output or "text"
+                )
+            )
+            return 0 if success else 1
+
         successes = []
         for check in selected:
             success = run_check(check)
@@ -491,6 +931,27 @@ def main(argv):
         return 0 if all(successes) else 1
 
     # Otherwise, run the Web app.
+    if config.WORKERS > 1:
+        if config.CACHE_BACKEND == "memory":
+            cprint("Several workers require a shared cache backend (eg. sqlite)", "red")
+            return 2
+        logger.debug(
+            f"Running {config.WORKERS} workers at http://{config.HOST}:{config.PORT}"
+        )
+        workers.Supervisor(serve_worker, config.WORKERS).run()
+        return
+
     app = init_app(checks)
     logger.debug(f"Running at http://{config.HOST}:{config.PORT}")
     web.run_app(app, host=config.HOST, port=config.PORT, print=False)
+
+
+def serve_worker(worker: int):
+    """
+    Run the Web app in a worker process, see ``workers.Supervisor``.
+    """
+    logging.config.dictConfig(config.LOGGING)
+    setup_event_loop()
+    conf = config.load(config.CONFIG_FILE)
+    app = init_app(Checks.from_conf(conf), worker=worker)
+    web.run_app(app, host=config.HOST, port=config.PORT, reuse_port=True, print=None)
@@ -15,7 +15,34 @@ CONTACT_EMAIL = config("CONTACT_EMAIL", default="postmaster@localhost")
 BUGTRACKER_URL = config("BUGTRACKER_URL", default="https://bugzilla.mozilla.org")
 BUGTRACKER_API_KEY = config("BUGTRACKER_API_KEY", default="")
 BUGTRACKER_TTL = config("BUGTRACKER_TTL", default=3600, cast=int)
+BUGTRACKER_PING_TTL = config("BUGTRACKER_PING_TTL", default=60, cast=int)
 HISTORY_PROJECT_ID = config("HISTORY_PROJECT_ID", default=None)
+CACHE_BACKEND = config("CACHE_BACKEND", default="memory")
+CACHE_SQLITE_PATH = config("CACHE_SQLITE_PATH", default="telescope-cache.sqlite")
+CACHE_LOCK_TTL_SECONDS = config("CACHE_LOCK_TTL_SECONDS", default=300, cast=int)
+CACHE_MAX_ENTRIES = config("CACHE_MAX_ENTRIES", default=5000, cast=int)
+CACHE_MAX_BYTES = config("CACHE_MAX_BYTES", default=256 * 1024 * 1024, cast=int)
+RENDER_CACHE_MAX_BYTES = config(
+    "RENDER_CACHE_MAX_BYTES", default=64 * 1024 * 1024, cast=int
+)
+CACHE_SWEEP_INTERVAL_SECONDS = config(
+    "CACHE_SWEEP_INTERVAL_SECONDS", default=60, cast=int
+)
+CIRCUIT_BREAKER_THRESHOLD = config("CIRCUIT_BREAKER_THRESHOLD", default=5, cast=int)
+CIRCUIT_BREAKER_RECOVERY_SECONDS = config(
+    "CIRCUIT_BREAKER_RECOVERY_SECONDS", default=10, cast=int
+)
+CIRCUIT_BREAKER_MAX_RECOVERY_SECONDS = config(
+    "CIRCUIT_BREAKER_MAX_RECOVERY_SECONDS", default=300, cast=int
+)
+CPU_POOL = config("CPU_POOL", default="process")
+CPU_POOL_MAX_WORKERS = config("CPU_POOL_MAX_WORKERS", default=0, cast=int)
+COMPRESSION_ENCODINGS = config(
+    "COMPRESSION_ENCODINGS",
+    default="zstd,br,gzip",
+    cast=lambda v: [e.strip() for e in v.split(",") if e.strip()],
+)
+COMPRESSION_MIN_BYTES = config("COMPRESSION_MIN_BYTES", default=1024, cast=int)
 CONFIG_FILE = config("CONFIG_FILE", default="config.toml")
 DIAGRAM_FILE = config("DIAGRAM_FILE", default="diagram.svg")
 CORS_ORIGINS = config("CORS_ORIGINS", default="*")
@@ -23,17 +50,44 @@ DEFAULT_TTL = config("DEFAULT_TTL", default=60, cast=int)
 DEFAULT_REQUEST_HEADERS = config(
     "DEFAULT_REQUEST_HEADERS", default="{}", cast=lambda v: json.loads(v)
 )
+ERROR_TTL = config("ERROR_TTL", default=30, cast=int)
 ENV_NAME = config("ENV_NAME", default=None)
+EVENT_LOOP = config("EVENT_LOOP", default="asyncio")
 GITHUB_TOKEN = config(
     "GITHUB_TOKEN", default=None, cast=lambda v: f"token {v}" if v else None
 )
+HEARTBEAT_TIMEOUT_SECONDS = config("HEARTBEAT_TIMEOUT_SECONDS", default=1, cast=float)
 HISTORY_DAYS = config("HISTORY_DAYS", default=0, cast=int)
 HISTORY_TTL = config("HISTORY_TTL", default=3600, cast=int)
+JSON_LIBRARY = config("JSON_LIBRARY", default="orjson")
+MONITOR_CHANGES_TTL_SECONDS = config(
+    "MONITOR_CHANGES_TTL_SECONDS", default=10, cast=int
+)
+RATE_LIMIT_REQUESTS_PER_SECOND = config(
+    "RATE_LIMIT_REQUESTS_PER_SECOND", default="{}", cast=lambda v: json.loads(v)
+)
+RATE_LIMIT_LATENCY_FACTOR = config("RATE_LIMIT_LATENCY_FACTOR", default=3, cast=float)
+RATE_LIMIT_MAX_PAUSE_SECONDS = config(
+    "RATE_LIMIT_MAX_PAUSE_SECONDS", default=60, cast=int
+)
 REFRESH_SECRET = config("REFRESH_SECRET", default="")
 REQUESTS_TIMEOUT_SECONDS = config("REQUESTS_TIMEOUT_SECONDS", default=10, cast=int)
 REQUESTS_MAX_RETRIES = config("REQUESTS_MAX_RETRIES", default=2, cast=int)
+REQUESTS_MAX_CONNECTIONS = config("REQUESTS_MAX_CONNECTIONS", default=100, cast=int)
+REQUESTS_MAX_CONNECTIONS_PER_HOST = config(
+    "REQUESTS_MAX_CONNECTIONS_PER_HOST", default=16, cast=int
+)
+REQUESTS_KEEPALIVE_SECONDS = config("REQUESTS_KEEPALIVE_SECONDS", default=30, cast=int)
+REQUESTS_DNS_CACHE_SECONDS = config("REQUESTS_DNS_CACHE_SECONDS", default=300, cast=int)
 REQUESTS_MAX_PARALLEL = config("REQUESTS_MAX_PARALLEL", default=16, cast=int)
+REQUESTS_MAX_WORKERS = config("REQUESTS_MAX_WORKERS", default=64, cast=int)
+SCHEDULER_ENABLED = config("SCHEDULER_ENABLED", default=False, cast=bool)
+SCHEDULER_MARGIN_SECONDS = config("SCHEDULER_MARGIN_SECONDS", default=5, cast=int)
+SCHEDULER_JITTER_SECONDS = config("SCHEDULER_JITTER_SECONDS", default=10, cast=int)
+SCHEDULER_MAX_PARALLEL = config("SCHEDULER_MAX_PARALLEL", default=4, cast=int)
 SENTRY_DSN = config("SENTRY_DSN", default="")
+SNAPSHOT_FILE = config("SNAPSHOT_FILE", default="")
+SNAPSHOT_INTERVAL_SECONDS = config("SNAPSHOT_INTERVAL_SECONDS", default=300, cast=int)
 SOURCE_URL = config(
     "SOURCE_URL", default="https://github.com/mozilla-services/telescope"
 )
@@ -42,6 +96,10 @@ TROUBLESHOOTING_LINK_TEMPLATE = config(
     default="https://wiki.example.com/troubleshooting.html#{project}/{check}",
 )
 VERSION_FILE = config("VERSION_FILE", default="version.json")
+WORKERS = config("WORKERS", default=1, cast=int)
+WORKERS_HEARTBEAT_INTERVAL_SECONDS = config(
+    "WORKERS_HEARTBEAT_INTERVAL_SECONDS", default=5, cast=int
+)
 LOG_LEVEL = config("LOG_LEVEL", default="INFO").upper()
 LOG_FORMAT = config("LOG_FORMAT", default="json")
 LOG_SUMMARY_QUERYSTRING = config("LOG_SUMMARY_QUERYSTRING", default=False)
@@ -1,7 +1,7 @@
 import { Component, html } from "../../htm_preact.mjs";
 import FocusedCheck from "../contexts/FocusedCheck.mjs";
 import SelectedTags from "../contexts/SelectedTags.mjs";
-import { ROOT_URL, RETRY_INTERVAL } from "../constants.mjs";
+import { ROOT_URL } from "../constants.mjs";
 
 import Overview from "./Overview.mjs";
 import Project from "./Project.mjs";
@@ -11,14 +11,14 @@ export default class Dashboard extends Component {
   constructor() {
     super();
     this.firstLoad = true;
-    this.triggerRecheck = this.triggerRecheck.bind(this);
+    this.onCheckEvent = this.onCheckEvent.bind(this);
+    this.onStreamError = this.onStreamError.bind(this);
     this.fetchCheckResult = this.fetchCheckResult.bind(this);
     this.setFocusedCheck = this.setFocusedCheck.bind(this);
     this.onHashChange = this.onHashChange.bind(this);
     this.state = {
       checks: {},
       results: {},
-      recheckTimeouts: {},
       focusedCheck: {
         name: null,
         project: null,
@@ -48,7 +48,6 @@ export default class Dashboard extends Component {
       }
     });
 
-    // Execute each check.
     const checks = {};
     const results = {};
     checksData.forEach((c) => {
@@ -57,21 +56,24 @@ export default class Dashboard extends Component {
       results[key] = {
         isLoading: true,
       };
-      this.triggerRecheck(c);
     });
     this.setState({
       checks,
       results,
     });
+    // The server pushes the current results, and then every new result.
+    // The browser reconnects automatically when the connection is lost.
+    this.eventSource = new EventSource(new URL("/events", ROOT_URL).toString());
+    this.eventSource.addEventListener("check", this.onCheckEvent);
+    this.eventSource.addEventListener("error", this.onStreamError);
     // Watch history to focus check.
     window.addEventListener("hashchange", this.onHashChange);
   }
 
   componentWillUnmount() {
-    const { recheckTimeouts } = this.state;
-    Object.values(recheckTimeouts).forEach((timeoutId) => {
-      clearTimeout(timeoutId);
-    });
+    if (this.eventSource) {
+      this.eventSource.close();
+    }
     window.removeEventListener("hashchange", this.onHashChange);
   }
 
@@ -115,20 +117,40 @@ export default class Dashboard extends Component {
     document.querySelector("link[rel*='icon']").setAttribute("href", favicon);
   }
 
-  async triggerRecheck(check) {
-    // Fetch the result
-    const result = await this.fetchCheckResult(check);
+  onCheckEvent(event) {
+    const result = JSON.parse(event.data);
+    const key = `${result.project}.${result.name}`;
+    this.setState((state) => ({
+      results: {
+        ...state.results,
+        [key]: result,
+      },
+    }));
+  }
 
-    // Reschedule the check
-    const interval = result.isIncomplete ? RETRY_INTERVAL : check.ttl * 1000;
-    const key = `${check.project}.${check.name}`;
-    const timeout = setTimeout(() => this.triggerRecheck(check), interval);
-    const recheckTimeouts = {
-      ...this.state.recheckTimeouts,
-      [key]: timeout,
-    };
-    this.setState({
-      recheckTimeouts,
+  onStreamError(event) {
+    // Don't leave checks loading forever. They are replaced by the latest
+    // results once the browser has reconnected.
+    console.warn("Stream of check results interrupted", event);
+    this.setState((state) => {
+      const results = { ...state.results };
+      Object.entries(results)
+        .filter(([, r]) => r.isLoading)
+        .forEach(([key, r]) => {
+          const { project, name } = state.checks[key];
+          results[key] = {
+            ...r,
+            project,
+            name,
+            datetime: new Date(),
+            data: "Connection to the server was lost",
+            duration: 0,
+            success: false, // Mark as failed.
+            isLoading: false,
+            isIncomplete: true, // Distinguish network errors from failing checks.
+          };
+        });
+      return { results };
     });
   }
 
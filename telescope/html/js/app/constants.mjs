@@ -1,4 +1,3 @@
-export const RETRY_INTERVAL = 60 * 1000;
 export const DOMAIN = window.location.href.split("/")[2];
 export const ROOT_URL = `${window.location.protocol}//${DOMAIN}`;
 
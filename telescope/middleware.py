@@ -7,7 +7,7 @@ from secrets import token_hex
 from aiohttp import web
 from aiohttp.web import middleware
 
-from . import config
+from . import config, utils
 
 
 logger = logging.getLogger(__name__)
@@ -64,4 +64,4 @@ async def error_middleware(request, handler):
         error = e
 
     body = {"success": False, "data": repr(error), **request.match_info}
-    return web.json_response(body, status=web.HTTPInternalServerError.status_code)
+    return utils.json_response(body, status=web.HTTPInternalServerError.status_code)
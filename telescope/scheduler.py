@@ -0,0 +1,91 @@
+import asyncio
+import logging
+import random
+from typing import List, Optional
+
+from . import config
+
+
+logger = logging.getLogger(__name__)
+
+
+class Scheduler:
+    """
+    Refresh the results of checks in background, shortly before they expire,
+    so that the HTTP views almost always serve warm cache entries.
+
+    Results that are still fresh in the cache (eg. restored from a snapshot or
+    refreshed by another replica) are not refreshed again.
+    """
+
+    def __init__(
+        self,
+        checks,
+        cache=None,
+        events=None,
+        margin: Optional[int] = None,
+        jitter: Optional[int] = None,
+        max_parallel: Optional[int] = None,
+    ):
+        self.checks = checks
+        self.cache = cache
+        self.events = events
+        self.margin = config.SCHEDULER_MARGIN_SECONDS if margin is None else margin
+        self.jitter = config.SCHEDULER_JITTER_SECONDS if jitter is None else jitter
+        self.max_parallel = (
+            config.SCHEDULER_MAX_PARALLEL if max_parallel is None else max_parallel
+        )
+        self._tasks: List[asyncio.Task] = []
+
+    async def remaining(self, check) -> Optional[float]:
+        """
+        Number of seconds before the cached result of the specified check
+        expires, or ``None`` if there is none.
+        """
+        if self.cache is None:
+            return None
+        result = await self.cache.aget(check.cache_key)
+        if result is None:
+            return None
+        return await check.remaining(self.cache, result)
+
+    def delay(self, check, remaining: Optional[float] = None) -> float:
+        """
+        Number of seconds to wait before refreshing the specified check again.
+        """
+        jitter = random.uniform(0, self.jitter)  # nosec
+        remaining = check.ttl if remaining is None else remaining
+        return max(1, remaining - self.margin - jitter)
+
+    def start(self):
+        semaphore = asyncio.Semaphore(self.max_parallel)
+        for check in self.checks:
+            task = asyncio.create_task(self._refresh_loop(check, semaphore))
+            self._tasks.append(task)
+        logger.info(f"Scheduled background refresh of {len(self._tasks)} checks")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _refresh_loop(self, check, semaphore):
+        # Spread the first runs of checks.
+        await asyncio.sleep(random.uniform(0, self.jitter))  # nosec
+        while True:
+            async with semaphore:
+                try:
+                    # The result may have been restored from a snapshot, or
+                    # refreshed by another process sharing the cache.
+                    remaining = await self.remaining(check)
+                    if remaining is None or remaining <= self.margin:
+                        # Checked again once the lock of the check is held.
+                        await check.run(
+                            cache=self.cache, events=self.events, margin=self.margin
+                        )
+                        remaining = await self.remaining(check)
+                except Exception as e:
+                    logger.exception(e)
+                    remaining = None
+            await asyncio.sleep(self.delay(check, remaining))
@@ -0,0 +1,182 @@
+import asyncio
+import contextlib
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Set
+
+from aiohttp import web
+
+from . import utils
+
+
+logger = logging.getLogger(__name__)
+
+
+class Broadcaster:
+    """
+    Push the new results of checks to the subscribers of ``/events``
+    as Server-Sent Events.
+
+    Each result is rendered once, whatever the number of subscribers. While
+    there are subscribers, checks are run again when their results expire, so
+    that clients don't have to poll each of them.
+    """
+
+    # Slow subscribers that lag behind are disconnected.
+    MAX_PENDING_EVENTS = 100
+    # Prevent proxies from closing idle connections.
+    KEEPALIVE_SECONDS = 15
+
+    def __init__(self, checks, render, cache=None, events=None) -> None:
+        self.checks = {c.cache_key: c for c in checks}
+        # Coroutine that returns the entry of a check result, as in views.
+        self.render = render
+        self.cache = cache
+        self.events = events
+        # Latest result of each check, sent to new subscribers.
+        self.timestamps: Dict[str, datetime] = {}
+        self.results: Dict[str, Any] = {}
+        self.messages: Dict[str, bytes] = {}
+        self.subscribers: Set[asyncio.Queue] = set()
+        self._watchers: List[asyncio.Task] = []
+        # Set when checks are run, to wake up their watchers.
+        self._runs: Dict[str, asyncio.Event] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    def on_check_run(self, event, payload):
+        """
+        Callback of the ``check:run`` event.
+        """
+        check, result = payload["check"], payload["result"]
+        if (run_event := self._runs.get(check.cache_key)) is not None:
+            run_event.set()
+        if not self.subscribers:
+            return
+        if check.cache_key not in self.checks:
+            # Eg. parameters overriden in URL.
+            return
+        run = result["datetime"], result["success"], result["data"], result["duration"]
+        task = asyncio.create_task(self.publish(check, run))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def publish(self, check, result):
+        key, timestamp = check.cache_key, result[0]
+        if key in self.timestamps and self.timestamps[key] >= timestamp:
+            # Already sent.
+            return
+        self.timestamps[key] = timestamp
+        entry = await self.render(check, result)
+        if self.timestamps[key] != timestamp:
+            # A more recent result was published meanwhile.
+            return
+        message = self._message(entry)
+        self.results[key] = result
+        self.messages[key] = message
+        for queue in list(self.subscribers):
+            if queue.qsize() >= self.MAX_PENDING_EVENTS:
+                logger.warning("Disconnect slow subscriber of check results")
+                self.subscribers.discard(queue)
+                queue.put_nowait(None)
+            else:
+                queue.put_nowait(message)
+
+    async def subscribe(self, request) -> web.StreamResponse:
+        response = web.StreamResponse(
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+        response.content_type = "text/event-stream"
+        await response.prepare(request)
+
+        # Leave room for the sentinel of slow subscribers.
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.MAX_PENDING_EVENTS + 1)
+        self.subscribers.add(queue)
+        if len(self.subscribers) == 1:
+            self.start()
+        try:
+            for message in await self.latest_messages():
+                await response.write(message)
+            while True:
+                try:
+                    message = await asyncio.wait_for(
+                        queue.get(), timeout=self.KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    message = b": keepalive\n\n"
+                if message is None:
+                    break
+                await response.write(message)
+        except ConnectionResetError:  # pragma: nocover
+            pass
+        finally:
+            self.subscribers.discard(queue)
+            if not self.subscribers:
+                await self.stop()
+        return response
+
+    async def latest_messages(self) -> List[bytes]:
+        """
+        Latest message of each check, for new subscribers. Expired results are
+        left out until they are run again, and stale results are rendered
+        again, since they were fresh when published.
+        """
+        messages = []
+        for key, message in list(self.messages.items()):
+            check, result = self.checks[key], self.results[key]
+            if check.age(result) > check.ttl + check.stale_ttl:
+                continue
+            if check.is_stale(result):
+                message = self._message(await self.render(check, result))
+            messages.append(message)
+        return messages
+
+    def _message(self, entry) -> bytes:
+        return f"event: check\ndata: {utils.json_encode(entry)}\n\n".encode()
+
+    def start(self):
+        for check in self.checks.values():
+            self._watchers.append(asyncio.create_task(self._watch(check)))
+
+    async def stop(self):
+        watchers, self._watchers = self._watchers, []
+        self._runs.clear()
+        for task in watchers:
+            task.cancel()
+        await asyncio.gather(*watchers, return_exceptions=True)
+
+    async def close(self):
+        for queue in list(self.subscribers):
+            queue.put_nowait(None)
+        await self.stop()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def delay(self, check, result) -> float:
+        """
+        Number of seconds to wait before the specified result expires, or
+        can't be served anymore if it is stale.
+        """
+        expiration = check.ttl + (check.stale_ttl if check.is_stale(result) else 0)
+        return max(1, expiration - check.age(result))
+
+    async def _watch(self, check) -> None:
+        backoff = 1
+        while True:
+            delay = check.ttl
+            try:
+                # Run only if expired, or get the result from the cache, which
+                # may have been stored by another process.
+                result = await check.run(cache=self.cache, events=self.events)
+                run_event = self._runs[check.cache_key] = asyncio.Event()
+                await self.publish(check, result)
+                delay = self.delay(check, result)
+                if check.is_stale(result):
+                    # Being refreshed in background, whose run wakes us up. Back
+                    # off in case it fails or happens in another process.
+                    delay, backoff = min(backoff, delay), backoff * 2
+                else:
+                    backoff = 1
+            except Exception as e:
+                run_event = asyncio.Event()
+                logger.exception(e)
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(run_event.wait(), timeout=delay)
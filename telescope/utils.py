@@ -1,14 +1,42 @@
+import abc
 import asyncio
+import concurrent.futures
+import contextvars
 import email.utils
+import functools
+import gzip
+import hashlib
+import inspect
 import json
 import logging
+import multiprocessing
+import os
+import re
+import sqlite3
+import sys
 import textwrap
 import threading
+import time
 import urllib.parse
-from contextlib import asynccontextmanager
-from datetime import datetime, timedelta, timezone
+import weakref
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from datetime import date, datetime, timedelta, timezone
 from itertools import chain
-from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple, Union
+from secrets import token_hex
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import aiohttp
 import backoff
@@ -19,27 +47,151 @@ from telescope import config
 from telescope.typings import BugInfo
 
 
+try:
+    import orjson
+except ImportError:  # pragma: nocover
+    orjson = None  # type: ignore
+
+try:
+    import brotli
+except ImportError:  # pragma: nocover
+    brotli = None  # type: ignore
+
+try:
+    import zstandard
+except ImportError:  # pragma: nocover
+    zstandard = None  # type: ignore
+
+
 logger = logging.getLogger(__name__)
 threadlocal = threading.local()
 
 
-class Cache:
-    def __init__(self):
-        self._content: Dict[str, Any] = {}
-        self._locks = {}
+class CacheBackend(abc.ABC):
+    """
+    Interface of cache backends.
+
+    Values are stored with a TTL in seconds. Locks are asynchronous context
+    managers that guarantee that only one caller at a time computes a key.
+    """
+
+    @abc.abstractmethod
+    def lock(self, key: str): ...
+
+    @abc.abstractmethod
+    def set(self, key: str, value: Any, ttl: int): ...
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[Any]: ...
+
+    @abc.abstractmethod
+    def ttl(self, key: str) -> Optional[float]:
+        """
+        Number of seconds before the specified key expires.
+        """
+
+    def peek(self, key: str) -> Optional[Any]:
+        """
+        Same as ``get()``, without counting as a use of the entry (eg. for eviction).
+        """
+        return self.get(key)
+
+    async def normalize(self, value: Any) -> Any:
+        """
+        The specified value, as it is read back from the cache.
+        """
+        return value
+
+    def close(self):
+        """
+        Release the resources of this backend.
+        """
+
+    # Variants to use from the event loop, for backends that would block it.
+
+    async def aset(self, key: str, value: Any, ttl: int):
+        self.set(key, value, ttl)
+
+    async def aget(self, key: str) -> Optional[Any]:
+        return self.get(key)
+
+    async def attl(self, key: str) -> Optional[float]:
+        return self.ttl(key)
+
+    async def apeek(self, key: str) -> Optional[Any]:
+        return self.peek(key)
+
+
+class Cache(CacheBackend):
+    """
+    In-memory cache, bounded in number of entries and in (approximate) size.
+
+    Least recently used entries are evicted when limits are reached, and
+    expired entries are swept periodically.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        sweep_interval: Optional[int] = None,
+    ):
+        self.max_entries = (
+            config.CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        )
+        self.max_bytes = config.CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.sweep_interval = timedelta(
+            seconds=(
+                config.CACHE_SWEEP_INTERVAL_SECONDS
+                if sweep_interval is None
+                else sweep_interval
+            )
+        )
+        # Entries are kept in least recently used order.
+        self._content: OrderedDict[str, Tuple[datetime, int, Any]] = OrderedDict()
+        self._size = 0
+        self._locks: Dict[str, KeyLock] = {}
+        self._last_sweep = utcnow()
+
+    @property
+    def size(self) -> int:
+        return self._size
 
     def lock(self, key: str):
-        return self._locks.setdefault(key, asyncio.Lock())
+        if (lock := self._locks.get(key)) is None:
+            lock = self._locks[key] = KeyLock(self._locks, key)
+        return lock
 
     def set(self, key: str, value: Any, ttl: int):
-        expires = utcnow() + timedelta(seconds=ttl)
-        self._content[key] = expires, value
+        now = utcnow()
+        expires = now + timedelta(seconds=ttl)
+        self._discard(key)
+        size = sizeof(value)
+        self._content[key] = expires, size, value
+        self._size += size
+
+        if now - self._last_sweep > self.sweep_interval:
+            self.sweep()
+
+        # Evict least recently used entries, but never the one we just stored.
+        while len(self._content) > 1 and (
+            len(self._content) > self.max_entries or self._size > self.max_bytes
+        ):
+            evicted, _ = next(iter(self._content.items()))
+            logger.debug(f"Evict '{evicted}' from cache")
+            self._discard(evicted)
 
     def get(self, key: str) -> Optional[Any]:
+        value = self.peek(key)
+        if value is not None:
+            self._content.move_to_end(key)
+        return value
+
+    def peek(self, key: str) -> Optional[Any]:
         try:
-            expires, value = self._content[key]
+            expires, _, value = self._content[key]
             if expires < utcnow():
-                del self._content[key]
+                self._discard(key)
                 return None
             return value
 
@@ -47,6 +199,444 @@ class Cache:
             # Unknown key.
             return None
 
+    def ttl(self, key: str) -> Optional[float]:
+        try:
+            expires, _, _ = self._content[key]
+        except KeyError:
+            return None
+        remaining = (expires - utcnow()).total_seconds()
+        return remaining if remaining >= 0 else None
+
+    def sweep(self):
+        """
+        Remove all expired entries.
+        """
+        now = self._last_sweep = utcnow()
+        expired = [k for k, (expires, _, _) in self._content.items() if expires < now]
+        for key in expired:
+            self._discard(key)
+
+    def _discard(self, key: str):
+        try:
+            _, size, _ = self._content.pop(key)
+            self._size -= size
+        except KeyError:
+            pass
+
+
+class KeyLock:
+    """
+    An asyncio lock that removes itself from the cache locks once
+    nobody holds it or waits for it anymore.
+    """
+
+    def __init__(self, registry: Dict[str, "KeyLock"], key: str):
+        self._registry = registry
+        self._key = key
+        self._lock = asyncio.Lock()
+        self._users = 0
+
+    def locked(self) -> bool:
+        return self._lock.locked()
+
+    async def __aenter__(self):
+        self._users += 1
+        try:
+            await self._lock.acquire()
+        except BaseException:
+            # Cancelled while waiting.
+            self._leave()
+            raise
+        return self
+
+    async def __aexit__(self, *args):
+        self._lock.release()
+        self._leave()
+
+    def _leave(self):
+        self._users -= 1
+        if self._users == 0 and self._registry.get(self._key) is self:
+            del self._registry[self._key]
+
+
+def sizeof(value: Any) -> int:
+    """
+    Approximate memory footprint of the specified value, in bytes.
+
+    >>> sizeof("abc") > sizeof("a")
+    True
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(sizeof(k) + sizeof(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set)):
+        size += sum(sizeof(v) for v in value)
+    return size
+
+
+class SQLiteCache(CacheBackend):
+    """
+    Cache stored in a SQLite database file, that can be shared by several
+    processes or replicas (eg. on a shared volume).
+
+    Locks are stored in the database too, as leases that expire after
+    ``lock_ttl`` seconds in case their holder dies. This guarantees that only
+    one process computes a given key at a time.
+
+    Values are serialized as JSON (see ``json_dumps()``).
+
+    Since database operations can wait for other processes (eg. busy timeout),
+    the asynchronous methods and locks run them in a dedicated thread, with
+    its own connection, to never block the event loop.
+    """
+
+    LOCK_POLL_INTERVAL_SECONDS = 0.1
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: Optional[int] = None,
+        lock_ttl: Optional[int] = None,
+        sweep_interval: Optional[int] = None,
+    ):
+        self.path = path
+        self.max_entries = (
+            config.CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        )
+        self.lock_ttl = config.CACHE_LOCK_TTL_SECONDS if lock_ttl is None else lock_ttl
+        self.sweep_interval = (
+            config.CACHE_SWEEP_INTERVAL_SECONDS
+            if sweep_interval is None
+            else sweep_interval
+        )
+        # Identify the locks held by this process.
+        self.owner = token_hex(8)
+        # Waiters of this process are queued locally, instead of polling the DB.
+        self._locks: Dict[str, KeyLock] = {}
+        self._last_sweep = time.time()
+        self._threadlocal = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="telescope-sqlite"
+        )
+
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache"
+            " (key TEXT PRIMARY KEY, expires REAL NOT NULL, value TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS locks"
+            " (key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires REAL NOT NULL)"
+        )
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        # Connections are not shared between threads, so that the one of the
+        # dedicated thread never makes the event loop wait.
+        conn = getattr(self._threadlocal, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path, timeout=30, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._threadlocal.conn = conn
+            self._connections.append(conn)
+        return conn
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        for conn in self._connections:
+            conn.close()
+
+    async def _run(self, func: Callable, *args) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def aset(self, key: str, value: Any, ttl: int):
+        await self._run(self.set, key, value, ttl)
+
+    async def aget(self, key: str) -> Optional[Any]:
+        return await self._run(self.get, key)
+
+    async def attl(self, key: str) -> Optional[float]:
+        return await self._run(self.ttl, key)
+
+    async def apeek(self, key: str) -> Optional[Any]:
+        return await self._run(self.peek, key)
+
+    async def normalize(self, value: Any) -> Any:
+        # eg. tuples are read back as lists.
+        return await run_in_pool(_json_roundtrip, value, threads=True)
+
+    def lock(self, key: str):
+        return SQLiteLock(self, key)
+
+    def set(self, key: str, value: Any, ttl: int):
+        now = time.time()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO cache (key, expires, value) VALUES (?, ?, ?)",
+            (key, now + ttl, json_dumps(value)),
+        )
+        if now - self._last_sweep > self.sweep_interval:
+            self.sweep()
+
+    def get(self, key: str) -> Optional[Any]:
+        row = self._conn.execute(
+            "SELECT value FROM cache WHERE key = ? AND expires >= ?",
+            (key, time.time()),
+        ).fetchone()
+        return None if row is None else json_loads(row[0])
+
+    def ttl(self, key: str) -> Optional[float]:
+        now = time.time()
+        row = self._conn.execute(
+            "SELECT expires FROM cache WHERE key = ? AND expires >= ?", (key, now)
+        ).fetchone()
+        return None if row is None else row[0] - now
+
+    def sweep(self):
+        """
+        Remove expired entries, and the ones that expire the soonest
+        if there are too many.
+        """
+        now = self._last_sweep = time.time()
+        self._conn.execute("DELETE FROM cache WHERE expires < ?", (now,))
+        self._conn.execute(
+            "DELETE FROM cache WHERE key NOT IN"
+            " (SELECT key FROM cache ORDER BY expires DESC LIMIT ?)",
+            (self.max_entries,),
+        )
+
+    def try_acquire(self, key: str) -> bool:
+        now = time.time()
+        with self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute(
+                "DELETE FROM locks WHERE key = ? AND expires < ?", (key, now)
+            )
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO locks (key, owner, expires) VALUES (?, ?, ?)",
+                (key, self.owner, now + self.lock_ttl),
+            )
+        return cursor.rowcount == 1
+
+    def release(self, key: str):
+        self._conn.execute(
+            "DELETE FROM locks WHERE key = ? AND owner = ?", (key, self.owner)
+        )
+
+
+class SQLiteLock:
+    """
+    Hold the lock of the specified key in this process, and then in the
+    shared database.
+    """
+
+    def __init__(self, cache: SQLiteCache, key: str):
+        self.cache = cache
+        self.key = key
+        self._local: Optional[KeyLock] = None
+
+    async def __aenter__(self):
+        if (local := self.cache._locks.get(self.key)) is None:
+            local = self.cache._locks[self.key] = KeyLock(self.cache._locks, self.key)
+        await local.__aenter__()
+        self._local = local
+        try:
+            while not await self.cache._run(self.cache.try_acquire, self.key):
+                await asyncio.sleep(self.cache.LOCK_POLL_INTERVAL_SECONDS)
+        except BaseException:
+            # If cancelled while acquiring in the dedicated thread, release
+            # after it (operations are run in order).
+            self.cache._executor.submit(self.cache.release, self.key)
+            await local.__aexit__()
+            raise
+        return self
+
+    async def __aexit__(self, *args):
+        try:
+            await self.cache._run(self.cache.release, self.key)
+        finally:
+            await self._local.__aexit__()  # type: ignore
+
+
+def create_cache() -> CacheBackend:
+    """
+    Instantiate the cache backend specified in configuration.
+    """
+    if config.CACHE_BACKEND == "memory":
+        return Cache()
+    if config.CACHE_BACKEND == "sqlite":
+        return SQLiteCache(config.CACHE_SQLITE_PATH)
+    raise ValueError(f"Unknown cache backend '{config.CACHE_BACKEND}'")
+
+
+def _json_default(obj):
+    if isinstance(obj, datetime):
+        return {"__datetime__": obj.isoformat()}
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+
+def _json_object_hook(obj):
+    if "__datetime__" in obj:
+        return datetime.fromisoformat(obj["__datetime__"])
+    return obj
+
+
+def _json_roundtrip(value: Any) -> Any:
+    return json_loads(json_dumps(value))
+
+
+def _use_orjson() -> bool:
+    return orjson is not None and config.JSON_LIBRARY == "orjson"
+
+
+# orjson parses the integers that don't fit in 64 bits as floats.
+_LONG_DIGITS = re.compile(r"\d{19,}")
+_LONG_DIGITS_BYTES = re.compile(rb"\d{19,}")
+
+
+def _orjson_loadable(value: Union[str, bytes]) -> bool:
+    if isinstance(value, bytes):
+        return _LONG_DIGITS_BYTES.search(value) is None
+    return _LONG_DIGITS.search(value) is None
+
+
+def _orjson_dumps(
+    value: Any, default: Optional[Callable], option: int
+) -> Optional[str]:
+    try:
+        return orjson.dumps(
+            value, default=default, option=orjson.OPT_NON_STR_KEYS | option
+        ).decode()
+    except orjson.JSONEncodeError:
+        # eg. integers larger than 64 bits, let the standard library try.
+        return None
+
+
+def json_encode(
+    value: Any, indent: bool = False, default: Optional[Callable] = None
+) -> str:
+    """
+    Serialize the specified value as JSON, using the library specified
+    in configuration (see ``JSON_LIBRARY``).
+    """
+    if _use_orjson():
+        option = orjson.OPT_INDENT_2 if indent else 0
+        if (encoded := _orjson_dumps(value, default, option)) is not None:
+            return encoded
+
+    def encode_default(obj):
+        # Serialize dates in ISO 8601, like orjson does natively.
+        if isinstance(obj, date):
+            return obj.isoformat()
+        if default is None:
+            raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+        return default(obj)
+
+    return json.dumps(value, default=encode_default, indent=2 if indent else None)
+
+
+def json_decode(value: Union[str, bytes]) -> Any:
+    if _use_orjson() and _orjson_loadable(value):
+        return orjson.loads(value)
+    return json.loads(value)
+
+
+def json_response(data: Any, **kwargs) -> web.Response:
+    """
+    Same as ``aiohttp.web.json_response()`` with ``json_encode()``.
+    """
+    return web.json_response(data, dumps=json_encode, **kwargs)
+
+
+def json_dumps(value: Any) -> str:
+    """
+    Serialize the specified value as JSON, including datetimes.
+
+    >>> json_loads(json_dumps({"a": datetime(2020, 1, 1)}))
+    {'a': datetime.datetime(2020, 1, 1, 0, 0)}
+    """
+    if _use_orjson():
+        # Datetimes are tagged by ``_json_default()``, like with the standard library.
+        option = orjson.OPT_PASSTHROUGH_DATETIME
+        if (encoded := _orjson_dumps(value, _json_default, option)) is not None:
+            return encoded
+    return json.dumps(value, default=_json_default)
+
+
+def json_loads(value: str) -> Any:
+    # Restoring datetimes on every object is faster with the standard library hook.
+    if _use_orjson() and "__datetime__" not in value and _orjson_loadable(value):
+        return orjson.loads(value)
+    return json.loads(value, object_hook=_json_object_hook)
+
+
+async def save_snapshot(path: str, checks, cache: CacheBackend):
+    """
+    Store the unexpired results of the specified checks into a compressed
+    JSON file, along with their remaining TTL.
+    """
+    entries = []
+    for check in checks:
+        # Don't count as uses of the entries for the cache eviction.
+        result = await cache.apeek(check.cache_key)
+        ttl = await cache.attl(check.cache_key)
+        if result is None or ttl is None:
+            continue
+        entries.append(
+            {
+                "key": check.cache_key,
+                "fingerprint": check.fingerprint,
+                "expires": time.time() + ttl,
+                "result": result,
+            }
+        )
+    # Serialize, compress and write off the event loop.
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, _write_snapshot, path, entries)
+    logger.info(f"Saved {len(entries)} checks results to '{path}'")
+
+
+def _write_snapshot(path: str, entries: List[Dict]):
+    # Write atomically, to never leave a truncated file behind.
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        f.write(json_dumps(entries))
+    os.replace(tmp_path, path)
+
+
+def _read_snapshot(path: str) -> List[Dict]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json_loads(f.read())
+
+
+async def load_snapshot(path: str, checks, cache: CacheBackend):
+    """
+    Load the checks results stored with ``save_snapshot()`` into the cache.
+    Expired entries and those whose check configuration has changed are skipped.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        entries = await loop.run_in_executor(None, _read_snapshot, path)
+    except FileNotFoundError:
+        return
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not load snapshot '{path}': {e}")
+        return
+
+    fingerprints = {check.cache_key: check.fingerprint for check in checks}
+    now = time.time()
+    loaded = 0
+    for entry in entries:
+        key = entry["key"]
+        ttl = entry["expires"] - now
+        if ttl <= 0 or fingerprints.get(key) != entry["fingerprint"]:
+            continue
+        await cache.aset(key, tuple(entry["result"]), ttl=int(ttl))
+        loaded += 1
+    logger.info(f"Loaded {loaded} checks results from '{path}'")
+
 
 class DummyLock:
     def __await__(self):
@@ -59,96 +649,770 @@ class DummyLock:
         return self
 
 
+class CircuitOpenError(aiohttp.ClientError):
+    """
+    Raised when requesting a host that is known to be down.
+    """
+
+
+class CircuitBreaker:
+    """
+    Fail fast while an upstream host is known to be down.
+
+    After ``threshold`` consecutive failures, the circuit opens and requests
+    fail immediately with ``CircuitOpenError``. Once ``recovery`` seconds have
+    elapsed, a single probe request is let through: the circuit closes if it
+    succeeds, or opens again for twice as long otherwise.
+    """
+
+    # Breakers by host.
+    _registry: Dict[str, "CircuitBreaker"] = {}
+
+    @classmethod
+    def for_url(cls, url: str) -> "CircuitBreaker":
+        host = urllib.parse.urlparse(url).netloc
+        if (breaker := cls._registry.get(host)) is None:
+            breaker = cls._registry[host] = CircuitBreaker(host)
+        return breaker
+
+    @classmethod
+    def states(cls) -> Dict[str, str]:
+        return {host: breaker.state for host, breaker in cls._registry.items()}
+
+    def __init__(
+        self,
+        host: str,
+        threshold: Optional[int] = None,
+        recovery: Optional[float] = None,
+        max_recovery: Optional[float] = None,
+    ):
+        self.host = host
+        self.threshold = (
+            config.CIRCUIT_BREAKER_THRESHOLD if threshold is None else threshold
+        )
+        self.min_recovery = (
+            config.CIRCUIT_BREAKER_RECOVERY_SECONDS if recovery is None else recovery
+        )
+        self.max_recovery = (
+            config.CIRCUIT_BREAKER_MAX_RECOVERY_SECONDS
+            if max_recovery is None
+            else max_recovery
+        )
+        self.failures = 0
+        self.recovery = self.min_recovery
+        self.opened_until = 0.0
+
+    @property
+    def state(self) -> str:
+        if not self.is_open:
+            return "closed"
+        return "open" if time.monotonic() < self.opened_until else "half-open"
+
+    @property
+    def is_open(self) -> bool:
+        return self.threshold > 0 and self.failures >= self.threshold
+
+    def before_request(self):
+        """
+        Raise ``CircuitOpenError`` if the host is down, unless it is time to probe it.
+        """
+        if not self.is_open:
+            return
+        now = time.monotonic()
+        if now < self.opened_until:
+            raise CircuitOpenError(f"Circuit open for {self.host}")
+        # Let this probe through, but no other request until it completes.
+        self.opened_until = now + self.recovery
+
+    def record_success(self):
+        if self.is_open:
+            logger.info(f"Circuit closed for {self.host}")
+        self.failures = 0
+        self.recovery = self.min_recovery
+
+    def record_failure(self):
+        self.failures += 1
+        if not self.is_open:
+            return
+        if self.failures > self.threshold:
+            # The probe failed, wait longer before the next one.
+            self.recovery = min(self.recovery * 2, self.max_recovery)
+        logger.warning(f"Circuit open for {self.host} during {self.recovery}s")
+        self.opened_until = time.monotonic() + self.recovery
+
+
+class RateLimiter:
+    """
+    Pace the requests sent to an upstream host.
+
+    Requests take a token from a bucket refilled at the configured rate, if any.
+    The number of concurrent requests follows the responses (AIMD): it grows by
+    one every ``limit`` successful responses, and is halved when the host
+    answers with ``429`` or ``503``, times out, or slows down. Requests are also
+    paused for as long as the host asks, with ``Retry-After`` or the GitHub
+    rate-limit headers.
+    """
+
+    # Limiters by host.
+    _registry: Dict[str, "RateLimiter"] = {}
+
+    # Latency under which slowdowns are not worth reacting to.
+    MIN_LATENCY_SECONDS = 0.05
+
+    @classmethod
+    def for_url(cls, url: str) -> "RateLimiter":
+        host = urllib.parse.urlparse(url).netloc
+        if (limiter := cls._registry.get(host)) is None:
+            limiter = cls._registry[host] = RateLimiter(host)
+        return limiter
+
+    @classmethod
+    def states(cls) -> Dict[str, Dict[str, Any]]:
+        return {host: limiter.state for host, limiter in cls._registry.items()}
+
+    def __init__(
+        self,
+        host: str,
+        rate: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+        latency_factor: Optional[float] = None,
+        max_pause: Optional[float] = None,
+    ):
+        self.host = host
+        rates = config.RATE_LIMIT_REQUESTS_PER_SECOND
+        self.rate = float(rates.get(host, rates.get("*", 0)) if rate is None else rate)
+        self.max_concurrency = (
+            config.REQUESTS_MAX_CONNECTIONS_PER_HOST
+            if max_concurrency is None
+            else max_concurrency
+        )
+        self.latency_factor = (
+            config.RATE_LIMIT_LATENCY_FACTOR
+            if latency_factor is None
+            else latency_factor
+        )
+        self.max_pause = (
+            config.RATE_LIMIT_MAX_PAUSE_SECONDS if max_pause is None else max_pause
+        )
+        self.limit = float(self.max_concurrency)
+        self.active = 0
+        self.tokens = max(self.rate, 1.0)
+        self.refilled_at = time.monotonic()
+        self.paused_until = 0.0
+        self.decreased_at = 0.0
+        # Recent and long-term averages of the time to response headers.
+        self.latency: Optional[float] = None
+        self.baseline: Optional[float] = None
+        self._waiters: List[asyncio.Future] = []
+
+    @property
+    def state(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        self._refill(now)
+        return {
+            "rate": self.rate,
+            "tokens": round(self.tokens, 2),
+            "active": self.active,
+            "limit": round(self.limit, 2),
+            "paused_seconds": round(max(0.0, self.paused_until - now), 2),
+            "latency_seconds": None if self.latency is None else round(self.latency, 3),
+        }
+
+    def _refill(self, now: float):
+        if self.rate > 0:
+            elapsed = now - self.refilled_at
+            self.tokens = min(max(self.rate, 1.0), self.tokens + elapsed * self.rate)
+        self.refilled_at = now
+
+    def _delay(self) -> Optional[float]:
+        """
+        Number of seconds to wait before sending a request, ``0`` if it can be
+        sent right away, or ``None`` until another request completes.
+        """
+        now = time.monotonic()
+        if now < self.paused_until:
+            return self.paused_until - now
+        if self.active >= int(self.limit):
+            return None
+        self._refill(now)
+        if self.rate > 0 and self.tokens < 1:
+            return (1 - self.tokens) / self.rate
+        return 0
+
+    async def acquire(self):
+        while (delay := self._delay()) != 0:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await asyncio.wait_for(waiter, timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                self._waiters.remove(waiter)
+        if self.rate > 0:
+            self.tokens -= 1
+        self.active += 1
+
+    def release(self):
+        self.active -= 1
+        # Let the waiting requests check again.
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    @asynccontextmanager
+    async def request(self) -> AsyncGenerator[None, None]:
+        await self.acquire()
+        try:
+            yield
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            self._decrease()
+            raise
+        finally:
+            self.release()
+
+    def record(self, status: int, headers, elapsed: float):
+        """
+        Adapt to the response of the host, received after ``elapsed`` seconds.
+        """
+        if status >= 400 or headers.get("X-RateLimit-Remaining") == "0":
+            self._pause(headers)
+
+        if status in (429, 503):
+            self._decrease()
+            return
+        if status >= 500:
+            # Failures are handled by the circuit breaker.
+            return
+
+        if self.latency is None or self.baseline is None:
+            self.latency = self.baseline = elapsed
+        else:
+            self.latency = 0.3 * elapsed + 0.7 * self.latency
+            self.baseline = 0.02 * elapsed + 0.98 * self.baseline
+        slow = self.latency_factor * max(self.baseline, self.MIN_LATENCY_SECONDS)
+        if self.latency_factor > 0 and self.latency > slow:
+            self._decrease()
+        else:
+            self.limit = min(self.limit + 1 / self.limit, float(self.max_concurrency))
+
+    def _pause(self, headers):
+        pause = 0.0
+        if retry_after := headers.get("Retry-After"):
+            try:
+                pause = float(retry_after)
+            except ValueError:
+                try:
+                    pause = (utcfromhttpdate(retry_after) - utcnow()).total_seconds()
+                except (TypeError, ValueError):
+                    pass
+        elif headers.get("X-RateLimit-Remaining") == "0":
+            try:
+                pause = float(headers.get("X-RateLimit-Reset", 0)) - time.time()
+            except ValueError:
+                pass
+        if pause <= 0:
+            return
+        pause = min(pause, self.max_pause)
+        logger.warning(f"Pause requests to {self.host} during {pause:.1f}s")
+        self.paused_until = max(self.paused_until, time.monotonic() + pause)
+
+    def _decrease(self):
+        now = time.monotonic()
+        # Requests that were sent together fail together, only react once.
+        if now - self.decreased_at < max(self.latency or 0.0, 1.0):
+            return
+        self.decreased_at = now
+        self.limit = max(self.limit / 2, 1.0)
+        logger.info(f"Reduce concurrency of requests to {self.host} to {self.limit}")
+
+
+class ConcurrencyBudget:
+    """
+    Process-wide limits of concurrency, shared by the checks and helpers.
+
+    Upstream requests take a slot for their host and a global slot, which are
+    only held during the request itself. The workers spawned by
+    ``run_parallel()`` come from a common pool, so that nested calls never
+    exceed it.
+    """
+
+    # Budgets by event loop, since semaphores can't be shared between loops.
+    _instances: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def current(cls) -> "ConcurrencyBudget":
+        loop = asyncio.get_running_loop()
+        if (budget := cls._instances.get(loop)) is None:
+            budget = cls._instances[loop] = ConcurrencyBudget()
+        return budget
+
+    def __init__(
+        self,
+        max_requests: Optional[int] = None,
+        max_requests_per_host: Optional[int] = None,
+        max_workers: Optional[int] = None,
+    ):
+        self.max_requests = (
+            config.REQUESTS_MAX_CONNECTIONS if max_requests is None else max_requests
+        )
+        self.max_requests_per_host = (
+            config.REQUESTS_MAX_CONNECTIONS_PER_HOST
+            if max_requests_per_host is None
+            else max_requests_per_host
+        )
+        self.max_workers = (
+            config.REQUESTS_MAX_WORKERS if max_workers is None else max_workers
+        )
+        self.workers = 0
+        self._requests = asyncio.Semaphore(self.max_requests)
+        self._hosts: Dict[str, asyncio.Semaphore] = {}
+
+    @asynccontextmanager
+    async def request(self, url: str) -> AsyncGenerator[None, None]:
+        """
+        Wait for a slot to send a request to the specified URL.
+        """
+        host = urllib.parse.urlparse(url).netloc
+        if (semaphore := self._hosts.get(host)) is None:
+            semaphore = self._hosts[host] = asyncio.Semaphore(
+                self.max_requests_per_host
+            )
+        # Wait for the host first, so that a busy host does not hold global
+        # slots that requests to other hosts could use.
+        async with semaphore:
+            async with self._requests:
+                yield
+
+    def try_acquire_worker(self) -> bool:
+        """
+        Reserve a worker if the pool is not exhausted. Never blocks.
+        """
+        if self.workers >= self.max_workers:
+            return False
+        self.workers += 1
+        return True
+
+    def release_worker(self):
+        self.workers -= 1
+
+
+class DeadlineExceeded(Exception):
+    """
+    Raised when the deadline of the current check is reached.
+    """
+
+
+# Monotonic time at which the work of the current check should stop.
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "deadline", default=None
+)
+
+
+@contextmanager
+def deadline(seconds: Optional[float]):
+    """
+    Set the deadline of the work done in this context, including the tasks it
+    spawns. Nested deadlines can only be shorter.
+    """
+    if seconds is None:
+        yield
+        return
+    at = time.monotonic() + seconds
+    if (current := _deadline.get()) is not None:
+        at = min(at, current)
+    token = _deadline.set(at)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+@contextmanager
+def without_deadline():
+    """
+    Clear the deadline in this context, eg. for work shared with other checks,
+    which should not be bound to the deadline of the check that started it.
+    """
+    token = _deadline.set(None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    """
+    Number of seconds left before the current deadline, if any.
+    """
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
+
+
+@asynccontextmanager
+async def within_deadline(grace: float = 0) -> AsyncGenerator[None, None]:
+    """
+    Cancel the work of this context with ``DeadlineExceeded`` once the current
+    deadline (plus ``grace`` seconds) is reached.
+    """
+    remaining = remaining_time()
+    if remaining is None:
+        yield
+        return
+    remaining += grace
+    if remaining <= 0:
+        raise DeadlineExceeded()
+    try:
+        async with asyncio.timeout(remaining) as scope:
+            yield
+    except TimeoutError:
+        if scope.expired():
+            raise DeadlineExceeded() from None
+        raise
+
+
+@asynccontextmanager
+async def request_slot(url: str) -> AsyncGenerator[Callable, None]:
+    """
+    Wait until a request to the specified URL is allowed by the rate limiter of
+    its host and the current concurrency budget. The request is cancelled if
+    the current deadline is reached.
+
+    Yields a function to call with the response, to adapt the rate limiter.
+    """
+    limiter = RateLimiter.for_url(url)
+    async with (
+        within_deadline(),
+        limiter.request(),
+        ConcurrencyBudget.current().request(url),
+    ):
+        started = time.monotonic()
+
+        def record(response):
+            elapsed = time.monotonic() - started
+            limiter.record(response.status, response.headers, elapsed)
+
+        yield record
+
+
 retry_decorator = backoff.on_exception(
     backoff.expo,
     (aiohttp.ClientError, asyncio.TimeoutError),
     max_tries=config.REQUESTS_MAX_RETRIES + 1,  # + 1 because REtries.
+    giveup=lambda e: isinstance(e, CircuitOpenError),
 )
 
 
+async def _fetch(method: str, url: str, read, **kwargs) -> Any:
+    breaker = CircuitBreaker.for_url(url)
+    breaker.before_request()
+    try:
+        async with request_slot(url) as record, ClientSession() as session:
+            async with session.request(method, url, **kwargs) as response:
+                record(response)
+                result = await read(response)
+    except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+        breaker.record_failure()
+        raise
+    if response.status >= 500:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    return result
+
+
 @retry_decorator
 async def fetch_json(url: str, **kwargs) -> Any:
     human_url = urllib.parse.unquote(url)
     logger.debug(f"Fetch JSON from '{human_url}'")
-    async with ClientSession() as session:
-        async with session.get(url, **kwargs) as response:
-            return await response.json()
+    return await _fetch(
+        "GET", url, lambda response: response.json(loads=json_decode), **kwargs
+    )
 
 
 @retry_decorator
 async def fetch_text(url: str, **kwargs) -> str:
     human_url = urllib.parse.unquote(url)
     logger.debug(f"Fetch text from '{human_url}'")
-    async with ClientSession() as session:
-        async with session.get(url, **kwargs) as response:
-            return await response.text()
+    return await _fetch("GET", url, lambda response: response.text(), **kwargs)
+
+
+async def _read_head(response) -> Tuple[int, Dict[str, str]]:
+    return response.status, dict(response.headers)
 
 
 @retry_decorator
 async def fetch_head(url: str, **kwargs) -> Tuple[int, Dict[str, str]]:
     human_url = urllib.parse.unquote(url)
     logger.debug(f"Fetch HEAD from '{human_url}'")
-    async with ClientSession() as session:
-        async with session.head(url, **kwargs) as response:
-            return response.status, dict(response.headers)
+    return await _fetch("HEAD", url, _read_head, **kwargs)
 
 
-@asynccontextmanager
-async def ClientSession() -> AsyncGenerator[aiohttp.ClientSession, None]:
+# The pools where checks run their CPU-bound steps, by kind.
+_pools: Dict[str, concurrent.futures.Executor] = {}
+
+
+def get_pool(threads: bool = False) -> concurrent.futures.Executor:
+    kind = "thread" if threads or config.CPU_POOL == "thread" else "process"
+    if (pool := _pools.get(kind)) is None:
+        max_workers = config.CPU_POOL_MAX_WORKERS or None
+        if kind == "thread":
+            pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="telescope-cpu"
+            )
+        else:
+            # Forking a process that runs threads and an event loop is unsafe.
+            pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        _pools[kind] = pool
+    return pool
+
+
+async def run_in_pool(func, *args, threads: bool = False) -> Any:
+    """
+    Run a CPU-bound function off the event loop, in the shared process pool.
+
+    The function, its arguments and its result must be picklable, unless
+    ``threads`` is set. The thread pool suits functions that release the GIL
+    (eg. ``hashlib``), or whose results can't be pickled.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_pool(threads), functools.partial(func, *args))
+
+
+def shutdown_pools():
+    for pool in _pools.values():
+        pool.shutdown(wait=False, cancel_futures=True)
+    _pools.clear()
+
+
+def create_session() -> aiohttp.ClientSession:
     timeout = aiohttp.ClientTimeout(total=config.REQUESTS_TIMEOUT_SECONDS)
     headers = {"User-Agent": "telescope", **config.DEFAULT_REQUEST_HEADERS}
-    async with aiohttp.ClientSession(headers=headers, timeout=timeout) as session:
+    connector = aiohttp.TCPConnector(
+        limit=config.REQUESTS_MAX_CONNECTIONS,
+        limit_per_host=config.REQUESTS_MAX_CONNECTIONS_PER_HOST,
+        keepalive_timeout=config.REQUESTS_KEEPALIVE_SECONDS,
+        ttl_dns_cache=config.REQUESTS_DNS_CACHE_SECONDS,
+    )
+    return aiohttp.ClientSession(
+        headers=headers,
+        timeout=timeout,
+        connector=connector,
+        json_serialize=json_encode,
+    )
+
+
+# The long-lived session shared by all helpers and checks, with the loop it runs in.
+_shared_session: Optional[aiohttp.ClientSession] = None
+_shared_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+async def open_shared_session():
+    """
+    Create the HTTP session whose connections are reused by every request
+    made in this event loop.
+    """
+    global _shared_session, _shared_session_loop
+    await close_shared_session()
+    _shared_session = create_session()
+    _shared_session_loop = asyncio.get_running_loop()
+
+
+async def close_shared_session():
+    global _shared_session, _shared_session_loop
+    session, _shared_session, _shared_session_loop = _shared_session, None, None
+    if session is not None:
+        await session.close()
+
+
+@asynccontextmanager
+async def shared_session() -> AsyncGenerator[aiohttp.ClientSession, None]:
+    """
+    Open the shared HTTP session for the duration of the context.
+    """
+    await open_shared_session()
+    try:
+        async with ClientSession() as session:
+            yield session
+    finally:
+        await close_shared_session()
+
+
+@asynccontextmanager
+async def ClientSession() -> AsyncGenerator[aiohttp.ClientSession, None]:
+    """
+    Use the shared HTTP session if it was opened, or a short-lived one otherwise.
+    """
+    if (
+        _shared_session is not None
+        and _shared_session_loop is asyncio.get_running_loop()
+        and not _shared_session.closed
+    ):
+        yield _shared_session
+        return
+
+    async with create_session() as session:
         yield session
 
 
-async def run_parallel(*futures, parallel_workers=config.REQUESTS_MAX_PARALLEL):
+class _WorkerDone:
+    pass
+
+
+async def iter_parallel(
+    factories: Union[Iterable[Any], AsyncIterable[Any]],
+    parallel_workers: int = config.REQUESTS_MAX_PARALLEL,
+    fail_fast: bool = False,
+) -> AsyncGenerator[Tuple[int, Any], None]:
     """
-    Consume a list of futures from several workers, and return the list of
-    results.
+    Run the coroutines produced by the specified factories from several workers,
+    and yield ``(index, result)`` as soon as each of them is done.
+
+    The factories (or coroutines) are pulled lazily from the (async) iterable,
+    and at most ``parallel_workers`` results are kept waiting for the consumer,
+    so that memory remains bounded with very large inputs.
+
+    The workers are taken from the process-wide budget. If none is available,
+    the coroutines are awaited sequentially by the consumer itself, so that
+    nested calls never wait for each other's workers.
+
+    With ``fail_fast``, the first error is raised immediately and the pending
+    work is cancelled. Otherwise, the remaining results are yielded and the
+    first error is raised at the end. In both cases, ``DeadlineExceeded`` is
+    raised as soon as the current deadline is reached.
     """
-    # Parallel means at least 2 :)
-    if len(futures) == 1:
-        return [await futures[0]]
+    if isinstance(factories, AsyncIterable):
+        iterator = factories.__aiter__()
+    else:
 
-    async def worker(results_by_index, queue):
-        while True:
-            i, future = await queue.get()
+        async def wrap():
+            for factory in factories:
+                yield factory
+
+        iterator = wrap()
+
+    # Async generators can't be iterated concurrently.
+    iterator_lock = asyncio.Lock()
+    exhausted = False
+    counter = 0
+
+    async def next_item():
+        nonlocal exhausted, counter
+        async with iterator_lock:
+            if exhausted:
+                return None
             try:
-                result = await future
-                results_by_index[i] = result
-            finally:
-                # Mark item as processed.
-                queue.task_done()
+                factory = await iterator.__anext__()
+            except StopAsyncIteration:
+                exhausted = True
+                return None
+            counter += 1
+            return counter - 1, factory
 
-    # Results dict will be populated by workers.
-    results_by_index = {}
+    async def execute(factory):
+        return await (factory() if callable(factory) else factory)
 
-    # Build the queue of futures to consume.
-    queue = asyncio.Queue()
-    for i, future in enumerate(futures):
-        queue.put_nowait((i, future))
+    # Results that are waiting for the consumer: (index, result, error).
+    results: asyncio.Queue = asyncio.Queue(maxsize=max(parallel_workers, 1))
+    budget = ConcurrencyBudget.current()
+
+    async def worker():
+        try:
+            while (item := await next_item()) is not None:
+                i, factory = item
+                try:
+                    await results.put((i, await execute(factory), None))
+                except Exception as exc:
+                    await results.put((i, None, exc))
+                    if fail_fast:
+                        break
+        except Exception as exc:
+            # The iterable of factories failed.
+            await results.put((None, None, exc))
+        await results.put(_WorkerDone)
 
-    # Instantiate workers that will consume the queue.
     worker_tasks = []
-    for i in range(parallel_workers):
-        task = asyncio.create_task(worker(results_by_index, queue))
-        worker_tasks.append(task)
+    running = 0
+    first_error = None
+    try:
+        while True:
+            # Instantiate the workers that the budget allows.
+            while (
+                not exhausted
+                and running < parallel_workers
+                and budget.try_acquire_worker()
+            ):
+                task = asyncio.create_task(worker())
+                # Release even if cancelled before it started.
+                task.add_done_callback(lambda _: budget.release_worker())
+                worker_tasks.append(task)
+                running += 1
+
+            if running > 0:
+                async with within_deadline():
+                    received = await results.get()
+                if received is _WorkerDone:
+                    running -= 1
+                    continue
+                i, result, error = received
+            elif (item := await next_item()) is not None:
+                # No worker available, consume from here.
+                i, factory = item
+                try:
+                    async with within_deadline():
+                        result, error = await execute(factory), None
+                except Exception as exc:
+                    result, error = None, exc
+            else:
+                break
+
+            if error is not None:
+                if fail_fast or isinstance(error, DeadlineExceeded):
+                    raise error
+                first_error = first_error or error
+            else:
+                yield i, result
+
+        if first_error is not None:
+            raise first_error
+    finally:
+        # Stop pending work, if any (fail fast or consumer gone).
+        for task in worker_tasks:
+            task.cancel()
+        await asyncio.gather(*worker_tasks, return_exceptions=True)
+        if isinstance(iterator, AsyncGenerator):
+            await iterator.aclose()
 
-    # Wait for the queue to be processed completely.
-    await queue.join()
 
-    # Stop workers and wait until done.
-    for task in worker_tasks:
-        task.cancel()
-    errors = await asyncio.gather(*worker_tasks, return_exceptions=True)
+async def run_parallel(*futures, parallel_workers=config.REQUESTS_MAX_PARALLEL):
+    """
+    Consume a list of futures from several workers, and return the list of
+    results.
 
-    # If some errors happened in the workers, re-raise here.
-    real_errors = [e for e in errors if not isinstance(e, asyncio.CancelledError)]
-    if len(real_errors) > 0:
-        raise real_errors[0]
+    The first error is raised as soon as it happens, and the pending futures
+    are cancelled. See ``iter_parallel()``.
+    """
+    # Parallel means at least 2 :)
+    if len(futures) == 1:
+        return [await futures[0]]
 
-    # Return the results in the same order as the list of futures.
-    return [results_by_index[k] for k in sorted(results_by_index.keys())]
+    results = [None] * len(futures)
+    try:
+        async for i, result in iter_parallel(
+            futures, parallel_workers=parallel_workers, fail_fast=True
+        ):
+            results[i] = result
+    finally:
+        # Futures that were never started won't be.
+        for future in futures:
+            if (
+                asyncio.iscoroutine(future)
+                and inspect.getcoroutinestate(future) == inspect.CORO_CREATED
+            ):
+                future.close()
+    return results
 
 
 def utcnow():
@@ -169,74 +1433,373 @@ def utcfromhttpdate(httpdate):
     return email.utils.parsedate_to_datetime(httpdate).replace(tzinfo=timezone.utc)
 
 
+STREAM_CONTENT_TYPES = ("application/x-ndjson", "text/event-stream")
+
+
+async def _stream_checks(request, results, content_type: str) -> web.StreamResponse:
+    """
+    Write each check result as soon as it is available, followed by the
+    overall success. Since the response status is sent first, it is always 200.
+    """
+    response = web.StreamResponse(
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+    response.content_type = content_type
+    await response.prepare(request)
+
+    def event(name, data):
+        encoded = json_encode(data)
+        if content_type == "text/event-stream":
+            return f"event: {name}\ndata: {encoded}\n\n".encode()
+        return f"{encoded}\n".encode()
+
+    all_success = True
+    async for _, check in results:
+        all_success = all_success and check["success"]
+        await response.write(event("check", check))
+    await response.write(event("end", {"done": True, "success": all_success}))
+    await response.write_eof()
+    return response
+
+
+async def _generations(request, results: List[Dict]) -> List[str]:
+    """
+    Identify the rendered version of each entry, which changes along the
+    cached result, the bugs list and the history.
+    """
+    caches = [
+        await request.app["telescope.tracker"].generation(),
+        await request.app["telescope.history"].generation(),
+    ]
+    return [
+        hashlib.sha256(
+            json_encode(
+                [
+                    caches,
+                    # Everything but the (large) data, which changes along the
+                    # timestamp, and the age, which changes every second.
+                    {
+                        k: v
+                        for k, v in c.items()
+                        if k not in ("data", "buglist", "history", "age")
+                    },
+                ]
+            ).encode()
+        ).hexdigest()
+        for c in results
+    ]
+
+
+def _remaining_ttls(results: List[Dict]) -> List[int]:
+    """
+    Number of seconds before each result expires.
+    """
+    now = utcnow()
+    remaining = []
+    for c in results:
+        # Errors are cached for a short while only.
+        ttl = c["ttl"] if c["success"] else min(c["ttl"], config.ERROR_TTL)
+        age = (now - utcfromisoformat(c["datetime"])).total_seconds()
+        remaining.append(max(0, int(ttl - age)))
+    return remaining
+
+
+def _validators(
+    results: List[Dict], generations: List[str], ttls: List[int], variant: str
+) -> Dict[str, str]:
+    """
+    Caching headers of the rendered results.
+    """
+    etag = hashlib.sha256(":".join([variant, *generations]).encode()).hexdigest()
+    last_modified = max(utcfromisoformat(c["datetime"]) for c in results)
+    return {
+        "ETag": f'"{etag}"',
+        "Last-Modified": email.utils.format_datetime(last_modified, usegmt=True),
+        "Cache-Control": f"max-age={min(ttls)}",
+        "Vary": "Accept, Accept-Encoding",
+    }
+
+
+def _is_not_modified(request, headers: Dict[str, str]) -> bool:
+    # ``If-Modified-Since`` is ignored, since ``Last-Modified`` does not account
+    # for changes of the bugs list and history.
+    if request.if_none_match is None:
+        return False
+    etag = headers["ETag"].strip('"')
+    return any(e.value in (etag, "*") for e in request.if_none_match)
+
+
+def _render_fragment(request, key: str, ttl: int, render: Callable[[], Any]) -> Any:
+    """
+    Render an entry once per generation (see ``RENDER_CACHE_MAX_BYTES``).
+    """
+    cache = request.app.get("telescope.rendered")
+    if cache is None:
+        return render()
+    fragment = cache.get(key)
+    if fragment is None:
+        fragment = render()
+        cache.set(key, fragment, ttl=ttl)
+    return fragment
+
+
+def compressors() -> Dict[str, Callable[[bytes], bytes]]:
+    """
+    Available content encodings, ``br`` and ``zstd`` if their library is installed.
+    """
+    available: Dict[str, Callable[[bytes], bytes]] = {
+        "gzip": functools.partial(gzip.compress, compresslevel=6),
+    }
+    if brotli is not None:  # pragma: nocover
+        available["br"] = functools.partial(brotli.compress, quality=5)
+    if zstandard is not None:  # pragma: nocover
+        available["zstd"] = zstandard.ZstdCompressor(level=3).compress
+    return available
+
+
+def _parse_qualities(header: str) -> Dict[str, float]:
+    """
+    Parse the values of a header like ``Accept`` or ``Accept-Encoding`` with
+    their quality (``q`` parameter), ignoring the other parameters.
+    """
+    accepted: Dict[str, float] = {}
+    for part in header.lower().split(","):
+        value, *params = [p.strip() for p in part.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, param_value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(param_value)
+                except ValueError:
+                    quality = 0
+        if value:
+            accepted[value] = quality
+    return accepted
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the content encoding with the highest quality in the specified
+    ``Accept-Encoding`` header, in the order of ``COMPRESSION_ENCODINGS``
+    when equal.
+
+    >>> negotiate_encoding("gzip, deflate")
+    'gzip'
+    """
+    accepted = _parse_qualities(accept_encoding)
+    available = compressors()
+    qualities = {
+        encoding: accepted.get(encoding, accepted.get("*", 0))
+        for encoding in config.COMPRESSION_ENCODINGS
+        if encoding in available
+    }
+    candidates = [e for e, q in qualities.items() if q > 0]
+    return max(candidates, key=qualities.__getitem__, default=None)
+
+
+def negotiate_media_types(
+    accept: str, offers: Sequence[str], explicit: Sequence[str] = ()
+) -> List[str]:
+    """
+    Return the offered media types that are acceptable in the specified
+    ``Accept`` header, by decreasing quality and in the order of ``offers``
+    when equal. The ``explicit`` ones are not matched by wildcards.
+
+    >>> negotiate_media_types("text/plain;q=0.5, */*", ["text/plain", "text/html"])
+    ['text/html', 'text/plain']
+    """
+    accepted = _parse_qualities(accept)
+    qualities = {}
+    for media_type in offers:
+        ranges = [media_type]
+        if media_type not in explicit:
+            ranges += [media_type.split("/")[0] + "/*", "*/*"]
+        quality = next((accepted[r] for r in ranges if r in accepted), 0)
+        if quality > 0:
+            qualities[media_type] = quality
+    return sorted(qualities, key=lambda media_type: -qualities[media_type])
+
+
+def _render_text_details(check: Dict) -> str:
+    text = "\n" * 2 + "\n{project}  {name}\n".format(**check)
+    check = {
+        **check,
+        "parameters": repr(check["parameters"]),
+        "data": json_encode(check["data"], indent=True),
+    }
+    fields = (
+        "url",
+        "description",
+        "documentation",
+        "parameters",
+        "data",
+        "troubleshooting",
+    )
+    return text + "\n".join(
+        chain(
+            *[
+                (
+                    "  " + field.capitalize() + ":",
+                    textwrap.indent(check[field], "    "),
+                )
+                for field in fields
+            ]
+        )
+    )
+
+
+def _render_text(
+    request, results: List[Dict], generations: List[str], ttls: List[int]
+) -> bytes:
+    # Multiple checks can be rendered as text to be easier
+    # to read (eg. in Pingdom "Root cause" UI).
+    max_project_length = max([len(c["project"]) for c in results])
+    max_name_length = max([len(c["name"]) for c in results])
+    text = "\n".join(
+        [
+            (
+                check["project"].ljust(max_project_length + 2)
+                + check["name"].ljust(max_name_length + 2)
+                + repr(check["success"])
+            )
+            for check in results
+        ]
+    )
+    # Let's add some details about each failing check at the bottom.
+    for check, generation, ttl in zip(results, generations, ttls):
+        if not check["success"]:
+            text += _render_fragment(
+                request,
+                f"text-{generation}",
+                ttl,
+                functools.partial(_render_text_details, check),
+            )
+    return text.encode()
+
+
+def _render_json_entry(check: Dict) -> bytes:
+    return json_encode(check).encode()
+
+
+def _render_json(
+    request, view_result: Any, generations: List[str], ttls: List[int]
+) -> bytes:
+    results = [view_result] if isinstance(view_result, dict) else view_result
+    # Stitched from the serialized entries.
+    fragments = [
+        _render_fragment(
+            request,
+            f"json-{generation}",
+            ttl,
+            functools.partial(_render_json_entry, check),
+        )
+        for check, generation, ttl in zip(results, generations, ttls)
+    ]
+    if isinstance(view_result, dict):
+        return fragments[0]
+    return b"[" + b",".join(fragments) + b"]"
+
+
+async def _compress(encoding: str, body: bytes) -> Tuple[Optional[str], bytes]:
+    """
+    Compress the response body off the event loop, unless it is too small to
+    be worth it.
+    """
+    if len(body) < config.COMPRESSION_MIN_BYTES:
+        return None, body
+    # The compression libraries release the GIL.
+    return encoding, await run_in_pool(compressors()[encoding], body, threads=True)
+
+
 def render_checks(func):
+    """
+    Render the result(s) returned by the decorated view as JSON or text.
+
+    Views of several checks can return an async iterable of ``(index, result)``
+    in the order in which the checks finish, in order to stream them as
+    NDJSON or Server-Sent Events.
+    """
+
     async def wrapper(request):
         # First, check that client requests supported output format.
-        is_text_output = False
         accepts = ",".join(request.headers.getall("Accept", []))
-        # Text is rendered only if explicitly specified.
-        if "text/plain" in accepts:
-            is_text_output = True
-        elif "*/*" not in accepts and "application/json" not in accepts:
+        # Text and streams are rendered only if explicitly specified.
+        acceptable = negotiate_media_types(
+            accepts,
+            ["text/plain", *STREAM_CONTENT_TYPES, "application/json"],
+            explicit=["text/plain", *STREAM_CONTENT_TYPES],
+        )
+        if not acceptable:
             # Client is requesting an unknown format.
             raise web.HTTPNotAcceptable()
 
         # Execute the decorated view.
         view_result = await func(request)
 
+        if not isinstance(view_result, AsyncIterable):
+            # A single result cannot be streamed.
+            acceptable = [t for t in acceptable if t not in STREAM_CONTENT_TYPES]
+            if not acceptable:
+                raise web.HTTPNotAcceptable()
+        content_type = acceptable[0]
+        is_text_output = content_type == "text/plain"
+
+        if isinstance(view_result, AsyncIterable):
+            if content_type in STREAM_CONTENT_TYPES:
+                return await _stream_checks(request, view_result, content_type)
+            # Wait for all checks, and keep them in order.
+            finished = dict([item async for item in view_result])
+            view_result = [finished[i] for i in sorted(finished)]
+
         # Render the response.
         results = [view_result] if isinstance(view_result, dict) else view_result
         all_success = all(c["success"] for c in results)
         status_code = 200 if all_success else 503
 
+        # Answer conditional requests without serializing the results.
+        variant = "text" if is_text_output else "json"
+        encoding = negotiate_encoding(request.headers.get("Accept-Encoding", ""))
+        generations = await _generations(request, results)
+        ttls = _remaining_ttls(results)
+        headers = _validators(
+            results, generations, ttls, f"{variant}:{encoding}" if encoding else variant
+        )
+        # Preconditions don't apply to failures, which pollers must notice.
+        if status_code == 200 and _is_not_modified(request, headers):
+            return web.Response(status=304, headers=headers)
+
         if is_text_output:
-            # Multiple checks can be rendered as text to be easier
-            # to read (eg. in Pingdom "Root cause" UI).
-            max_project_length = max([len(c["project"]) for c in results])
-            max_name_length = max([len(c["name"]) for c in results])
-            text = "\n".join(
-                [
-                    (
-                        check["project"].ljust(max_project_length + 2)
-                        + check["name"].ljust(max_name_length + 2)
-                        + repr(check["success"])
-                    )
-                    for check in results
-                ]
+            render = functools.partial(
+                _render_text, request, results, generations, ttls
             )
-            # Let's add some details about each failing check at the bottom.
-            fields = (
-                "url",
-                "description",
-                "documentation",
-                "parameters",
-                "data",
-                "troubleshooting",
+        else:
+            render = functools.partial(
+                _render_json, request, view_result, generations, ttls
             )
-            for check in [c for c in results if not c["success"]]:
-                text += "\n" * 2 + "\n{project}  {name}\n".format(**check)
-
-                check = {
-                    **check,
-                    "parameters": repr(check["parameters"]),
-                    "data": json.dumps(check["data"], indent=2),
-                }
-                text += "\n".join(
-                    chain(
-                        *[
-                            (
-                                "  " + field.capitalize() + ":",
-                                textwrap.indent(check[field], "    "),
-                            )
-                            for field in fields
-                        ]
-                    )
-                )
-
-            return web.Response(text=text, status=status_code)
 
-        # Default rendering is JSON.
-        return web.json_response(view_result, status=status_code)
+        if encoding is None:
+            body = render()
+        else:
+            # Compressed once per generation of the results.
+            cache = request.app.get("telescope.rendered")
+            key = f"{encoding}-{headers['ETag']}"
+            compressed = cache.get(key) if cache is not None else None
+            if compressed is None:
+                compressed = await _compress(encoding, render())
+                if cache is not None:
+                    cache.set(key, compressed, ttl=min(ttls))
+            encoding, body = compressed
+            if encoding is not None:
+                headers["Content-Encoding"] = encoding
+
+        return web.Response(
+            body=body,
+            status=status_code,
+            headers=headers,
+            content_type="text/plain" if is_text_output else "application/json",
+            charset="utf-8",
+        )
 
     return wrapper
 
@@ -307,16 +1870,39 @@ class BugTracker:
     async def ping(self) -> bool:
         """
         Returns True if we can succesfully hit and parse the /rest/whoami endpoint.
+
+        The result is cached for ``BUGTRACKER_PING_TTL`` seconds.
         """
-        url = f"{config.BUGTRACKER_URL}/rest/whoami"
-        try:
-            response = await fetch_json(
-                url, headers={"X-BUGZILLA-API-KEY": config.BUGTRACKER_API_KEY}
-            )
-            return "name" in response
-        except Exception as e:
-            logger.exception(e)
-            return False
+        cache_key = "bugtracker-ping"
+        async with self.cache.lock(cache_key) if self.cache else DummyLock():
+            success = await self.cache.aget(cache_key) if self.cache else None
+            if success is not None:
+                return success
+
+            url = f"{config.BUGTRACKER_URL}/rest/whoami"
+            try:
+                response = await fetch_json(
+                    url, headers={"X-BUGZILLA-API-KEY": config.BUGTRACKER_API_KEY}
+                )
+                success = "name" in response
+            except Exception as e:
+                logger.exception(e)
+                success = False
+
+            if self.cache:
+                await self.cache.aset(
+                    cache_key, success, ttl=config.BUGTRACKER_PING_TTL
+                )
+        return success
+
+    async def generation(self) -> Optional[str]:
+        """
+        Identifier of the cached list of bugs, which changes every time it is fetched.
+        """
+        if not self.cache:
+            # Fetched on every call.
+            return token_hex(8)
+        return await self.cache.aget("bugtracker-list-generation")
 
     async def fetch(self, project: str, name: str) -> List[BugInfo]:
         """
@@ -334,7 +1920,7 @@ class BugTracker:
 
         cache_key = "bugtracker-list"
         async with self.cache.lock(cache_key) if self.cache else DummyLock():
-            buglist = self.cache.get(cache_key) if self.cache else None
+            buglist = await self.cache.aget(cache_key) if self.cache else None
 
             if buglist is None:
                 # Fallback to an empty list when fetching fails. Caching this fallback value
@@ -352,7 +1938,12 @@ class BugTracker:
                     buglist = default_buglist
 
                 if self.cache:
-                    self.cache.set(cache_key, buglist, ttl=config.BUGTRACKER_TTL)
+                    await self.cache.aset(cache_key, buglist, ttl=config.BUGTRACKER_TTL)
+                    await self.cache.aset(
+                        f"{cache_key}-generation",
+                        token_hex(8),
+                        ttl=config.BUGTRACKER_TTL,
+                    )
 
         def _heat(datestr):
             dt = utcfromisoformat(datestr)
@@ -436,10 +2027,19 @@ class History:
     def __init__(self, cache=None):
         self.cache = cache
 
+    async def generation(self) -> Optional[str]:
+        """
+        Identifier of the cached history, which changes every time it is fetched.
+        """
+        if not self.cache:
+            # Fetched on every call.
+            return token_hex(8)
+        return await self.cache.aget("scalar-history-generation")
+
     async def fetch(self, project, name):
         cache_key = "scalar-history"
         async with self.cache.lock(cache_key) if self.cache else DummyLock():
-            history = self.cache.get(cache_key) if self.cache else None
+            history = await self.cache.aget(cache_key) if self.cache else None
 
             if history is None:
                 rows = []
@@ -461,7 +2061,10 @@ class History:
                     )
 
                 if self.cache:
-                    self.cache.set(cache_key, history, ttl=config.HISTORY_TTL)
+                    await self.cache.aset(cache_key, history, ttl=config.HISTORY_TTL)
+                    await self.cache.aset(
+                        f"{cache_key}-generation", token_hex(8), ttl=config.HISTORY_TTL
+                    )
 
         return history.get(f"{project}/{name}", [])
 
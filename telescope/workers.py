@@ -0,0 +1,151 @@
+import asyncio
+import logging
+import multiprocessing
+import multiprocessing.connection
+import os
+import signal
+import time
+from typing import Dict, List, Optional
+
+from . import config, utils
+
+
+logger = logging.getLogger(__name__)
+
+
+class Supervisor:
+    """
+    Run the Web app in several worker processes, that bind the same port with
+    ``SO_REUSEPORT`` so that the kernel balances the connections between them.
+
+    Workers that exit unexpectedly are restarted.
+    """
+
+    RESTART_DELAY_SECONDS = 1
+
+    def __init__(self, target, workers: int):
+        # Called in each worker process with its number.
+        self.target = target
+        self.workers = workers
+        self.processes: Dict[int, multiprocessing.process.BaseProcess] = {}
+        self._context = multiprocessing.get_context("spawn")
+        self._stopping = False
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self._on_sigterm)
+        self.start()
+        try:
+            while not self._stopping:
+                self.watch(timeout=1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def start(self):
+        for worker in range(self.workers):
+            self._spawn(worker)
+        logger.info(f"Started {self.workers} workers")
+
+    def watch(self, timeout: Optional[float] = None) -> List[int]:
+        """
+        Wait for workers to exit, restart them, and return their numbers.
+        """
+        sentinels = {p.sentinel: w for w, p in self.processes.items()}
+        exited = multiprocessing.connection.wait(list(sentinels), timeout=timeout)
+        restarted = []
+        for sentinel in exited:
+            if self._stopping:
+                break
+            worker = sentinels[sentinel]  # type: ignore
+            process = self.processes[worker]
+            process.join()
+            exitcode = process.exitcode
+            logger.error(f"Worker {worker} exited with code {exitcode}, restarting")
+            time.sleep(self.RESTART_DELAY_SECONDS)
+            self._spawn(worker)
+            restarted.append(worker)
+        return restarted
+
+    def stop(self, timeout: float = 10):
+        self._stopping = True
+        for process in self.processes.values():
+            if process.is_alive():
+                process.terminate()
+        for process in self.processes.values():
+            process.join(timeout)
+            if process.is_alive():  # pragma: nocover
+                process.kill()
+        logger.info(f"Stopped {self.workers} workers")
+
+    def _spawn(self, worker: int):
+        process = self._context.Process(
+            target=self.target, args=(worker,), name=f"telescope-worker-{worker}"
+        )
+        process.start()
+        self.processes[worker] = process
+
+    def _on_sigterm(self, signum, frame):
+        self._stopping = True
+
+
+class WorkerHeartbeat:
+    """
+    Record periodically in the shared cache that this worker is alive, so that
+    any worker can report the health of all of them.
+    """
+
+    def __init__(
+        self,
+        cache: utils.CacheBackend,
+        worker: int,
+        interval: Optional[int] = None,
+    ):
+        self.cache = cache
+        self.worker = worker
+        self.interval = (
+            config.WORKERS_HEARTBEAT_INTERVAL_SECONDS if interval is None else interval
+        )
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def cache_key(worker: int) -> str:
+        return f"worker-heartbeat-{worker}"
+
+    async def beat(self):
+        # Workers that miss a few beats are considered unresponsive.
+        await self.cache.aset(
+            self.cache_key(self.worker),
+            {"pid": os.getpid(), "beat": utils.utcnow().isoformat()},
+            ttl=self.interval * 3,
+        )
+
+    async def start(self):
+        await self.beat()
+        self._task = asyncio.create_task(self._beat_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _beat_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.beat()
+            except Exception as e:
+                logger.exception(e)
+
+
+async def workers_status(cache: utils.CacheBackend, workers: int) -> Dict[str, str]:
+    """
+    Health of each worker, as reported in the shared cache.
+    """
+    return {
+        f"worker-{w}": (
+            "ok" if await cache.aget(WorkerHeartbeat.cache_key(w)) else "unresponsive"
+        )
+        for w in range(workers)
+    }
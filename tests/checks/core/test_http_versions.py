@@ -1,8 +1,11 @@
+import asyncio
+import ssl
 from unittest import mock
 
 import pytest
+from aiohttp import web
 
-from checks.core.http_versions import run
+from checks.core.http_versions import native_probe, native_versions, run
 
 
 MODULE = "checks.core.http_versions"
@@ -10,17 +13,27 @@ MODULE = "checks.core.http_versions"
 
 @pytest.fixture
 def mocked_curl():
-    with mock.patch(f"{MODULE}.subprocess.run") as mocked_curl:
-        yield mocked_curl
+    outputs = {}
+
+    async def create_subprocess_exec(*args, **kwargs):
+        flag, url = args[2], args[3]
+        process = mock.Mock(returncode=0)
+        process.communicate = mock.AsyncMock(return_value=(outputs[url][flag], b""))
+        return process
+
+    with mock.patch(
+        f"{MODULE}.asyncio.create_subprocess_exec", side_effect=create_subprocess_exec
+    ):
+        yield outputs
+
+
+def curl_outputs(*versions):
+    flags = ["--http1.0", "--http1.1", "--http2", "--http3"]
+    return {flag: f"{v}\n".encode() for flag, v in zip(flags, versions)}
 
 
 async def test_positive(mocked_curl):
-    mocked_curl.side_effect = [
-        mock.Mock(stdout=b"1\n"),
-        mock.Mock(stdout=b"1.1\n"),
-        mock.Mock(stdout=b"2\n"),
-        mock.Mock(stdout=b"3\n"),
-    ]
+    mocked_curl["http://server.local"] = curl_outputs("1", "1.1", "2", "3")
 
     status, data = await run("http://server.local")
 
@@ -29,12 +42,7 @@ async def test_positive(mocked_curl):
 
 
 async def test_negative_missing(mocked_curl):
-    mocked_curl.side_effect = [
-        mock.Mock(stdout=b"1\n"),
-        mock.Mock(stdout=b"1.1\n"),
-        mock.Mock(stdout=b"2\n"),
-        mock.Mock(stdout=b"2\n"),
-    ]
+    mocked_curl["http://server.local"] = curl_outputs("1", "1.1", "2", "2")
 
     status, data = await run("http://server.local")
 
@@ -43,14 +51,128 @@ async def test_negative_missing(mocked_curl):
 
 
 async def test_negative_extra(mocked_curl):
-    mocked_curl.side_effect = [
-        mock.Mock(stdout=b"1\n"),
-        mock.Mock(stdout=b"1.1\n"),
-        mock.Mock(stdout=b"2\n"),
-        mock.Mock(stdout=b"3\n"),
-    ]
+    mocked_curl["http://server.local"] = curl_outputs("1", "1.1", "2", "3")
 
     status, data = await run("http://server.local", versions=["1", "1.1", "2"])
 
     assert status is False
     assert data == "HTTP version(s) 3 unexpectedly supported"
+
+
+async def test_several_urls(mocked_curl):
+    mocked_curl["http://a.local"] = curl_outputs("1", "1.1", "2", "3")
+    mocked_curl["http://b.local"] = curl_outputs("1", "1.1", "2", "2")
+
+    status, data = await run(urls=["http://a.local", "http://b.local"])
+
+    assert status is False
+    assert sorted(data["http://a.local"]) == ["1", "1.1", "2", "3"]
+    assert data["http://b.local"] == "HTTP version(s) 3 unsupported"
+
+
+async def test_no_url():
+    status, data = await run()
+
+    assert status is False
+    assert data == "No URL specified, use the url or urls parameter"
+
+
+async def test_unknown_probe():
+    status, data = await run("http://server.local", probe="h2spec")
+
+    assert status is False
+    assert data == "Unknown probe 'h2spec', use one of curl, native"
+
+
+async def test_curl_timeout(config):
+    config.REQUESTS_TIMEOUT_SECONDS = 0
+    process = mock.Mock(returncode=None)
+    process.communicate = mock.AsyncMock(side_effect=asyncio.TimeoutError)
+    process.wait = mock.AsyncMock()
+
+    with mock.patch(
+        f"{MODULE}.asyncio.create_subprocess_exec", return_value=process
+    ) as mocked:
+        status, data = await run("http://server.local", versions=["1"])
+
+    assert mocked.call_count == 4
+    assert process.kill.call_count == 4
+    assert status is False
+    assert data == "HTTP version(s) 1 unsupported"
+
+
+async def test_native_probe(aiohttp_server):
+    async def handler(request):
+        return web.Response(headers={"Alt-Svc": 'h3=":443"; ma=86400'})
+
+    app = web.Application()
+    app.router.add_route("*", "/", handler)
+    server = await aiohttp_server(app)
+
+    status, data = await run(
+        str(server.make_url("/")), versions=["1", "1.1", "3"], probe="native"
+    )
+
+    # HTTP/2 is only negotiated over TLS.
+    assert status is True
+    assert sorted(data) == ["1", "1.1", "3"]
+
+
+def fake_connection(response=b"", alpn=None):
+    reader = asyncio.StreamReader()
+    reader.feed_data(response)
+    reader.feed_eof()
+    writer = mock.Mock(drain=mock.AsyncMock())
+    writer.get_extra_info.return_value.selected_alpn_protocol.return_value = alpn
+    return reader, writer
+
+
+async def test_native_probe_negotiates_h2_over_tls():
+    connections = []
+
+    def open_connection(*args, **kwargs):
+        connections.append(fake_connection(b"HTTP/1.1 200 OK\r\n\r\n", alpn="h2"))
+        return connections[-1]
+
+    with mock.patch(
+        f"{MODULE}.asyncio.open_connection", side_effect=open_connection
+    ) as mocked:
+        versions = await native_versions("https://server.local:8443/path?q=1")
+
+    assert versions == {"1", "1.1", "2"}
+    host, port = mocked.call_args.args
+    assert (host, port) == ("server.local", 8443)
+    assert isinstance(mocked.call_args.kwargs["ssl"], ssl.SSLContext)
+    requests = [w.write.call_args.args[0] for _, w in connections if w.write.called]
+    assert any(r.startswith(b"HEAD /path?q=1 HTTP/1.1\r\n") for r in requests)
+
+
+async def test_native_probe_http1_0_only():
+    with mock.patch(
+        f"{MODULE}.asyncio.open_connection",
+        side_effect=lambda *args, **kwargs: fake_connection(b"HTTP/1.0 200 OK\r\n\r\n"),
+    ):
+        status, data = await run("http://server.local", versions=["1"], probe="native")
+
+    # HTTP/1.1 was answered with HTTP/1.0.
+    assert status is True
+    assert data == ["1"]
+
+
+async def test_native_probe_connection_errors(config):
+    with mock.patch(
+        f"{MODULE}.asyncio.open_connection", side_effect=ConnectionRefusedError
+    ):
+        status, data = await run("https://server.local", versions=["2"], probe="native")
+
+    assert status is False
+    assert data == "HTTP version(s) 2 unsupported"
+
+
+async def test_native_probe_timeout(config):
+    config.REQUESTS_TIMEOUT_SECONDS = 0.01
+
+    async def hang(url):
+        await asyncio.sleep(10)
+
+    assert await native_probe("http://server.local", hang) == set()
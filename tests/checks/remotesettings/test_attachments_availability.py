@@ -1,22 +1,26 @@
+import asyncio
 from unittest import mock
 
 import pytest
 
 from checks.remotesettings.attachments_availability import run
+from telescope.utils import deadline
 
 
 CHANGESET_URL = "/buckets/{}/collections/{}/changeset"
 RECORDS_URL = "/buckets/{}/collections/{}/records"
 
 
-async def test_positive(mock_responses, mock_aioresponses):
+async def test_positive(mock_aioresponses):
     server_url = "http://fake.local/v1"
-    mock_responses.get(
+    mock_aioresponses.get(
         server_url + "/",
         payload={"capabilities": {"attachments": {"base_url": "http://cdn/"}}},
     )
-    changes_url = server_url + CHANGESET_URL.format("monitor", "changes")
-    mock_responses.get(
+    changes_url = (
+        server_url + CHANGESET_URL.format("monitor", "changes") + "?_expected=0"
+    )
+    mock_aioresponses.get(
         changes_url,
         payload={
             "changes": [
@@ -25,7 +29,7 @@ async def test_positive(mock_responses, mock_aioresponses):
         },
     )
     records_url = server_url + RECORDS_URL.format("bid", "cid") + "?_expected=42"
-    mock_responses.get(
+    mock_aioresponses.get(
         records_url,
         payload={
             "data": [
@@ -44,14 +48,16 @@ async def test_positive(mock_responses, mock_aioresponses):
     assert data == {"missing": [], "checked": 2}
 
 
-async def test_negative(mock_responses, mock_aioresponses):
+async def test_negative(mock_aioresponses):
     server_url = "http://fake.local/v1"
-    mock_responses.get(
+    mock_aioresponses.get(
         server_url + "/",
         payload={"capabilities": {"attachments": {"base_url": "http://cdn/"}}},
     )
-    changes_url = server_url + CHANGESET_URL.format("monitor", "changes")
-    mock_responses.get(
+    changes_url = (
+        server_url + CHANGESET_URL.format("monitor", "changes") + "?_expected=0"
+    )
+    mock_aioresponses.get(
         changes_url,
         payload={
             "changes": [
@@ -60,7 +66,7 @@ async def test_negative(mock_responses, mock_aioresponses):
         },
     )
     records_url = server_url + RECORDS_URL.format("bid", "cid") + "?_expected=42"
-    mock_responses.get(
+    mock_aioresponses.get(
         records_url,
         payload={
             "data": [
@@ -78,6 +84,51 @@ async def test_negative(mock_responses, mock_aioresponses):
     assert data == {"missing": ["http://cdn/missing.jpg"], "checked": 2}
 
 
+async def test_partial_results_on_timeout(mock_aioresponses):
+    server_url = "http://fake.local/v1"
+    mock_aioresponses.get(
+        server_url + "/",
+        payload={"capabilities": {"attachments": {"base_url": "http://cdn/"}}},
+    )
+    changes_url = (
+        server_url + CHANGESET_URL.format("monitor", "changes") + "?_expected=0"
+    )
+    mock_aioresponses.get(
+        changes_url,
+        payload={
+            "changes": [
+                {"id": "abc", "bucket": "bid", "collection": "cid", "last_modified": 42}
+            ]
+        },
+    )
+    records_url = server_url + RECORDS_URL.format("bid", "cid") + "?_expected=42"
+    mock_aioresponses.get(
+        records_url,
+        payload={
+            "data": [
+                {"id": "abc", "attachment": {"location": "file.jpg"}},
+                {"id": "efg", "attachment": {"location": "slow.jpg"}},
+            ]
+        },
+    )
+    mock_aioresponses.head("http://cdn/file.jpg")
+
+    async def hang(url, **kwargs):
+        await asyncio.sleep(10)
+
+    mock_aioresponses.head("http://cdn/slow.jpg", callback=hang)
+
+    with deadline(0.2):
+        status, data = await run(server_url)
+
+    assert status is False
+    assert data == {
+        "missing": [],
+        "checked": 2,
+        "timed_out": "Timed out, 1 of 2 processed",
+    }
+
+
 @pytest.mark.parametrize(
     ("slice_percent", "expected_lower", "expected_upper"),
     [
@@ -92,15 +143,17 @@ async def test_negative(mock_responses, mock_aioresponses):
     ],
 )
 async def test_urls_slicing(
-    slice_percent, expected_lower, expected_upper, mock_responses
+    slice_percent, expected_lower, expected_upper, mock_aioresponses
 ):
     server_url = "http://fake.local/v1"
-    mock_responses.get(
+    mock_aioresponses.get(
         server_url + "/",
         payload={"capabilities": {"attachments": {"base_url": "http://cdn/"}}},
     )
-    changes_url = server_url + CHANGESET_URL.format("monitor", "changes")
-    mock_responses.get(
+    changes_url = (
+        server_url + CHANGESET_URL.format("monitor", "changes") + "?_expected=0"
+    )
+    mock_aioresponses.get(
         changes_url,
         payload={
             "changes": [
@@ -109,7 +162,7 @@ async def test_urls_slicing(
         },
     )
     records_url = server_url + RECORDS_URL.format("bid", "cid") + "?_expected=42"
-    mock_responses.get(
+    mock_aioresponses.get(
         records_url,
         payload={
             "data": [
@@ -1,7 +1,7 @@
 import io
 import zipfile
 
-from checks.remotesettings.attachments_bundles import run
+from checks.remotesettings.attachments_bundles import count_zip_files, run
 
 
 COLLECTION_URL = "/buckets/{}/collections/{}"
@@ -18,9 +18,9 @@ def build_zip(num_files=3):
     return zip_buffer.getvalue()
 
 
-async def test_negative(mock_responses, mock_aioresponses):
+async def test_negative(mock_aioresponses):
     server_url = "http://fake.local/v1"
-    mock_responses.get(
+    mock_aioresponses.get(
         server_url + "/",
         payload={
             "capabilities": {
@@ -36,13 +36,16 @@ async def test_negative(mock_responses, mock_aioresponses):
                 },
             }
         },
+        repeat=True,
     )
     may8_ts = 389664061000
     may8_http = "Mon, 08 May 1982 00:01:01 GMT"
     may8_iso = "1982-05-08T00:01:01+00:00"
 
-    changes_url = server_url + CHANGESET_URL.format("monitor", "changes")
-    mock_responses.get(
+    changes_url = (
+        server_url + CHANGESET_URL.format("monitor", "changes") + "?_expected=0"
+    )
+    mock_aioresponses.get(
         changes_url,
         payload={
             "changes": [
@@ -87,7 +90,7 @@ async def test_negative(mock_responses, mock_aioresponses):
     )
 
     for cid in ("missing", "ok", "badzip", "outdated", "late", "no-bundle"):
-        mock_responses.get(
+        mock_aioresponses.get(
             server_url + COLLECTION_URL.format("main-workspace", cid),
             payload={
                 "data": {
@@ -148,3 +151,9 @@ async def test_negative(mock_responses, mock_aioresponses):
             "status": "outdated",
         },
     }
+
+
+def test_count_zip_files():
+    # Called directly, since the process pool is not tracked by coverage.
+    assert count_zip_files(build_zip(num_files=2)) == 2
+    assert count_zip_files(b"not a zip") is None
@@ -4,14 +4,16 @@ from checks.remotesettings.backported_records import run
 RECORDS_URL = "/buckets/{}/collections/{}/records"
 
 
-async def test_positive(mock_responses):
+async def test_positive(mock_aioresponses):
     server_url = "http://fake.local/v1"
     source_url = server_url + RECORDS_URL.format("bid", "cid")
-    mock_responses.get(
+    mock_aioresponses.get(
         source_url, payload={"data": [{"id": "abc", "last_modified": 42}]}
     )
-    dest_url = server_url + RECORDS_URL.format("other", "cid")
-    mock_responses.get(dest_url, payload={"data": [{"id": "abc", "last_modified": 43}]})
+    dest_url = server_url + RECORDS_URL.format("other", "cid") + "?_expected=Foo"
+    mock_aioresponses.get(
+        dest_url, payload={"data": [{"id": "abc", "last_modified": 43}]}
+    )
 
     status, data = await run(
         server_url, backports={"bid/cid": "other/cid"}, max_lag_seconds=1
@@ -21,16 +23,16 @@ async def test_positive(mock_responses):
     assert data == []
 
 
-async def test_positive_small_lag(mock_responses):
+async def test_positive_small_lag(mock_aioresponses):
     server_url = "http://fake.local/v1"
     source_url = server_url + RECORDS_URL.format("bid", "cid")
-    mock_responses.get(
+    mock_aioresponses.get(
         source_url,
         payload={"data": [{"id": "abc", "last_modified": 42}]},
         headers={"ETag": '"100"'},
     )
-    dest_url = server_url + RECORDS_URL.format("other", "cid")
-    mock_responses.get(
+    dest_url = server_url + RECORDS_URL.format("other", "cid") + "?_expected=Foo"
+    mock_aioresponses.get(
         dest_url,
         payload={"data": [{"id": "abc", "last_modified": 43, "title": "abc"}]},
         headers={"ETag": '"150"'},
@@ -44,16 +46,16 @@ async def test_positive_small_lag(mock_responses):
     assert data == []
 
 
-async def test_negative(mock_responses):
+async def test_negative(mock_aioresponses):
     server_url = "http://fake.local/v1"
     source_url = server_url + RECORDS_URL.format("bid", "cid")
-    mock_responses.get(
+    mock_aioresponses.get(
         source_url,
         payload={"data": [{"id": "abc", "last_modified": 42}]},
         headers={"ETag": '"1000000"'},
     )
-    dest_url = server_url + RECORDS_URL.format("other", "cid")
-    mock_responses.get(
+    dest_url = server_url + RECORDS_URL.format("other", "cid") + "?_expected=Foo"
+    mock_aioresponses.get(
         dest_url,
         payload={"data": [{"id": "abc", "last_modified": 43, "title": "abc"}]},
         headers={"ETag": '"2000000"'},
@@ -67,14 +69,16 @@ async def test_negative(mock_responses):
     assert data == ["1 record differ between bid/cid and other/cid ('abc')"]
 
 
-async def test_with_filters(mock_responses):
+async def test_with_filters(mock_aioresponses):
     server_url = "http://fake.local/v1"
     source_url = server_url + RECORDS_URL.format("bid", "cid") + "?field.test=42"
-    mock_responses.get(
+    mock_aioresponses.get(
         source_url, payload={"data": [{"id": "abc", "last_modified": 42}]}
     )
-    dest_url = server_url + RECORDS_URL.format("other", "cid")
-    mock_responses.get(dest_url, payload={"data": [{"id": "abc", "last_modified": 43}]})
+    dest_url = server_url + RECORDS_URL.format("other", "cid") + "?_expected=Foo"
+    mock_aioresponses.get(
+        dest_url, payload={"data": [{"id": "abc", "last_modified": 43}]}
+    )
 
     status, data = await run(
         server_url, backports={"bid/cid?field.test=42": "other/cid"}, max_lag_seconds=1
@@ -1,34 +1,34 @@
-from checks.remotesettings.blocked_pages import run
+from checks.remotesettings.blocked_pages import extract_links, run
 
 
 COLLECTION_URL = "/buckets/{}/collections/{}"
 RECORDS_URL = COLLECTION_URL + "/records"
 
 
-def mock_kinto_responses(mock_responses, server_url):
-    mock_responses.get(
+def mock_kinto_responses(mock_aioresponses, server_url):
+    mock_aioresponses.get(
         server_url + RECORDS_URL.format("blocklists", "plugins"),
         payload={"data": [{"id": "1-2-3", "blockID": "abc"}, {"id": "4-5-6"}]},
         headers={"ETag": '"157556192042"'},
     )
-    mock_responses.get(
+    mock_aioresponses.get(
         server_url + RECORDS_URL.format("blocklists", "addons"),
         payload={
             "data": [{"id": "def", "blockID": "7-8-9", "last_modified": 1568816392824}]
         },
         headers={"ETag": '"1568816392824"'},
     )
-    mock_responses.head(
+    mock_aioresponses.head(
         server_url + RECORDS_URL.format("blocklists", "certificates"),
         headers={"ETag": '"1181628381652"'},
     )
 
 
-async def test_positive(mock_aioresponses, mock_responses):
+async def test_positive(mock_aioresponses):
     server_url = "http://fake.local/v1"
     blocked_url = "http://blocked.cdn"
 
-    mock_kinto_responses(mock_responses, server_url)
+    mock_kinto_responses(mock_aioresponses, server_url)
 
     page_content = """<!DOCTYPE html>
 <html lang="en" dir="ltr">
@@ -60,11 +60,11 @@ async def test_positive(mock_aioresponses, mock_responses):
     }
 
 
-async def test_negative(mock_aioresponses, mock_responses):
+async def test_negative(mock_aioresponses):
     server_url = "http://fake.local/v1"
     blocked_url = "http://blocked.cdn"
 
-    mock_kinto_responses(mock_responses, server_url)
+    mock_kinto_responses(mock_aioresponses, server_url)
 
     page_content = """<!DOCTYPE html>
 <html lang="en" dir="ltr">
@@ -93,3 +93,10 @@ async def test_negative(mock_aioresponses, mock_responses):
         "missing": ["abc"],
         "extras": ["extra"],
     }
+
+
+def test_extract_links():
+    html = '<a href="a.html">A</a><a href="b.txt">B</a><a>C</a><a href="/c.html"></a>'
+
+    # Called directly, since the process pool is not tracked by coverage.
+    assert extract_links(html) == ["a.html", "/c.html"]
@@ -14,20 +14,20 @@ CHANGES_ENTRIES = {
 }
 
 
-async def test_positive(mock_responses):
+async def test_positive(mock_aioresponses):
     origin_url = "http://fake.local/v1"
     changes_url = origin_url + CHANGESET_URL.format("monitor", "changes", 0)
-    mock_responses.get(
+    mock_aioresponses.get(
         changes_url,
         payload=CHANGES_ENTRIES,
     )
     cdn_url = "http://cdn.local/v1"
 
     changeset_url = CHANGESET_URL.format("bid", "cid", 42)
-    mock_responses.get(
+    mock_aioresponses.get(
         origin_url + changeset_url, payload={"metadata": {"last_modified": 123}}
     )
-    mock_responses.get(
+    mock_aioresponses.get(
         cdn_url + changeset_url, payload={"metadata": {"last_modified": 123}}
     )
 
@@ -37,10 +37,10 @@ async def test_positive(mock_responses):
     assert data == {}
 
 
-async def test_positive_min_age(mock_responses):
+async def test_positive_min_age(mock_aioresponses):
     origin_url = "http://fake.local/v1"
     changes_url = origin_url + CHANGESET_URL.format("monitor", "changes", 0)
-    mock_responses.get(
+    mock_aioresponses.get(
         changes_url,
         payload=CHANGES_ENTRIES,
     )
@@ -51,11 +51,11 @@ async def test_positive_min_age(mock_responses):
     fresh_timestamp = freshly_changed.timestamp() * 1000
 
     changeset_url = CHANGESET_URL.format("bid", "cid", 42)
-    mock_responses.get(
+    mock_aioresponses.get(
         origin_url + changeset_url,
         payload={"metadata": {"last_modified": fresh_timestamp}},
     )
-    mock_responses.get(
+    mock_aioresponses.get(
         cdn_url + changeset_url, payload={"metadata": {"last_modified": 123}}
     )
 
@@ -66,20 +66,20 @@ async def test_positive_min_age(mock_responses):
     assert data == {}
 
 
-async def test_negative(mock_responses):
+async def test_negative(mock_aioresponses):
     origin_url = "http://fake.local/v1"
     changes_url = origin_url + CHANGESET_URL.format("monitor", "changes", 0)
-    mock_responses.get(
+    mock_aioresponses.get(
         changes_url,
         payload=CHANGES_ENTRIES,
     )
     cdn_url = "http://cdn.local/v1"
 
     changeset_url = CHANGESET_URL.format("bid", "cid", 42)
-    mock_responses.get(
+    mock_aioresponses.get(
         origin_url + changeset_url, payload={"metadata": {"last_modified": 456}}
     )
-    mock_responses.get(
+    mock_aioresponses.get(
         cdn_url + changeset_url, payload={"metadata": {"last_modified": 123}}
     )
 
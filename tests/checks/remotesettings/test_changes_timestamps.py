@@ -1,13 +1,18 @@
+import re
+
 from checks.remotesettings.changes_timestamps import run
 
 
 CHANGESET_URL = "/buckets/{}/collections/{}/changeset"
 
 
-async def test_positive(mock_responses):
+async def test_positive(mock_aioresponses):
     server_url = "http://fake.local/v1"
-    changes_url = server_url + "/buckets/monitor/collections/changes/changeset"
-    mock_responses.get(
+    changes_url = re.compile(
+        re.escape(server_url + "/buckets/monitor/collections/changes/changeset")
+        + r"\?_expected=\d+"
+    )
+    mock_aioresponses.get(
         changes_url,
         payload={
             "changes": [
@@ -15,8 +20,10 @@ async def test_positive(mock_responses):
             ]
         },
     )
-    changeset_url = server_url + CHANGESET_URL.format("bid", "cid")
-    mock_responses.get(changeset_url, payload={"timestamp": 42})
+    changeset_url = (
+        server_url + CHANGESET_URL.format("bid", "cid") + "?_expected=42&_limit=1"
+    )
+    mock_aioresponses.get(changeset_url, payload={"timestamp": 42})
 
     status, data = await run(server_url)
 
@@ -24,10 +31,13 @@ async def test_positive(mock_responses):
     assert data == {}
 
 
-async def test_negative(mock_responses):
+async def test_negative(mock_aioresponses):
     server_url = "http://fake.local/v1"
-    changes_url = server_url + "/buckets/monitor/collections/changes/changeset"
-    mock_responses.get(
+    changes_url = re.compile(
+        re.escape(server_url + "/buckets/monitor/collections/changes/changeset")
+        + r"\?_expected=\d+"
+    )
+    mock_aioresponses.get(
         changes_url,
         payload={
             "changes": [
@@ -35,8 +45,10 @@ async def test_negative(mock_responses):
             ]
         },
     )
-    changeset_url = server_url + CHANGESET_URL.format("bid", "cid")
-    mock_responses.get(changeset_url, payload={"timestamp": 123})
+    changeset_url = (
+        server_url + CHANGESET_URL.format("bid", "cid") + "?_expected=42&_limit=1"
+    )
+    mock_aioresponses.get(changeset_url, payload={"timestamp": 123})
 
     status, data = await run(server_url)
 
@@ -1,6 +1,8 @@
+import asyncio
 from unittest import mock
 
 from checks.remotesettings.collections_consistency import has_inconsistencies, run
+from telescope.utils import deadline
 
 
 FAKE_AUTH = "Bearer abc"
@@ -19,42 +21,42 @@ RESOURCES = [
 ]
 
 
-async def test_has_inconsistencies_no_preview(mock_responses):
+async def test_has_inconsistencies_no_preview(mock_aioresponses):
     server_url = "http://fake.local/v1"
     records = [{"id": "abc", "last_modified": 42}, {"id": "def", "last_modified": 41}]
 
     collection_url = server_url + COLLECTION_URL.format(
         "security-workspace", "blocklist"
     )
-    mock_responses.get(
+    mock_aioresponses.get(
         collection_url, payload={"data": {"id": "blocklist", "status": "signed"}}
     )
     records_url = server_url + RECORDS_URL.format("security-workspace", "blocklist")
-    mock_responses.get(records_url, payload={"data": records})
+    mock_aioresponses.get(records_url, payload={"data": records})
     records_url = server_url + RECORDS_URL.format("security", "blocklist")
-    mock_responses.get(records_url, payload={"data": records})
+    mock_aioresponses.get(records_url, payload={"data": records})
 
     assert await has_inconsistencies(server_url, FAKE_AUTH, RESOURCES[1]) is None
 
 
-async def test_has_inconsistencies_no_status(mock_responses):
+async def test_has_inconsistencies_no_status(mock_aioresponses):
     server_url = "http://fake.local/v1"
     collection_url = server_url + COLLECTION_URL.format(
         "security-workspace", "blocklist"
     )
-    mock_responses.get(collection_url, payload={"data": {"id": "blocklist"}})
+    mock_aioresponses.get(collection_url, payload={"data": {"id": "blocklist"}})
 
     result = await has_inconsistencies(server_url, FAKE_AUTH, RESOURCES[1])
 
     assert '"status" attribute missing' in result
 
 
-async def test_has_inconsistencies_work_in_progress_status(mock_responses):
+async def test_has_inconsistencies_work_in_progress_status(mock_aioresponses):
     server_url = "http://fake.local/v1"
     collection_url = server_url + COLLECTION_URL.format(
         "security-workspace", "blocklist"
     )
-    mock_responses.get(
+    mock_aioresponses.get(
         collection_url,
         payload={"data": {"id": "blocklist", "status": "work-in-progress"}},
     )
@@ -64,12 +66,12 @@ async def test_has_inconsistencies_work_in_progress_status(mock_responses):
     assert result is None
 
 
-async def test_has_inconsistencies_unsupported_status(mock_responses):
+async def test_has_inconsistencies_unsupported_status(mock_aioresponses):
     server_url = "http://fake.local/v1"
     collection_url = server_url + COLLECTION_URL.format(
         "security-workspace", "blocklist"
     )
-    mock_responses.get(
+    mock_aioresponses.get(
         collection_url, payload={"data": {"id": "blocklist", "status": "to-resign"}}
     )
 
@@ -78,12 +80,12 @@ async def test_has_inconsistencies_unsupported_status(mock_responses):
     assert "Unexpected status" in result
 
 
-async def test_unexpected_review_status(mock_responses):
+async def test_unexpected_review_status(mock_aioresponses):
     server_url = "http://fake.local/v1"
     collection_url = server_url + COLLECTION_URL.format(
         "security-workspace", "blocklist"
     )
-    mock_responses.get(
+    mock_aioresponses.get(
         collection_url, payload={"data": {"id": "blocklist", "status": "to-review"}}
     )
 
@@ -92,7 +94,7 @@ async def test_unexpected_review_status(mock_responses):
     assert result == "security-workspace/blocklist should not have 'to-review' status"
 
 
-async def test_has_inconsistencies_to_review_preview_differs(mock_responses):
+async def test_has_inconsistencies_to_review_preview_differs(mock_aioresponses):
     server_url = "http://fake.local/v1"
     resource = {
         "source": {"bucket": "security-workspace", "collection": "blocklist"},
@@ -109,13 +111,13 @@ async def test_has_inconsistencies_to_review_preview_differs(mock_responses):
     collection_url = server_url + COLLECTION_URL.format(
         "security-workspace", "blocklist"
     )
-    mock_responses.get(
+    mock_aioresponses.get(
         collection_url, payload={"data": {"id": "blocklist", "status": "to-review"}}
     )
     records_url = server_url + RECORDS_URL.format("security-workspace", "blocklist")
-    mock_responses.get(records_url, payload={"data": records})
+    mock_aioresponses.get(records_url, payload={"data": records})
     records_url = server_url + RECORDS_URL.format("security-preview", "blocklist")
-    mock_responses.get(
+    mock_aioresponses.get(
         records_url,
         payload={
             "data": records[:1]
@@ -132,7 +134,7 @@ async def test_has_inconsistencies_to_review_preview_differs(mock_responses):
     assert "2 records differ between source and preview ('def', 'jkl')" in result
 
 
-async def test_has_inconsistencies_preview_differs(mock_responses):
+async def test_has_inconsistencies_preview_differs(mock_aioresponses):
     server_url = "http://fake.local/v1"
     resource = {
         "source": {"bucket": "security-workspace", "collection": "blocklist"},
@@ -144,24 +146,24 @@ async def test_has_inconsistencies_preview_differs(mock_responses):
     collection_url = server_url + COLLECTION_URL.format(
         "security-workspace", "blocklist"
     )
-    mock_responses.get(
+    mock_aioresponses.get(
         collection_url, payload={"data": {"id": "blocklist", "status": "signed"}}
     )
     records_url = server_url + RECORDS_URL.format("security-workspace", "blocklist")
-    mock_responses.get(
+    mock_aioresponses.get(
         records_url, payload={"data": records + [{"id": "xyz", "last_modified": 40}]}
     )
     records_url = server_url + RECORDS_URL.format("security-preview", "blocklist")
-    mock_responses.get(records_url, payload={"data": records})
+    mock_aioresponses.get(records_url, payload={"data": records})
     records_url = server_url + RECORDS_URL.format("security", "blocklist")
-    mock_responses.get(records_url, payload={"data": records})
+    mock_aioresponses.get(records_url, payload={"data": records})
 
     result = await has_inconsistencies(server_url, FAKE_AUTH, resource)
 
     assert "1 record present in source but missing in preview ('xyz')" in result
 
 
-async def test_has_inconsistencies_no_preview_destination_differs(mock_responses):
+async def test_has_inconsistencies_no_preview_destination_differs(mock_aioresponses):
     server_url = "http://fake.local/v1"
     resource = {
         "source": {"bucket": "security-workspace", "collection": "blocklist"},
@@ -172,13 +174,13 @@ async def test_has_inconsistencies_no_preview_destination_differs(mock_responses
     collection_url = server_url + COLLECTION_URL.format(
         "security-workspace", "blocklist"
     )
-    mock_responses.get(
+    mock_aioresponses.get(
         collection_url, payload={"data": {"id": "blocklist", "status": "signed"}}
     )
     records_url = server_url + RECORDS_URL.format("security-workspace", "blocklist")
-    mock_responses.get(records_url, payload={"data": records})
+    mock_aioresponses.get(records_url, payload={"data": records})
     records_url = server_url + RECORDS_URL.format("security", "blocklist")
-    mock_responses.get(
+    mock_aioresponses.get(
         records_url, payload={"data": records + [{"id": "xyz", "last_modified": 40}]}
     )
 
@@ -187,7 +189,7 @@ async def test_has_inconsistencies_no_preview_destination_differs(mock_responses
     assert "1 record present in destination but missing in source ('xyz')" in result
 
 
-async def test_has_inconsistencies_destination_differs(mock_responses):
+async def test_has_inconsistencies_destination_differs(mock_aioresponses):
     server_url = "http://fake.local/v1"
     resource = {
         "source": {"bucket": "security-workspace", "collection": "blocklist"},
@@ -199,15 +201,15 @@ async def test_has_inconsistencies_destination_differs(mock_responses):
     collection_url = server_url + COLLECTION_URL.format(
         "security-workspace", "blocklist"
     )
-    mock_responses.get(
+    mock_aioresponses.get(
         collection_url, payload={"data": {"id": "blocklist", "status": "signed"}}
     )
     records_url = server_url + RECORDS_URL.format("security-workspace", "blocklist")
-    mock_responses.get(records_url, payload={"data": records})
+    mock_aioresponses.get(records_url, payload={"data": records})
     records_url = server_url + RECORDS_URL.format("security-preview", "blocklist")
-    mock_responses.get(records_url, payload={"data": records})
+    mock_aioresponses.get(records_url, payload={"data": records})
     records_url = server_url + RECORDS_URL.format("security", "blocklist")
-    mock_responses.get(
+    mock_aioresponses.get(
         records_url, payload={"data": records + [{"id": "xyz", "last_modified": 40}]}
     )
 
@@ -216,7 +218,7 @@ async def test_has_inconsistencies_destination_differs(mock_responses):
     assert "1 record present in destination but missing in preview ('xyz')" in result
 
 
-async def test_positive(mock_responses):
+async def test_positive(mock_aioresponses):
     server_url = "http://fake.local/v1"
 
     module = "checks.remotesettings.collections_consistency"
@@ -228,7 +230,7 @@ async def test_positive(mock_responses):
     assert data == {}
 
 
-async def test_negative(mock_responses):
+async def test_negative(mock_aioresponses):
     server_url = "http://fake.local/v1"
 
     m = "checks.remotesettings.collections_consistency"
@@ -239,3 +241,24 @@ async def test_negative(mock_responses):
     assert status is False
     print(data)
     assert data == {"blog/articles": "Some error", "security/blocklist": "Some error"}
+
+
+async def test_partial_results_on_timeout(mock_aioresponses):
+    server_url = "http://fake.local/v1"
+
+    async def inconsistencies(server, auth, resource):
+        if resource is RESOURCES[1]:
+            await asyncio.sleep(10)
+        return "Some error"
+
+    m = "checks.remotesettings.collections_consistency"
+    with mock.patch(f"{m}.fetch_signed_resources", return_value=RESOURCES):
+        with mock.patch(f"{m}.has_inconsistencies", side_effect=inconsistencies):
+            with deadline(0.2):
+                status, data = await run(server_url, FAKE_AUTH)
+
+    assert status is False
+    assert data == {
+        "blog/articles": "Some error",
+        "timed_out": "Timed out, 1 of 2 processed",
+    }
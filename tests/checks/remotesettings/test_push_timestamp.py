@@ -1,4 +1,5 @@
 import json
+import re
 from contextlib import asynccontextmanager
 from unittest import mock
 
@@ -9,9 +10,14 @@ from telescope.utils import utcfromtimestamp
 MODULE = "checks.remotesettings.push_timestamp"
 
 
-async def test_positive(mock_responses):
-    url = "http://server.local/v1/buckets/monitor/collections/changes/changeset"
-    mock_responses.get(
+async def test_positive(mock_aioresponses):
+    url = re.compile(
+        re.escape(
+            "http://server.local/v1/buckets/monitor/collections/changes/changeset"
+        )
+        + r"\?_expected=\d+"
+    )
+    mock_aioresponses.get(
         url,
         status=200,
         payload={
@@ -41,12 +47,17 @@ async def test_positive(mock_responses):
     }
 
 
-async def test_positive_with_margin(mock_responses):
+async def test_positive_with_margin(mock_aioresponses):
     server_timestamp = 1573086234731
     server_datetime = utcfromtimestamp(server_timestamp)
 
-    url = "http://server.local/v1/buckets/monitor/collections/changes/changeset"
-    mock_responses.get(
+    url = re.compile(
+        re.escape(
+            "http://server.local/v1/buckets/monitor/collections/changes/changeset"
+        )
+        + r"\?_expected=\d+"
+    )
+    mock_aioresponses.get(
         url,
         status=200,
         payload={
@@ -65,9 +76,14 @@ async def test_positive_with_margin(mock_responses):
     assert status is True
 
 
-async def test_negative(mock_responses):
-    url = "http://server.local/v1/buckets/monitor/collections/changes/changeset"
-    mock_responses.get(
+async def test_negative(mock_aioresponses):
+    url = re.compile(
+        re.escape(
+            "http://server.local/v1/buckets/monitor/collections/changes/changeset"
+        )
+        + r"\?_expected=\d+"
+    )
+    mock_aioresponses.get(
         url,
         status=200,
         payload={
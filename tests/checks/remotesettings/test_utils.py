@@ -1,22 +1,33 @@
+import asyncio
+import re
 from unittest import mock
 
+import aiohttp
 import pytest
+from aioresponses import CallbackResult
+from yarl import URL
 
 from checks.remotesettings.utils import KintoClient, fetch_signed_resources
 from telescope import config
+from telescope.app import Check
+from telescope.utils import CircuitBreaker, CircuitOpenError
 
 
-async def test_fetch_signed_resources_no_signer(mock_responses):
+async def test_fetch_signed_resources_no_signer(mock_aioresponses):
     server_url = "http://fake.local/v1"
-    mock_responses.get(server_url + "/", payload={"capabilities": {}})
+    mock_aioresponses.get(server_url + "/", payload={"capabilities": {}})
+    mock_aioresponses.get(
+        server_url + "/buckets/monitor/collections/changes/changeset?_expected=0",
+        payload={"changes": []},
+    )
 
     with pytest.raises(ValueError):
         await fetch_signed_resources(server_url, auth="Bearer abc")
 
 
-async def test_fetch_signed_resources(mock_responses):
+async def test_fetch_signed_resources(mock_aioresponses):
     server_url = "http://fake.local/v1"
-    mock_responses.get(
+    mock_aioresponses.get(
         server_url + "/",
         payload={
             "capabilities": {
@@ -42,8 +53,10 @@ async def test_fetch_signed_resources(mock_responses):
             }
         },
     )
-    changes_url = server_url + "/buckets/monitor/collections/changes/changeset"
-    mock_responses.get(
+    changes_url = (
+        server_url + "/buckets/monitor/collections/changes/changeset?_expected=0"
+    )
+    mock_aioresponses.get(
         changes_url,
         payload={
             "changes": [
@@ -86,13 +99,55 @@ async def test_fetch_signed_resources(mock_responses):
     ]
 
 
-async def test_fetch_signed_resources_unknown_collection(mock_responses):
+async def test_fetch_signed_resources_is_memoized(mock_aioresponses):
+    server_url = "http://fake.local/v1"
+    mock_aioresponses.get(
+        server_url + "/",
+        payload={
+            "capabilities": {
+                "signer": {
+                    "resources": [
+                        {
+                            "source": {"bucket": "main-workspace", "collection": None},
+                            "destination": {"bucket": "main", "collection": None},
+                        }
+                    ]
+                }
+            }
+        },
+        repeat=True,
+    )
+    changes_url = (
+        server_url + "/buckets/monitor/collections/changes/changeset?_expected=0"
+    )
+    entry = {"id": "a", "bucket": "main", "collection": "cid", "last_modified": 42}
+    mock_aioresponses.get(changes_url, payload={"changes": [entry]})
+    mock_aioresponses.get(changes_url, payload={"changes": [entry]})
+    mock_aioresponses.get(
+        changes_url, payload={"changes": [{**entry, "last_modified": 43}]}
+    )
+
+    with mock.patch.object(config, "MONITOR_CHANGES_TTL_SECONDS", 0):
+        first = await fetch_signed_resources(server_url, auth="Bearer abc")
+        second = await fetch_signed_resources(server_url, auth="Bearer abc")
+        assert len(mock_aioresponses.requests[("GET", URL(server_url + "/"))]) == 1
+
+        third = await fetch_signed_resources(server_url, auth="Bearer abc")
+        assert len(mock_aioresponses.requests[("GET", URL(server_url + "/"))]) == 2
+
+    assert second is first
+    assert third[0]["last_modified"] == 43
+
+
+async def test_fetch_signed_resources_unknown_collection(mock_aioresponses):
     server_url = "http://fake.local/v1"
-    mock_responses.get(
+    mock_aioresponses.get(
         server_url + "/", payload={"capabilities": {"signer": {"resources": []}}}
     )
-    changes_url = server_url + "/buckets/monitor/collections/changes/changeset"
-    mock_responses.get(
+    changes_url = (
+        server_url + "/buckets/monitor/collections/changes/changeset?_expected=0"
+    )
+    mock_aioresponses.get(
         changes_url,
         payload={
             "changes": [
@@ -113,46 +168,276 @@ async def test_fetch_signed_resources_unknown_collection(mock_responses):
 def test_kinto_auth():
     client = KintoClient(server_url="http://server/v1", auth="Bearer token")
 
-    assert client._client.session.auth.type == "Bearer"
-    assert client._client.session.auth.token == "token"
+    assert client.headers["Authorization"] == "Bearer token"
+
+
+def test_kinto_basic_auth():
+    client = KintoClient(server_url="http://server/v1", auth="user:pass")
+    assert client.headers["Authorization"] == "Basic dXNlcjpwYXNz"
 
+    client = KintoClient(server_url="http://server/v1", auth=("user", "pass"))
+    assert client.headers["Authorization"] == "Basic dXNlcjpwYXNz"
 
-async def test_client_extra_headers(mock_responses):
+
+def test_kinto_unsupported_auth():
+    with pytest.raises(ValueError):
+        KintoClient(server_url="http://server/v1", auth="token")
+
+
+async def test_client_extra_headers(mock_aioresponses):
     server_url = "http://fake.local/v1"
-    mock_responses.get(server_url + "/", payload={})
+    mock_aioresponses.get(server_url + "/", payload={})
 
     with mock.patch.dict(config.DEFAULT_REQUEST_HEADERS, {"Extra": "header"}):
         client = KintoClient(server_url=server_url)
         await client.server_info()
 
-    sent_request = mock_responses.calls[0].request
-    assert "Extra" in sent_request.headers
+    sent_request = mock_aioresponses.requests[("GET", URL(server_url + "/"))][0]
+    assert "Extra" in sent_request.kwargs["headers"]
 
 
-async def test_user_agent(mock_responses):
+async def test_user_agent(mock_aioresponses):
     server_url = "http://fake.local/v1"
-    mock_responses.get(server_url + "/", payload={})
+    mock_aioresponses.get(server_url + "/", payload={})
 
     client = KintoClient(server_url=server_url)
     await client.server_info()
 
-    user_agent = mock_responses.calls[0].request.headers["User-Agent"]
-    assert "telescope" in user_agent
-    assert "kinto_http" in user_agent
+    sent_request = mock_aioresponses.requests[("GET", URL(server_url + "/"))][0]
+    assert "telescope" in sent_request.kwargs["headers"]["User-Agent"]
 
 
-async def test_get_monitor_changes(mock_responses):
+async def test_get_monitor_changes(mock_aioresponses):
     server_url = "http://fake.local/v1"
     monitor_url = f"{server_url}/buckets/monitor/collections/changes/changeset"
-    mock_responses.get(monitor_url, payload={"changes": []})
+    mock_aioresponses.get(
+        re.compile(re.escape(monitor_url) + ".*"), payload={"changes": []}, repeat=True
+    )
 
     client = KintoClient(server_url=server_url)
 
     await client.get_monitor_changes()
-    assert mock_responses.calls[0].request.params == {"_expected": "0"}
-
     await client.get_monitor_changes(bust_cache=True)
-    assert "_expected" in mock_responses.calls[1].request.params
-
     await client.get_monitor_changes(_expected="bim")
-    assert mock_responses.calls[2].request.params["_expected"] == "bim"
+
+    sent_params = [
+        call.kwargs["params"]
+        for calls in mock_aioresponses.requests.values()
+        for call in calls
+    ]
+    assert sent_params[0] == {"_expected": "0"}
+    assert sent_params[1]["_expected"] not in ("0", "bim")
+    assert sent_params[2] == {"_expected": "bim"}
+
+
+async def test_get_records_paginated(mock_aioresponses):
+    server_url = "http://fake.local/v1"
+    records_url = server_url + "/buckets/bid/collections/cid/records"
+    mock_aioresponses.get(
+        records_url,
+        payload={"data": [{"id": "a"}, {"id": "b"}]},
+        headers={"ETag": '"42"', "Next-Page": records_url + "?_token=xyz"},
+    )
+    mock_aioresponses.get(
+        records_url + "?_token=xyz", payload={"data": [{"id": "b"}, {"id": "c"}]}
+    )
+
+    client = KintoClient(server_url=server_url)
+    records = await client.get_records(bucket="bid", collection="cid")
+    timestamp = await client.get_records_timestamp(bucket="bid", collection="cid")
+
+    assert [r["id"] for r in records] == ["a", "b", "c"]
+    assert timestamp == "42"  # No extra HEAD request.
+
+
+async def test_get_records_params(mock_aioresponses):
+    server_url = "http://fake.local/v1"
+    records_url = server_url + "/buckets/bid/collections/cid/records"
+    mock_aioresponses.get(
+        records_url + "?in_id=a,b&has_field=true&_since=42", payload={"data": []}
+    )
+
+    client = KintoClient(server_url=server_url)
+    records = await client.get_records(
+        bucket="bid", collection="cid", in_id=["a", "b"], has_field=True, _since=42
+    )
+
+    assert records == []
+
+
+async def test_iter_records_limit_fetches_single_page(mock_aioresponses):
+    server_url = "http://fake.local/v1"
+    records_url = server_url + "/buckets/bid/collections/cid/records"
+    mock_aioresponses.get(
+        records_url + "?_limit=1",
+        payload={"data": [{"id": "a"}]},
+        headers={"Next-Page": records_url + "?_limit=1&_token=xyz"},
+    )
+
+    client = KintoClient(server_url=server_url, bucket="bid", collection="cid")
+    records = [r async for r in client.iter_records(_limit=1)]
+
+    assert records == [{"id": "a"}]
+
+
+async def test_client_retries_server_errors(mock_aioresponses):
+    server_url = "http://fake.local/v1"
+    mock_aioresponses.get(server_url + "/", status=503)
+    mock_aioresponses.get(server_url + "/", payload={"project_name": "kinto"})
+
+    client = KintoClient(server_url=server_url, retry=1)
+    info = await client.server_info()
+
+    assert info == {"project_name": "kinto"}
+
+
+async def test_client_backs_off_between_retries(mock_aioresponses):
+    server_url = "http://fake.local/v1"
+    for _ in range(3):
+        mock_aioresponses.get(server_url + "/", status=502)
+    mock_aioresponses.get(server_url + "/", payload={"project_name": "kinto"})
+    client = KintoClient(server_url=server_url, retry=3)
+
+    with mock.patch(
+        "checks.remotesettings.utils.random.uniform", return_value=0
+    ) as mocked:
+        info = await client.server_info()
+
+    assert info == {"project_name": "kinto"}
+    assert mocked.call_args_list == [
+        mock.call(0, 0.5),
+        mock.call(0, 1.0),
+        mock.call(0, 2.0),
+    ]
+
+
+async def test_client_fails_fast_when_server_is_down(mock_aioresponses):
+    server_url = "http://fake.local/v1"
+    mock_aioresponses.get(server_url + "/", status=503)
+    CircuitBreaker.for_url(server_url).threshold = 1
+    client = KintoClient(server_url=server_url, retry=0)
+
+    with pytest.raises(aiohttp.ClientResponseError):
+        await client.server_info()
+
+    with pytest.raises(CircuitOpenError):
+        await client.server_info()
+
+    assert len(mock_aioresponses.requests[("GET", URL(server_url + "/"))]) == 1
+
+
+async def test_client_connection_errors_open_circuit(mock_aioresponses):
+    server_url = "http://fake.local/v1"
+    breaker = CircuitBreaker.for_url(server_url)
+    breaker.threshold = 1
+    mock_aioresponses.get(
+        server_url + "/", exception=aiohttp.ClientConnectionError(), repeat=True
+    )
+    client = KintoClient(server_url=server_url, retry=0)
+
+    # First attempt fails, and retry fails fast.
+    with pytest.raises(CircuitOpenError):
+        await client.server_info()
+    calls = len(mock_aioresponses.requests[("GET", URL(server_url + "/"))])
+
+    with pytest.raises(CircuitOpenError):
+        await client.server_info()
+    assert len(mock_aioresponses.requests[("GET", URL(server_url + "/"))]) == calls
+
+
+async def test_client_errors_do_not_open_circuit(mock_aioresponses):
+    server_url = "http://fake.local/v1"
+    mock_aioresponses.get(server_url + "/", status=404)
+    breaker = CircuitBreaker.for_url(server_url)
+    breaker.threshold = 1
+    client = KintoClient(server_url=server_url)
+
+    with pytest.raises(aiohttp.ClientResponseError):
+        await client.server_info()
+
+    assert breaker.state == "closed"
+
+
+async def test_monitor_changes_are_shared_between_clients(mock_aioresponses):
+    server_url = "http://fake.local/v1"
+    monitor_url = f"{server_url}/buckets/monitor/collections/changes/changeset"
+    mock_aioresponses.get(
+        monitor_url + "?_expected=0", payload={"changes": [{"id": "a"}]}
+    )
+
+    results = await asyncio.gather(
+        KintoClient(server_url=server_url).get_monitor_changes(),
+        KintoClient(server_url=server_url).get_monitor_changes(),
+    )
+    again = await KintoClient(server_url=server_url).get_monitor_changes()
+
+    assert results[0] is results[1] is again
+    assert len(mock_aioresponses.requests) == 1
+
+
+async def test_monitor_changes_are_not_bound_to_first_caller_deadline(
+    mock_aioresponses,
+):
+    server_url = "http://fake.local/v1"
+    monitor_url = f"{server_url}/buckets/monitor/collections/changes/changeset"
+
+    async def slow(url, **kwargs):
+        await asyncio.sleep(0.2)
+        return CallbackResult(payload={"changes": [{"id": "a"}]})
+
+    mock_aioresponses.get(monitor_url + "?_expected=0", callback=slow)
+
+    class Module:
+        __name__ = "monitored"
+        __doc__ = ""
+
+        async def run(self):
+            return True, await KintoClient(server_url=server_url).get_monitor_changes()
+
+    hasty = Check("p", "hasty", "", module=Module(), timeout=0.05)
+    patient = Check("p", "patient", "", module=Module())
+
+    with mock.patch.object(Check, "DEADLINE_GRACE_SECONDS", 0):
+        first, second = await asyncio.gather(hasty.run(), patient.run())
+
+    assert first[1:3] == (False, "Timed out after 0.05s")
+    assert second[1:3] == (True, [{"id": "a"}])
+
+
+async def test_monitor_changes_are_refreshed_after_ttl(mock_aioresponses):
+    server_url = "http://fake.local/v1"
+    monitor_url = f"{server_url}/buckets/monitor/collections/changes/changeset"
+    mock_aioresponses.get(
+        monitor_url + "?_expected=0", payload={"changes": [{"id": "a"}]}
+    )
+    mock_aioresponses.get(
+        monitor_url + "?_expected=0", payload={"changes": [{"id": "b"}]}
+    )
+    client = KintoClient(server_url=server_url)
+
+    with mock.patch.object(config, "MONITOR_CHANGES_TTL_SECONDS", 0):
+        first = await client.get_monitor_changes()
+        second = await client.get_monitor_changes()
+
+    assert first == [{"id": "a"}]
+    assert second == [{"id": "b"}]
+
+
+async def test_monitor_changes_bust_cache_forces_fresh_read(mock_aioresponses):
+    server_url = "http://fake.local/v1"
+    monitor_url = f"{server_url}/buckets/monitor/collections/changes/changeset"
+    mock_aioresponses.get(
+        monitor_url + "?_expected=0", payload={"changes": [{"id": "a"}]}
+    )
+    mock_aioresponses.get(
+        re.compile(re.escape(monitor_url) + r"\?_expected=\d{12}"),
+        payload={"changes": [{"id": "b"}]},
+    )
+    client = KintoClient(server_url=server_url)
+
+    await client.get_monitor_changes()
+    busted = await client.get_monitor_changes(bust_cache=True)
+    shared = await client.get_monitor_changes()
+
+    assert busted == [{"id": "b"}]
+    assert shared is busted
@@ -3,7 +3,11 @@ from unittest import mock
 import pytest
 from aiohttp import ClientResponseError
 
-from checks.remotesettings.validate_signatures import run, validate_signature
+from checks.remotesettings.validate_signatures import (
+    run,
+    serialize,
+    validate_signature,
+)
 
 
 MODULE = "checks.remotesettings.validate_signatures"
@@ -31,10 +35,12 @@ qvRy6gQ1oC/z
 """
 
 
-async def test_positive(mock_responses):
+async def test_positive(mock_aioresponses):
     server_url = "http://fake.local/v1"
-    changes_url = server_url + CHANGESET_URL.format("monitor", "changes")
-    mock_responses.get(
+    changes_url = (
+        server_url + CHANGESET_URL.format("monitor", "changes") + "?_expected=0"
+    )
+    mock_aioresponses.get(
         changes_url,
         payload={
             "changes": [
@@ -43,8 +49,8 @@ async def test_positive(mock_responses):
         },
     )
 
-    mock_responses.get(
-        server_url + CHANGESET_URL.format("bid", "cid", 42),
+    mock_aioresponses.get(
+        server_url + CHANGESET_URL.format("bid", "cid") + "?_expected=42",
         payload={"metadata": {"signature": {}}, "changes": [], "timestamp": 42},
     )
 
@@ -55,11 +61,13 @@ async def test_positive(mock_responses):
     assert data == {}
 
 
-async def test_negative(mock_responses, mock_aioresponses):
+async def test_negative(mock_aioresponses):
     server_url = "http://fake.local/v1"
     x5u_url = "http://fake-x5u-url/"
-    changes_url = server_url + CHANGESET_URL.format("monitor", "changes")
-    mock_responses.get(
+    changes_url = (
+        server_url + CHANGESET_URL.format("monitor", "changes") + "?_expected=0"
+    )
+    mock_aioresponses.get(
         changes_url,
         payload={
             "changes": [
@@ -68,8 +76,8 @@ async def test_negative(mock_responses, mock_aioresponses):
         },
     )
     mock_aioresponses.get(x5u_url, body=CERT)
-    mock_responses.get(
-        server_url + CHANGESET_URL.format("bid", "cid"),
+    mock_aioresponses.get(
+        server_url + CHANGESET_URL.format("bid", "cid") + "?_expected=42",
         payload={
             "metadata": {"signature": {"x5u": x5u_url, "signature": ""}},
             "changes": [],
@@ -85,10 +93,12 @@ async def test_negative(mock_responses, mock_aioresponses):
     }
 
 
-async def test_root_hash_is_decoded_if_specified(mock_responses, mock_aioresponses):
+async def test_root_hash_is_decoded_if_specified(mock_aioresponses):
     server_url = "http://fake.local/v1"
-    changes_url = server_url + CHANGESET_URL.format("monitor", "changes")
-    mock_responses.get(
+    changes_url = (
+        server_url + CHANGESET_URL.format("monitor", "changes") + "?_expected=0"
+    )
+    mock_aioresponses.get(
         changes_url,
         payload={
             "changes": [
@@ -96,8 +106,8 @@ async def test_root_hash_is_decoded_if_specified(mock_responses, mock_aiorespons
             ]
         },
     )
-    mock_responses.get(
-        server_url + CHANGESET_URL.format("bid", "cid"),
+    mock_aioresponses.get(
+        server_url + CHANGESET_URL.format("bid", "cid") + "?_expected=42",
         payload={
             "metadata": {"signature": {"x5u": "http://fake-x5u-url/", "signature": ""}},
             "changes": [],
@@ -119,10 +129,12 @@ async def test_missing_signature():
     assert exc_info.value.args[0] == "Missing signature"
 
 
-async def test_retry_fetch_records(mock_responses):
+async def test_retry_fetch_records(mock_aioresponses):
     server_url = "http://fake.local/v1"
-    changes_url = server_url + CHANGESET_URL.format("monitor", "changes")
-    mock_responses.get(
+    changes_url = (
+        server_url + CHANGESET_URL.format("monitor", "changes") + "?_expected=0"
+    )
+    mock_aioresponses.get(
         changes_url,
         payload={
             "changes": [
@@ -131,10 +143,10 @@ async def test_retry_fetch_records(mock_responses):
         },
     )
 
-    records_url = server_url + CHANGESET_URL.format("bid", "cid")
-    mock_responses.get(records_url, status=500)
-    mock_responses.get(records_url, status=500)
-    mock_responses.get(
+    records_url = server_url + CHANGESET_URL.format("bid", "cid") + "?_expected=42"
+    mock_aioresponses.get(records_url, status=500)
+    mock_aioresponses.get(records_url, status=500)
+    mock_aioresponses.get(
         records_url,
         payload={"metadata": {"signature": {}}, "changes": [], "timestamp": 42},
     )
@@ -145,11 +157,13 @@ async def test_retry_fetch_records(mock_responses):
     assert status is True
 
 
-async def test_retry_fetch_x5u(mock_responses, mock_aioresponses):
+async def test_retry_fetch_x5u(mock_aioresponses):
     server_url = "http://fake.local/v1"
     x5u_url = "http://fake-x5u-url/"
-    changes_url = server_url + CHANGESET_URL.format("monitor", "changes")
-    mock_responses.get(
+    changes_url = (
+        server_url + CHANGESET_URL.format("monitor", "changes") + "?_expected=0"
+    )
+    mock_aioresponses.get(
         changes_url,
         payload={
             "changes": [
@@ -161,8 +175,8 @@ async def test_retry_fetch_x5u(mock_responses, mock_aioresponses):
     mock_aioresponses.get(x5u_url, status=500)
     mock_aioresponses.get(x5u_url, body=CERT)
 
-    mock_responses.get(
-        server_url + CHANGESET_URL.format("bid", "cid"),
+    mock_aioresponses.get(
+        server_url + CHANGESET_URL.format("bid", "cid") + "?_expected=42",
         payload={
             "metadata": {"signature": {"x5u": x5u_url, "signature": ""}},
             "changes": [],
@@ -179,11 +193,13 @@ async def test_retry_fetch_x5u(mock_responses, mock_aioresponses):
     }
 
 
-async def test_unexpected_error_raises(mock_responses, mock_aioresponses):
+async def test_unexpected_error_raises(mock_aioresponses):
     server_url = "http://fake.local/v1"
     x5u_url = "http://fake-x5u-url/"
-    changes_url = server_url + CHANGESET_URL.format("monitor", "changes")
-    mock_responses.get(
+    changes_url = (
+        server_url + CHANGESET_URL.format("monitor", "changes") + "?_expected=0"
+    )
+    mock_aioresponses.get(
         changes_url,
         payload={
             "changes": [
@@ -195,8 +211,8 @@ async def test_unexpected_error_raises(mock_responses, mock_aioresponses):
     mock_aioresponses.get(x5u_url, status=500)
     mock_aioresponses.get(x5u_url, status=500)
 
-    mock_responses.get(
-        server_url + CHANGESET_URL.format("bid", "cid"),
+    mock_aioresponses.get(
+        server_url + CHANGESET_URL.format("bid", "cid") + "?_expected=42",
         payload={
             "metadata": {"signature": {"x5u": x5u_url, "signature": ""}},
             "changes": [],
@@ -206,3 +222,12 @@ async def test_unexpected_error_raises(mock_responses, mock_aioresponses):
 
     with pytest.raises(ClientResponseError):
         await run(server_url, ["bid"])
+
+
+def test_serialize():
+    records = [{"id": "b", "z": 1, "a": 2}, {"id": "a"}]
+
+    # Called directly, since the process pool is not tracked by coverage.
+    assert serialize(records, 42) == (
+        b'{"data":[{"id":"a"},{"a":2,"id":"b","z":1}],"last_modified":"42"}'
+    )
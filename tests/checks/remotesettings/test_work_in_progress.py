@@ -23,11 +23,11 @@ RESOURCES = [
 ]
 
 
-async def test_positive_signed(mock_responses):
+async def test_positive_signed(mock_aioresponses):
     server_url = "http://fake.local/v1"
 
     collection_url = server_url + COLLECTION_URL.format("bid", "cid")
-    mock_responses.get(
+    mock_aioresponses.get(
         collection_url,
         payload={
             "data": {
@@ -38,7 +38,7 @@ async def test_positive_signed(mock_responses):
         },
     )
     collection_url = server_url + COLLECTION_URL.format("bid", "cid2")
-    mock_responses.get(collection_url, payload={"data": {"status": "signed"}})
+    mock_aioresponses.get(collection_url, payload={"data": {"status": "signed"}})
 
     with mock.patch(f"{MODULE}.fetch_signed_resources", return_value=RESOURCES):
         status, data = await run(server_url, FAKE_AUTH, max_age=25)
@@ -47,11 +47,11 @@ async def test_positive_signed(mock_responses):
     assert data == {}
 
 
-async def test_positive_recent(mock_responses):
+async def test_positive_recent(mock_aioresponses):
     server_url = "http://fake.local/v1"
 
     collection_url = server_url + COLLECTION_URL.format("bid", "cid")
-    mock_responses.get(
+    mock_aioresponses.get(
         collection_url,
         payload={
             "data": {
@@ -62,7 +62,7 @@ async def test_positive_recent(mock_responses):
         },
     )
     collection_url = server_url + COLLECTION_URL.format("bid", "cid2")
-    mock_responses.get(
+    mock_aioresponses.get(
         collection_url,
         payload={
             "data": {"status": "signed", "last_edit_date": "2017-08-01T01:00.000"}
@@ -76,11 +76,11 @@ async def test_positive_recent(mock_responses):
     assert data == {}
 
 
-async def test_positive_no_pending_changes(mock_responses):
+async def test_positive_no_pending_changes(mock_aioresponses):
     server_url = "http://fake.local/v1"
 
     collection_url = server_url + COLLECTION_URL.format("bid", "cid")
-    mock_responses.get(
+    mock_aioresponses.get(
         collection_url,
         payload={
             "data": {
@@ -91,7 +91,7 @@ async def test_positive_no_pending_changes(mock_responses):
         },
     )
     collection_url = server_url + COLLECTION_URL.format("bid", "cid2")
-    mock_responses.get(
+    mock_aioresponses.get(
         collection_url,
         payload={
             "data": {
@@ -108,7 +108,7 @@ async def test_positive_no_pending_changes(mock_responses):
         ("main", "cid2"),
     ]:
         record = {"id": "record", "field": "foo"}
-        mock_responses.get(
+        mock_aioresponses.get(
             server_url + RECORD_URL.format(bid, cid),
             payload={
                 "data": [record],
@@ -122,12 +122,12 @@ async def test_positive_no_pending_changes(mock_responses):
     assert data == {}
 
 
-async def test_negative(mock_responses):
+async def test_negative(mock_aioresponses):
     server_url = "http://fake.local/v1"
 
     # Source collection is WIP.
     collection_url = server_url + COLLECTION_URL.format("bid", "cid")
-    mock_responses.get(
+    mock_aioresponses.get(
         collection_url,
         payload={
             "data": {
@@ -138,13 +138,13 @@ async def test_negative(mock_responses):
         },
     )
     # Records are different in source and destination.
-    mock_responses.get(
+    mock_aioresponses.get(
         server_url + RECORD_URL.format("bid", "cid"),
         payload={
             "data": [{"id": "record", "field": "foo"}],
         },
     )
-    mock_responses.get(
+    mock_aioresponses.get(
         server_url + RECORD_URL.format("main", "cid"),
         payload={
             "data": [{"id": "record", "field": "bar"}],
@@ -152,14 +152,14 @@ async def test_negative(mock_responses):
     )
     # The check needs to show the collection editors.
     group_url = server_url + GROUP_URL.format("bid", "cid2-editors")
-    mock_responses.get(
+    mock_aioresponses.get(
         group_url, payload={"data": {"members": ["ldap:editor@mozilla.com"]}}
     )
     # Add another failing collection, without last-edit
     group_url = server_url + GROUP_URL.format("bid", "cid-editors")
     collection_url = server_url + COLLECTION_URL.format("bid", "cid2")
-    mock_responses.get(collection_url, payload={"data": {"status": "to-review"}})
-    mock_responses.get(
+    mock_aioresponses.get(collection_url, payload={"data": {"status": "to-review"}})
+    mock_aioresponses.get(
         group_url, payload={"data": {"members": ["ldap:user@mozilla.com"]}}
     )
 
@@ -183,11 +183,11 @@ async def test_negative(mock_responses):
     }
 
 
-async def test_negative_with_recent(mock_responses):
+async def test_negative_with_recent(mock_aioresponses):
     server_url = "http://fake.local/v1"
 
     collection_url = server_url + COLLECTION_URL.format("bid", "cid")
-    mock_responses.get(
+    mock_aioresponses.get(
         collection_url,
         payload={
             "data": {
@@ -199,7 +199,7 @@ async def test_negative_with_recent(mock_responses):
     )
 
     collection_url2 = server_url + COLLECTION_URL.format("bid", "cid2")
-    mock_responses.get(
+    mock_aioresponses.get(
         collection_url2,
         payload={
             "data": {
@@ -209,7 +209,7 @@ async def test_negative_with_recent(mock_responses):
             }
         },
     )
-    mock_responses.get(
+    mock_aioresponses.get(
         server_url + GROUP_URL.format("bid", "cid2-editors"),
         payload={"data": {"members": ["ldap:editor@mozilla.com"]}},
     )
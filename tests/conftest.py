@@ -1,12 +1,14 @@
+import asyncio
 import os
 from typing import List, Union
 
 import pytest
-import responses
 from aioresponses import aioresponses
 
+from checks.remotesettings import utils as remotesettings_utils
 from telescope import config as global_config
 from telescope.app import Checks, init_app
+from telescope.utils import CircuitBreaker, RateLimiter
 
 
 HERE = os.path.dirname(os.path.abspath(__file__))
@@ -24,6 +26,51 @@ async def run(max_age: Union[int, float], from_conf: int, extras: List = []):
     return True, dict(max_age=max_age, from_conf=from_conf)
 
 
+class CountingModule:
+    """
+    Fake check module that returns the number of times it was run.
+    """
+
+    __name__ = "counting"
+    __doc__ = ""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def run(self):
+        self.calls += 1
+        return True, self.calls
+
+
+class SlowModule(CountingModule):
+    """
+    Fake check module whose runs after the first one block until ``unblock``
+    is set.
+    """
+
+    __name__ = "slow"
+
+    def __init__(self):
+        super().__init__()
+        self.unblock = asyncio.Event()
+
+    async def run(self):
+        self.calls += 1
+        if self.calls > 1:
+            await self.unblock.wait()
+        return True, self.calls
+
+
+@pytest.fixture
+def counting_module():
+    return CountingModule
+
+
+@pytest.fixture
+def slow_module():
+    return SlowModule
+
+
 @pytest.fixture
 def test_config_toml():
     config_file = os.path.join(HERE, "config.toml")
@@ -51,32 +98,22 @@ async def config():
         setattr(global_config, f, backup[f])
 
 
-@pytest.fixture
-def mock_aioresponses(cli):
-    test_server = f"http://{cli.host}:{cli.port}"
-    with aioresponses(passthrough=[test_server]) as m:
-        yield m
-
-
-class ResponsesWrapper:
-    """A tiny wrapper to mimic the aioresponses API."""
-
-    def __init__(self, rsps):
-        self.rsps = rsps
-
-    def get(self, *args, **kwargs):
-        kwargs["json"] = kwargs.pop("payload", None)
-        return self.rsps.add(responses.GET, *args, **kwargs)
+@pytest.fixture(autouse=True)
+def reset_circuit_breakers():
+    yield
+    CircuitBreaker._registry.clear()
+    RateLimiter._registry.clear()
 
-    def head(self, *args, **kwargs):
-        return self.rsps.add(responses.HEAD, *args, **kwargs)
 
-    @property
-    def calls(self):
-        return self.rsps.calls
+@pytest.fixture(autouse=True)
+def reset_remotesettings_caches():
+    yield
+    remotesettings_utils.MonitorChanges._registry.clear()
+    remotesettings_utils._signed_resources.clear()
 
 
 @pytest.fixture
-def mock_responses():
-    with responses.RequestsMock() as rsps:
-        yield ResponsesWrapper(rsps)
+def mock_aioresponses(cli):
+    test_server = f"http://{cli.host}:{cli.port}"
+    with aioresponses(passthrough=[test_server]) as m:
+        yield m
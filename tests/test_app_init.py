@@ -1,7 +1,9 @@
+import asyncio
 from unittest import mock
 
 import pytest
 
+from telescope import app as telescope_app
 from telescope.app import Checks, init_app
 
 
@@ -46,6 +48,69 @@ async def test_app_init_advanced_parameters():
     )
 
 
+async def test_snapshot_saved_and_loaded(aiohttp_client, config, tmp_path):
+    config.BUGTRACKER_URL = None
+    config.SNAPSHOT_FILE = str(tmp_path / "snapshot.json.gz")
+    conf = {
+        "checks": {
+            "p": {
+                "n": {
+                    "module": "tests.conftest",
+                    "description": "",
+                    "params": {"from_conf": 0, "max_age": 0},
+                }
+            }
+        }
+    }
+
+    app = init_app(Checks.from_conf(conf))
+    client = await aiohttp_client(app)
+    resp = await client.get("/checks/p/n")
+    before = (await resp.json())["datetime"]
+    await client.close()
+
+    app = init_app(Checks.from_conf(conf))
+    client = await aiohttp_client(app)
+    resp = await client.get("/checks/p/n")
+    after = (await resp.json())["datetime"]
+    await client.close()
+
+    assert before == after
+
+
+async def test_snapshot_saved_periodically(aiohttp_client, config, tmp_path):
+    config.SNAPSHOT_FILE = str(tmp_path / "snapshot.json.gz")
+    config.SNAPSHOT_INTERVAL_SECONDS = 0.01
+    app = init_app(Checks([]))
+
+    with mock.patch("telescope.utils.save_snapshot") as mocked:
+        mocked.side_effect = [ValueError("boom"), None, None, None, None]
+        client = await aiohttp_client(app)
+        # Logging the first error can be slow on busy machines.
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if mocked.call_count > 2:
+                break
+        await client.close()
+
+    assert mocked.call_count > 3
+
+
+def test_snapshot_loaded_before_scheduler_starts(config, tmp_path):
+    config.SNAPSHOT_FILE = str(tmp_path / "snapshot.json.gz")
+    config.SCHEDULER_ENABLED = True
+
+    app = init_app(Checks([]))
+
+    startup, cleanup = list(app.on_startup), list(app.on_cleanup)
+    assert startup.index(telescope_app._load_snapshot) < startup.index(
+        telescope_app._start_scheduler
+    )
+    assert cleanup.index(telescope_app._stop_scheduler) < cleanup.index(
+        telescope_app._save_snapshot
+    )
+
+
 def test_unknown_configuration_parameter():
     with pytest.raises(ValueError):
         init_app(
@@ -1,14 +1,28 @@
+import asyncio
+import gzip
+import json
 import logging
 import re
 import tempfile
 import time
+from datetime import timedelta
 from operator import itemgetter
 from unittest import mock
 
 from aioresponses import CallbackResult
 
-from telescope import config
-from telescope.utils import run_parallel
+from telescope import config, utils
+from telescope.app import Check, Checks, init_app
+from telescope.utils import (
+    Cache,
+    EventEmitter,
+    SQLiteCache,
+    _render_text_details,
+    fetch_head,
+    json_encode,
+    run_parallel,
+    utcnow,
+)
 
 
 async def test_hello(cli):
@@ -47,6 +61,59 @@ async def test_heartbeat(cli, config, mock_aioresponses):
     assert response.status == 200
 
 
+async def test_heartbeat_caches_bugzilla_ping(cli, config, mock_aioresponses):
+    config.BUGTRACKER_URL = "http://bugzilla.local"
+    mock_aioresponses.get(
+        config.BUGTRACKER_URL + "/rest/whoami", payload={"name": "foo"}
+    )
+
+    await cli.get("/__heartbeat__")
+    response = await cli.get("/__heartbeat__")
+    body = await response.json()
+
+    assert body["bugzilla"] == "ok"
+    assert len(mock_aioresponses.requests) == 1
+
+
+async def test_heartbeat_does_not_wait_for_slow_bugzilla(cli, config):
+    config.HEARTBEAT_TIMEOUT_SECONDS = 0.01
+
+    async def slow_ping():
+        await asyncio.sleep(1)
+        return True
+
+    tracker = cli.server.app["telescope.tracker"]
+    with mock.patch.object(tracker, "ping", side_effect=slow_ping):
+        response = await cli.get("/__heartbeat__")
+    body = await response.json()
+
+    assert body["bugzilla"] == "Bugzilla ping timed out"
+    assert response.status == 503
+
+
+async def test_heartbeat_without_curl(aiohttp_client, config, test_config_toml):
+    config.CURL_BINARY_PATH = "/path/to/unknown/curl"
+    checks = Checks.from_conf(config.load(test_config_toml))
+    client = await aiohttp_client(init_app(checks))
+
+    response = await client.get("/__heartbeat__")
+    body = await response.json()
+
+    assert body["curl"].startswith("curl unavailable")
+    assert response.status == 503
+
+
+async def test_upstreams(cli, mock_aioresponses):
+    mock_aioresponses.head("http://upstream.local/", status=200)
+    await fetch_head("http://upstream.local/")
+
+    response = await cli.get("/__upstreams__")
+    body = await response.json()
+
+    assert body["upstream.local"]["circuit"] == "closed"
+    assert body["upstream.local"]["rate_limit"]["active"] == 0
+
+
 async def test_version(cli):
     response = await cli.get("/__version__")
     assert response.status == 200
@@ -129,6 +196,100 @@ async def test_project_returns_only_cached(mock_aioresponses, cli):
     assert body[1]["data"] == {"max_age": 999, "from_conf": 100}
 
 
+async def slow_heartbeat(url, **kwargs):
+    await asyncio.sleep(0.1)
+    return CallbackResult(status=200, payload={"ok": True})
+
+
+async def test_project_keeps_checks_order(mock_aioresponses, cli):
+    mock_aioresponses.get("http://server.local/__heartbeat__", callback=slow_heartbeat)
+
+    response = await cli.get("/checks/testproject")
+    body = await response.json()
+
+    assert [c["name"] for c in body] == ["hb", "fake"]
+
+
+async def test_project_streams_ndjson(mock_aioresponses, cli):
+    mock_aioresponses.get("http://server.local/__heartbeat__", callback=slow_heartbeat)
+
+    response = await cli.get(
+        "/checks/testproject", headers={"Accept": "application/x-ndjson"}
+    )
+    assert response.status == 200
+    assert response.headers["Content-Type"] == "application/x-ndjson"
+
+    lines = [json.loads(line) async for line in response.content]
+    # Results are sent as they finish.
+    assert [c["name"] for c in lines[:2]] == ["fake", "hb"]
+    assert lines[0]["data"] == {"max_age": 999, "from_conf": 100}
+    assert lines[2] == {"done": True, "success": True}
+
+
+async def test_project_streams_server_sent_events(mock_aioresponses, cli):
+    mock_aioresponses.get("http://server.local/__heartbeat__", status=500, payload={})
+
+    response = await cli.get(
+        "/checks/testproject", headers={"Accept": "text/event-stream"}
+    )
+    assert response.status == 200
+    assert response.headers["Content-Type"] == "text/event-stream"
+
+    events = (await response.text()).strip().split("\n\n")
+    assert len(events) == 3
+    assert all(e.startswith("event: check\ndata: ") for e in events[:2])
+    assert events[2] == 'event: end\ndata: {"done":true,"success":false}'
+
+
+async def test_project_does_not_stream_when_refused(mock_aioresponses, cli):
+    mock_aioresponses.get("http://server.local/__heartbeat__", status=200, payload={})
+
+    response = await cli.get(
+        "/checks/testproject",
+        headers={"Accept": "application/x-ndjson;q=0, application/json"},
+    )
+    assert response.status == 200
+    assert response.headers["Content-Type"] == "application/json; charset=utf-8"
+
+
+async def test_project_does_not_stream_when_json_is_preferred(mock_aioresponses, cli):
+    mock_aioresponses.get("http://server.local/__heartbeat__", status=200, payload={})
+
+    response = await cli.get(
+        "/checks/testproject",
+        headers={"Accept": "text/event-stream;q=0.5, application/json"},
+    )
+    assert response.status == 200
+    assert response.headers["Content-Type"] == "application/json; charset=utf-8"
+
+
+async def test_check_by_tags_streams_ndjson(cli, mock_aioresponses):
+    mock_aioresponses.get("http://server.local/__heartbeat__", payload={"ok": True})
+
+    response = await cli.get(
+        "/checks/tags/ops+test", headers={"Accept": "application/x-ndjson"}
+    )
+
+    lines = [json.loads(line) async for line in response.content]
+    assert [c.get("name") for c in lines] == ["hb", None]
+
+
+async def test_single_check_is_not_streamed(cli):
+    response = await cli.get(
+        "/checks/testproject/fake", headers={"Accept": "text/event-stream"}
+    )
+    assert response.status == 406
+
+
+async def test_single_check_falls_back_to_json(cli):
+    response = await cli.get(
+        "/checks/testproject/fake",
+        headers={"Accept": "text/event-stream, application/json;q=0.5"},
+    )
+    assert response.status == 200
+    assert response.headers["Content-Type"] == "application/json; charset=utf-8"
+
+
 # /tags/{tags}
 
 
@@ -263,6 +424,227 @@ async def test_check_cached(cli, mock_aioresponses):
     assert response.status == 200
 
 
+async def test_check_caching_headers(cli, config):
+    check = cli.app["telescope.checks"].lookup("testproject", "fake")[0]
+
+    response = await cli.get("/checks/testproject/fake")
+
+    body = await response.json()
+    assert response.headers["ETag"].startswith('"')
+    assert response.headers["Vary"] == "Accept, Accept-Encoding"
+    assert response.headers["Last-Modified"].endswith(" GMT")
+    max_age = int(response.headers["Cache-Control"].replace("max-age=", ""))
+    assert 0 < max_age <= check.ttl
+    assert body["success"]
+
+
+async def test_check_not_modified(cli):
+    response = await cli.get("/checks/testproject/fake")
+    etag = response.headers["ETag"]
+
+    response = await cli.get(
+        "/checks/testproject/fake", headers={"If-None-Match": etag}
+    )
+
+    assert response.status == 304
+    assert response.headers["ETag"] == etag
+    assert await response.read() == b""
+
+    response = await cli.get(
+        "/checks/testproject/fake",
+        headers={"If-None-Match": etag, "Accept": "text/plain"},
+    )
+
+    assert response.status == 200
+    assert response.headers["ETag"] != etag
+
+
+async def test_check_modified_since_is_ignored(cli):
+    response = await cli.get("/checks/testproject/fake")
+    last_modified = response.headers["Last-Modified"]
+
+    response = await cli.get(
+        "/checks/testproject/fake", headers={"If-Modified-Since": last_modified}
+    )
+
+    assert response.status == 200
+
+
+async def test_failing_check_is_never_not_modified(cli, mock_aioresponses):
+    mock_aioresponses.get("http://server.local/__heartbeat__", status=503, repeat=True)
+    response = await cli.get("/checks/testproject/hb")
+    assert response.status == 503
+
+    response = await cli.get(
+        "/checks/testproject/hb",
+        headers={
+            "If-None-Match": response.headers["ETag"],
+            "If-Modified-Since": response.headers["Last-Modified"],
+        },
+    )
+
+    assert response.status == 503
+
+
+async def test_check_etag_changes_with_result(cli, config):
+    config.REFRESH_SECRET = "s3cr3t"
+    response = await cli.get("/checks/testproject/fake")
+    etag = response.headers["ETag"]
+
+    response = await cli.get(
+        "/checks/testproject/fake?refresh=s3cr3t", headers={"If-None-Match": etag}
+    )
+
+    assert response.status == 200
+    assert response.headers["ETag"] != etag
+
+
+async def test_check_etag_changes_with_bugs_list(cli, config):
+    config.BUGTRACKER_URL = "https://bugzilla.mozilla.org"
+    cache = cli.app["telescope.cache"]
+    tracker = cli.app["telescope.tracker"]
+    cache.set("bugtracker-list", {"bugs": []}, ttl=60)
+    cache.set("bugtracker-list-generation", "a", ttl=60)
+    response = await cli.get("/checks/testproject/fake")
+    etag = response.headers["ETag"]
+
+    cache.set("bugtracker-list-generation", "b", ttl=60)
+    response = await cli.get(
+        "/checks/testproject/fake", headers={"If-None-Match": etag}
+    )
+
+    assert await tracker.generation() == "b"
+    assert response.status == 200
+
+
+async def test_check_failing_max_age(cli, mock_aioresponses, config):
+    config.ERROR_TTL = 5
+    mock_aioresponses.get("http://server.local/__heartbeat__", status=503)
+
+    response = await cli.get("/checks/testproject/hb")
+
+    assert response.status == 503
+    assert int(response.headers["Cache-Control"].replace("max-age=", "")) <= 5
+
+
+async def test_check_results_are_serialized_once(cli, config):
+    config.REFRESH_SECRET = "s3cr3t"
+
+    def serialized(mocked):
+        return [c for c in mocked.call_args_list if "buglist" in c.args[0]]
+
+    with mock.patch("telescope.utils.json_encode", wraps=json_encode) as mocked:
+        first = await cli.get("/checks/testproject/fake")
+        second = await cli.get("/checks/testproject/fake")
+        assert len(serialized(mocked)) == 1
+
+        await cli.get("/checks/testproject/fake?refresh=s3cr3t")
+        assert len(serialized(mocked)) == 2
+
+    assert await first.json() == await second.json()
+
+
+async def test_check_results_are_stitched(cli, mock_aioresponses):
+    mock_aioresponses.get("http://server.local/__heartbeat__", status=200, payload={})
+    single = await (await cli.get("/checks/testproject/fake")).json()
+
+    response = await cli.get("/checks/testproject")
+
+    body = await response.json()
+    assert response.headers["Content-Type"] == "application/json; charset=utf-8"
+    assert [c["name"] for c in body] == ["hb", "fake"]
+    assert body[1] == single
+
+
+async def test_check_text_details_are_rendered_once(cli, mock_aioresponses):
+    mock_aioresponses.get("http://server.local/__heartbeat__", status=503)
+    headers = {"Accept": "text/plain"}
+
+    with mock.patch(
+        "telescope.utils._render_text_details", wraps=_render_text_details
+    ) as mocked:
+        first = await (await cli.get("/checks/testproject", headers=headers)).text()
+        second = await (await cli.get("/checks/testproject", headers=headers)).text()
+
+    assert mocked.call_count == 1
+    assert first == second
+    assert "Data:" in first
+
+
+async def test_check_render_cache_disabled(aiohttp_client, config, test_config_toml):
+    config.RENDER_CACHE_MAX_BYTES = 0
+    app = init_app(Checks.from_conf(config.load(test_config_toml)))
+    client = await aiohttp_client(app)
+
+    response = await client.get("/checks/testproject/fake")
+
+    assert "telescope.rendered" not in app
+    assert response.status == 200
+
+
+async def test_check_results_are_compressed(cli, config):
+    config.COMPRESSION_MIN_BYTES = 0
+    plain = await cli.get(
+        "/checks/testproject/fake", headers={"Accept-Encoding": "identity"}
+    )
+
+    response = await cli.get(
+        "/checks/testproject/fake", headers={"Accept-Encoding": "gzip, deflate"}
+    )
+
+    assert "Content-Encoding" not in plain.headers
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["ETag"] != plain.headers["ETag"]
+    # Decompressed by the client.
+    assert await response.json() == await plain.json()
+
+
+async def test_small_check_results_are_not_compressed(cli, config):
+    config.COMPRESSION_MIN_BYTES = 1024 * 1024
+
+    response = await cli.get(
+        "/checks/testproject/fake", headers={"Accept-Encoding": "gzip"}
+    )
+
+    assert "Content-Encoding" not in response.headers
+
+
+async def test_check_results_are_compressed_once(cli, config):
+    config.COMPRESSION_MIN_BYTES = 0
+    headers = {"Accept-Encoding": "gzip", "Accept": "text/plain"}
+
+    with mock.patch("telescope.utils.gzip.compress", wraps=gzip.compress) as mocked:
+        first = await cli.get("/checks/testproject/fake", headers=headers)
+        second = await cli.get("/checks/testproject/fake", headers=headers)
+
+    assert mocked.call_count == 1
+    assert second.headers["Content-Encoding"] == "gzip"
+    assert await first.text() == await second.text()
+
+
+async def test_check_results_are_compressed_off_the_event_loop(cli, config):
+    config.COMPRESSION_MIN_BYTES = 0
+
+    with mock.patch("telescope.utils.run_in_pool", wraps=utils.run_in_pool) as mocked:
+        response = await cli.get(
+            "/checks/testproject/fake", headers={"Accept-Encoding": "gzip"}
+        )
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert mocked.call_args.kwargs == {"threads": True}
+
+
+async def test_compression_disabled(cli, config):
+    config.COMPRESSION_MIN_BYTES = 0
+    config.COMPRESSION_ENCODINGS = []
+
+    response = await cli.get(
+        "/checks/testproject/fake", headers={"Accept-Encoding": "gzip"}
+    )
+
+    assert "Content-Encoding" not in response.headers
+
+
 async def test_check_parallel(cli, mock_aioresponses):
     class Callback:
         def __init__(self):
@@ -303,6 +685,262 @@ async def test_check_force_refresh(cli, mock_aioresponses):
     assert dt_before != dt_refreshed
 
 
+async def test_check_stale_result_is_served_while_refreshing(slow_module):
+    module = slow_module()
+    check = Check("p", "n", "", module=module, ttl=10, stale_ttl=100)
+    cache = Cache()
+    events = EventEmitter()
+    runs = []
+    events.on("check:run", lambda event, payload: runs.append(payload))
+
+    await check.run(cache=cache, events=events)
+
+    later = utcnow() + timedelta(seconds=30)
+    with mock.patch("telescope.utils.utcnow", return_value=later):
+        _, _, first, _ = await check.run(cache=cache, events=events)
+        _, _, second, _ = await check.run(cache=cache, events=events)
+        assert first == second == 1
+        assert check.is_stale(cache.get(check.cache_key))
+        assert int(check.age(cache.get(check.cache_key))) == 30
+        # Only one refresh was started.
+        assert len(Check._refreshes) == 1
+
+        module.unblock.set()
+        await asyncio.gather(*Check._refreshes.values())
+
+        _, _, refreshed, _ = await check.run(cache=cache, events=events)
+
+    assert refreshed == 2
+    assert module.calls == 2
+    assert len(runs) == 2
+    assert Check._refreshes == {}
+
+
+async def test_check_stale_refresh_errors_are_logged(caplog, slow_module):
+    module = slow_module()
+    check = Check("p", "n", "", module=module, ttl=10, stale_ttl=100)
+    cache = Cache()
+    await check.run(cache=cache)
+
+    later = utcnow() + timedelta(seconds=30)
+    with mock.patch("telescope.utils.utcnow", return_value=later):
+        # Errors of the check itself are cached, not raised.
+        with mock.patch.object(check, "_execute", side_effect=ValueError("boom")):
+            _, _, data, _ = await check.run(cache=cache)
+            await asyncio.gather(*Check._refreshes.values())
+            _, _, stale, _ = await check.run(cache=cache)
+            await asyncio.gather(*Check._refreshes.values())
+
+    assert data == stale == 1
+    assert "boom" in caplog.text
+    assert Check._refreshes == {}
+
+
+async def test_check_stale_refreshes_are_cancelled_on_cleanup(
+    aiohttp_client, config, slow_module
+):
+    config.BUGTRACKER_URL = None
+    module = slow_module()
+    check = Check("p", "n", "", module=module, ttl=10, stale_ttl=100)
+    client = await aiohttp_client(init_app(Checks([check])))
+    await client.get("/checks/p/n")
+
+    later = utcnow() + timedelta(seconds=30)
+    with mock.patch("telescope.utils.utcnow", return_value=later):
+        await client.get("/checks/p/n")
+        await asyncio.sleep(0)
+        refresh = Check._refreshes[check.cache_key]
+
+        await client.close()
+
+    assert refresh.cancelled()
+    assert Check._refreshes == {}
+
+
+async def test_check_refreshes_not_started_are_cancelled(slow_module):
+    check = Check("p", "n", "", module=slow_module(), ttl=10, stale_ttl=100)
+    check._refresh_in_background(Cache(), None)
+
+    await Check.cancel_refreshes()
+
+    assert Check._refreshes == {}
+
+
+async def test_check_cached_result_is_served_while_refreshing(slow_module):
+    module = slow_module()
+    check = Check("p", "n", "", module=module, ttl=10)
+    cache = Cache()
+    await check.run(cache=cache)
+
+    async with cache.lock(check.cache_key):
+        # Eg. held by a refresh ahead of expiration.
+        _, _, data, _ = await asyncio.wait_for(check.run(cache=cache), timeout=0.1)
+
+    assert data == 1
+
+
+async def test_check_is_refreshed_only_within_margin(slow_module):
+    module = slow_module()
+    module.unblock.set()
+    check = Check("p", "n", "", module=module, ttl=10)
+    cache = Cache()
+    await check.run(cache=cache)
+
+    _, _, data, _ = await check.run(cache=cache, margin=5)
+    assert data == 1
+
+    _, _, data, _ = await check.run(cache=cache, margin=10)
+    assert data == 2
+
+
+async def test_check_stale_result_is_refreshed_when_forced(slow_module):
+    module = slow_module()
+    module.unblock.set()
+    check = Check("p", "n", "", module=module, ttl=10, stale_ttl=100)
+    cache = Cache()
+    await check.run(cache=cache)
+
+    later = utcnow() + timedelta(seconds=30)
+    with mock.patch("telescope.utils.utcnow", return_value=later):
+        _, _, data, _ = await check.run(cache=cache, force=True)
+
+    assert data == 2
+
+
+async def test_check_stale_result_is_rendered(cli, config):
+    check = cli.app["telescope.checks"].lookup("testproject", "fake")[0]
+    check.stale_ttl = 100
+    cache = cli.app["telescope.cache"]
+
+    resp = await cli.get("/checks/testproject/fake")
+    body = await resp.json()
+    assert body["stale"] is False
+    assert "age" not in body
+
+    timestamp, success, data, duration = cache.get(check.cache_key)
+    cache.set(
+        check.cache_key,
+        (timestamp - timedelta(seconds=70), success, data, duration),
+        ttl=100,
+    )
+
+    resp = await cli.get("/checks/testproject/fake")
+    body = await resp.json()
+    assert body["stale"] is True
+    assert body["age"] >= 70
+
+
+async def test_check_errors_are_cached_briefly(config, caplog, slow_module):
+    config.ERROR_TTL = 5
+    module = slow_module()
+    check = Check("p", "n", "", module=module, ttl=60)
+    cache = Cache()
+    events = EventEmitter()
+    runs = []
+    events.on("check:run", lambda event, payload: runs.append(payload))
+
+    with mock.patch.object(check, "func", side_effect=ValueError("boom")) as mocked:
+        _, success, data, _ = await check.run(cache=cache, events=events)
+        await check.run(cache=cache, events=events)
+
+    assert mocked.call_count == 1
+    assert not success
+    assert data == "ValueError('boom')"
+    assert runs[0]["result"]["success"] is False
+    assert "boom" in caplog.text
+    assert cache.ttl(check.cache_key) <= 5
+
+
+async def test_check_timeout(config):
+    class HangingModule:
+        __name__ = "hanging"
+        __doc__ = ""
+
+        async def run(self):
+            await asyncio.sleep(10)
+
+    check = Check("p", "n", "", module=HangingModule(), ttl=60, timeout=0)
+    cache = Cache()
+
+    with mock.patch.object(Check, "DEADLINE_GRACE_SECONDS", 0.01):
+        _, success, data, _ = await asyncio.wait_for(check.run(cache=cache), 1)
+
+    assert not success
+    assert data == "Timed out after 0s"
+    assert cache.ttl(check.cache_key) <= config.ERROR_TTL
+
+
+async def test_check_errors_are_rendered(cli):
+    async def failing(max_age: int, from_conf: int):
+        raise ValueError("boom")
+
+    with mock.patch("tests.conftest.run", failing):
+        resp = await cli.get("/checks/testproject/fake")
+
+    body = await resp.json()
+    assert resp.status == 503
+    assert body["data"] == "ValueError('boom')"
+
+
+async def test_check_computed_once_with_shared_cache(tmp_path, slow_module):
+    module = slow_module()
+    module.unblock.set()
+    check = Check("p", "n", "", module=module)
+    path = str(tmp_path / "cache.sqlite")
+    replica1 = SQLiteCache(path)
+    replica2 = SQLiteCache(path)
+    replica2.LOCK_POLL_INTERVAL_SECONDS = 0.01
+
+    first, second = await asyncio.gather(
+        check.run(cache=replica1), check.run(cache=replica2)
+    )
+
+    assert module.calls == 1
+    assert first[0] == second[0]
+
+
+async def test_check_fresh_and_cached_results_are_the_same(tmp_path):
+    class TupleModule:
+        __name__ = "tuples"
+        __doc__ = ""
+
+        async def run(self):
+            return True, {1: (2, 2**70 + 1)}
+
+    check = Check("p", "n", "", module=TupleModule())
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite"))
+
+    fresh = await check.run(cache=cache)
+    cached = await check.run(cache=cache)
+
+    assert fresh == cached
+    assert fresh[2] == {"1": [2, 2**70 + 1]}
+    cache.close()
+
+
+async def test_check_cached_results_are_read_without_lock(tmp_path, slow_module):
+    check = Check("p", "n", "", module=slow_module())
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite"))
+    await check.run(cache=cache)
+
+    with mock.patch.object(cache, "try_acquire") as mocked:
+        await check.run(cache=cache)
+
+    assert not mocked.called
+    cache.close()
+
+
+async def test_cache_is_closed_on_cleanup(aiohttp_client, config):
+    config.BUGTRACKER_URL = None
+    app = init_app(Checks([]))
+    client = await aiohttp_client(app)
+
+    with mock.patch.object(app["telescope.cache"], "close") as mocked:
+        await client.close()
+
+    assert mocked.called
+
+
 async def test_check_cached_by_queryparam(cli, mock_aioresponses):
     resp = await cli.get("/checks/testproject/fake")
     dt_no_params = (await resp.json())["datetime"]
@@ -345,7 +983,11 @@ async def test_sends_events(mock_aioresponses, cli):
     assert len(events["check:run"]) == 2
     assert len(events["check:state:changed"]) == 1
 
-    assert list(map(itemgetter("result"), events["check:run"])) == [
+    results = [
+        {k: r[k] for k in ("data", "success")}
+        for r in map(itemgetter("result"), events["check:run"])
+    ]
+    assert results == [
         {
             "data": {"ok": True},
             "success": True,
@@ -355,12 +997,10 @@ async def test_sends_events(mock_aioresponses, cli):
             "success": False,
         },
     ]
-    assert list(map(itemgetter("result"), events["check:state:changed"])) == [
-        {
-            "data": {"ok": False},
-            "success": False,
-        }
-    ]
+    changed = events["check:state:changed"][0]["result"]
+    assert changed["data"] == {"ok": False}
+    assert not changed["success"]
+    assert "datetime" in changed and "duration" in changed
 
 
 async def test_logging_summary_no_querystring_by_default(caplog, cli):
@@ -411,14 +1051,14 @@ async def test_logging_result(caplog, cli, mock_aioresponses):
     assert result_logs[0].plot == 12
 
     assert result_logs[1].plot is None
-    assert result_logs[1].data == '{"field": "abc"}'
+    assert json.loads(result_logs[1].data) == {"field": "abc"}
 
     assert not result_logs[2].success
     assert result_logs[2].plot is None
     assert result_logs[2].data == '"Boom"'
 
     assert result_logs[3].plot is None
-    assert result_logs[3].data == '{"field": null}'
+    assert json.loads(result_logs[3].data) == {"field": None}
 
 
 async def test_cors_enabled(cli):
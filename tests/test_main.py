@@ -1,7 +1,12 @@
+import json
 import sys
 from unittest import mock
+from xml.etree import ElementTree  # nosec B405
 
-from telescope.app import Check, main, run_check
+import pytest
+from aioresponses import aioresponses
+
+from telescope.app import Check, main, run_check, setup_event_loop
 
 
 async def test_run_check_cli(test_config_toml):
@@ -45,3 +50,86 @@ def test_run_check(mock_aioresponses):
             params={"url": url},
         )
     )
+
+
+def test_run_checks_parallel(test_config_toml, capsys):
+    with aioresponses() as m:
+        m.get("http://server.local/__heartbeat__", status=200, payload={"ok": True})
+        result = main(["check", "testproject", "--parallel", "4"])
+
+    assert result == 0
+    stdout = capsys.readouterr().out
+    assert "testproject/hb OK" in stdout
+    assert "testproject/fake OK" in stdout
+    assert "Summary:" in stdout
+    assert "2 checks, 0 failed" in stdout
+
+
+def test_run_checks_failure(test_config_toml, capsys):
+    with aioresponses() as m:
+        m.get("http://server.local/__heartbeat__", status=503, payload={})
+        result = main(["check", "testproject", "--parallel", "2"])
+
+    assert result == 1
+    assert "2 checks, 1 failed" in capsys.readouterr().out
+
+
+def test_run_checks_json_output(test_config_toml, capsys):
+    with aioresponses() as m:
+        m.get("http://server.local/__heartbeat__", status=200, payload={"ok": True})
+        result = main(["check", "testproject", "--output", "json"])
+
+    assert result == 0
+    captured = capsys.readouterr()
+    report = json.loads(captured.out)
+    assert [(r["project"], r["name"], r["success"]) for r in report] == [
+        ("testproject", "hb", True),
+        ("testproject", "fake", True),
+    ]
+    assert report[1]["data"] == {"max_age": 999, "from_conf": 100}
+    # Progress is reported separately.
+    assert "testproject/hb OK" in captured.err
+
+
+def test_run_checks_junit_output(test_config_toml, capsys):
+    with aioresponses() as m:
+        m.get("http://server.local/__heartbeat__", status=503, payload={})
+        result = main(["check", "testproject", "hb", "--output", "junit"])
+
+    assert result == 1
+    suite = ElementTree.fromstring(capsys.readouterr().out)  # nosec B314
+    assert suite.attrib["tests"] == "1"
+    assert suite.attrib["failures"] == "1"
+    (case,) = suite.findall("testcase")
+    assert case.attrib["classname"] == "testproject"
+    assert case.attrib["name"] == "hb"
+    assert case.find("failure").attrib["message"] == "Test HB"
+
+
+def test_setup_event_loop(config):
+    config.EVENT_LOOP = "asyncio"
+    with mock.patch("asyncio.set_event_loop_policy") as mocked:
+        setup_event_loop()
+    assert not mocked.called
+
+    config.EVENT_LOOP = "unknown"
+    with pytest.raises(ValueError):
+        setup_event_loop()
+
+
+def test_setup_event_loop_uvloop(config):
+    config.EVENT_LOOP = "uvloop"
+    uvloop = mock.MagicMock()
+    with mock.patch.dict(sys.modules, {"uvloop": uvloop}):
+        with mock.patch("asyncio.set_event_loop_policy") as mocked:
+            setup_event_loop()
+    mocked.assert_called_with(uvloop.EventLoopPolicy.return_value)
+
+
+def test_setup_event_loop_uvloop_missing(config, caplog):
+    config.EVENT_LOOP = "uvloop"
+    with mock.patch.dict(sys.modules, {"uvloop": None}):
+        with mock.patch("asyncio.set_event_loop_policy") as mocked:
+            setup_event_loop()
+    assert not mocked.called
+    assert "uvloop is not installed" in caplog.text
@@ -0,0 +1,172 @@
+import asyncio
+from unittest import mock
+
+from telescope.app import Check, Checks, init_app
+from telescope.scheduler import Scheduler
+from telescope.utils import Cache, EventEmitter
+
+
+def test_delay_is_before_expiration(counting_module):
+    check = Check("p", "n", "", module=counting_module(), ttl=60)
+    scheduler = Scheduler([check], margin=5, jitter=10)
+
+    delays = [scheduler.delay(check) for _ in range(100)]
+
+    assert all(45 <= d <= 55 for d in delays)
+    assert len(set(delays)) > 1
+
+
+def test_delay_has_a_minimum(counting_module):
+    check = Check("p", "n", "", module=counting_module(), ttl=1)
+    scheduler = Scheduler([check], margin=5, jitter=10)
+
+    assert scheduler.delay(check) == 1
+
+
+async def test_checks_are_refreshed_in_background(counting_module):
+    module = counting_module()
+    check = Check("p", "n", "", module=module, ttl=60)
+    cache = Cache()
+    events = EventEmitter()
+    runs = []
+    events.on("check:run", lambda event, payload: runs.append(payload))
+    scheduler = Scheduler([check], cache=cache, events=events, jitter=0)
+
+    with mock.patch.object(scheduler, "delay", return_value=0.01):
+        with mock.patch.object(check, "remaining", return_value=1):
+            scheduler.start()
+            await asyncio.sleep(0.1)
+            await scheduler.stop()
+
+    assert module.calls > 1
+    assert len(runs) == module.calls
+    _, _, data, _ = cache.get(check.cache_key)
+    assert data == module.calls
+
+
+def test_delay_is_before_cached_expiration(counting_module):
+    check = Check("p", "n", "", module=counting_module(), ttl=60)
+    scheduler = Scheduler([check], margin=5, jitter=0)
+
+    assert scheduler.delay(check, remaining=20) == 15
+
+
+async def test_remaining_time_of_cached_results(counting_module):
+    check = Check("p", "n", "", module=counting_module(), ttl=60, stale_ttl=100)
+    cache = Cache()
+    scheduler = Scheduler([check], cache=cache)
+    assert await scheduler.remaining(check) is None
+
+    await check.run(cache=cache)
+
+    # Served stale after the check ttl.
+    assert 59 < await scheduler.remaining(check) <= 60
+    timestamp, success, data, duration = cache.get(check.cache_key)
+    cache.set(check.cache_key, (timestamp, False, data, duration), ttl=10)
+    # Errors are cached shortly.
+    assert 9 < await scheduler.remaining(check) <= 10
+
+
+async def test_fresh_cached_results_are_not_refreshed(counting_module):
+    module = counting_module()
+    check = Check("p", "n", "", module=module, ttl=60)
+    cache = Cache()
+    await check.run(cache=cache)
+    scheduler = Scheduler([check], cache=cache, jitter=0, margin=5)
+
+    with mock.patch.object(scheduler, "delay", return_value=0.01):
+        scheduler.start()
+        await asyncio.sleep(0.05)
+        await scheduler.stop()
+
+    assert module.calls == 1
+
+
+async def test_refreshes_are_not_forced(counting_module):
+    module = counting_module()
+    check = Check("p", "n", "", module=module, ttl=60)
+    scheduler = Scheduler([check], cache=Cache(), jitter=0, margin=5)
+
+    with mock.patch.object(check, "run", wraps=check.run) as mocked:
+        scheduler.start()
+        await asyncio.sleep(0.01)
+        await scheduler.stop()
+
+    assert "force" not in mocked.call_args.kwargs
+    assert mocked.call_args.kwargs["margin"] == 5
+
+
+async def test_results_refreshed_by_another_scheduler_are_not_refreshed_again(
+    counting_module,
+):
+    module = counting_module()
+    check = Check("p", "n", "", module=module, ttl=60)
+    cache = Cache()
+    await check.run(cache=cache)
+    scheduler = Scheduler([check], cache=cache, jitter=0, margin=5)
+
+    # Seen as expiring, but refreshed by another process before the lock is taken.
+    with mock.patch.object(scheduler, "remaining", return_value=1):
+        with mock.patch.object(scheduler, "delay", return_value=0.01):
+            scheduler.start()
+            await asyncio.sleep(0.05)
+            await scheduler.stop()
+
+    assert module.calls == 1
+
+
+async def test_concurrency_is_bounded():
+    running = []
+    max_running = []
+
+    class ConcurrentModule:
+        __name__ = "slow"
+        __doc__ = ""
+
+        async def run(self):
+            running.append(1)
+            max_running.append(len(running))
+            await asyncio.sleep(0.01)
+            running.pop()
+            return True, None
+
+    checks = [Check("p", f"n{i}", "", module=ConcurrentModule()) for i in range(5)]
+    scheduler = Scheduler(checks, jitter=0, max_parallel=2)
+
+    scheduler.start()
+    await asyncio.sleep(0.1)
+    await scheduler.stop()
+
+    assert max(max_running) == 2
+
+
+async def test_errors_are_logged(caplog, counting_module):
+    module = counting_module()
+    check = Check("p", "n", "", module=module)
+    scheduler = Scheduler([check], jitter=0)
+
+    with mock.patch.object(check, "func", side_effect=ValueError("boom")):
+        scheduler.start()
+        await asyncio.sleep(0.01)
+        await scheduler.stop()
+
+    assert "boom" in caplog.text
+
+
+async def test_scheduler_started_with_app(aiohttp_client, config, counting_module):
+    config.BUGTRACKER_URL = None
+    config.SCHEDULER_ENABLED = True
+    config.SCHEDULER_JITTER_SECONDS = 0
+    module = counting_module()
+    app = init_app(Checks([Check("p", "n", "", module=module)]))
+
+    client = await aiohttp_client(app)
+    await asyncio.sleep(0.01)
+
+    assert module.calls == 1
+    resp = await client.get("/checks/p/n")
+    body = await resp.json()
+    assert body["data"] == 1
+
+    await client.close()
+    assert app["telescope.scheduler"]._tasks == []
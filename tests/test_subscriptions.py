@@ -0,0 +1,292 @@
+import asyncio
+import json
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+
+from telescope.app import Check, Checks, init_app
+from telescope.subscriptions import Broadcaster
+from telescope.utils import Cache, EventEmitter, utcnow
+
+
+async def render(check, result):
+    return {"name": check.name, "data": result[2]}
+
+
+async def read_event(response):
+    chunk = await asyncio.wait_for(response.content.readuntil(b"\n\n"), timeout=1)
+    name, data = chunk.decode().strip().split("\n")
+    return name.replace("event: ", ""), json.loads(data.replace("data: ", ""))
+
+
+@pytest.fixture
+async def client(aiohttp_client, config, counting_module):
+    config.BUGTRACKER_URL = None
+    module = counting_module()
+    checks = [
+        Check("p", "a", "", module=module, ttl=60),
+        Check("p", "b", "", module=counting_module(), ttl=60),
+    ]
+    app = init_app(Checks(checks))
+    client = await aiohttp_client(app)
+    client.module = module
+    return client
+
+
+async def test_subscribers_receive_all_results(client):
+    response = await client.get("/events")
+    assert response.headers["Content-Type"] == "text/event-stream"
+
+    events = [await read_event(response), await read_event(response)]
+
+    assert sorted(data["name"] for _, data in events) == ["a", "b"]
+    assert all(name == "check" for name, _ in events)
+    assert events[0][1]["success"]
+    assert "buglist" in events[0][1]
+
+
+async def test_new_subscribers_receive_latest_results(client):
+    first = await client.get("/events")
+    await read_event(first)
+    await read_event(first)
+
+    second = await client.get("/events")
+    events = [await read_event(second), await read_event(second)]
+
+    assert sorted(data["name"] for _, data in events) == ["a", "b"]
+    # Checks were not run again.
+    assert client.module.calls == 1
+
+
+async def test_new_results_are_pushed(client, config):
+    config.REFRESH_SECRET = "s3cr3t"
+    response = await client.get("/events")
+    await read_event(response)
+    await read_event(response)
+
+    await client.get("/checks/p/a?refresh=s3cr3t")
+
+    _, data = await read_event(response)
+    assert data["name"] == "a"
+    assert data["data"] == 2
+
+
+async def test_results_are_refreshed_when_expired(counting_module):
+    module = counting_module()
+    check = Check("p", "n", "", module=module, ttl=60)
+    broadcaster = Broadcaster([check], render=render)
+    queue: asyncio.Queue = asyncio.Queue()
+    broadcaster.subscribers.add(queue)
+
+    with mock.patch.object(broadcaster, "delay", return_value=0.01):
+        broadcaster.start()
+        await asyncio.sleep(0.1)
+        await broadcaster.stop()
+
+    assert module.calls > 1
+    assert queue.qsize() == module.calls
+
+
+def test_delay_is_until_expiration(counting_module):
+    check = Check("p", "n", "", module=counting_module(), ttl=60)
+    broadcaster = Broadcaster([check], render=render)
+    now = utcnow()
+
+    assert (
+        49 < broadcaster.delay(check, (now - timedelta(seconds=10), True, 0, 0)) <= 50
+    )
+    assert broadcaster.delay(check, (now - timedelta(seconds=90), True, 0, 0)) == 1
+
+
+def test_delay_of_stale_results_is_until_end_of_stale_window(counting_module):
+    check = Check("p", "n", "", module=counting_module(), ttl=60, stale_ttl=100)
+    broadcaster = Broadcaster([check], render=render)
+    now = utcnow()
+
+    assert (
+        69 < broadcaster.delay(check, (now - timedelta(seconds=90), True, 0, 0)) <= 70
+    )
+
+
+async def test_watchers_wake_up_when_stale_results_are_refreshed(counting_module):
+    module = counting_module()
+    check = Check("p", "n", "", module=module, ttl=60, stale_ttl=100)
+    cache = Cache()
+    events = EventEmitter()
+    broadcaster = Broadcaster([check], render=render, cache=cache, events=events)
+    events.on("check:run", broadcaster.on_check_run)
+    queue: asyncio.Queue = asyncio.Queue()
+    broadcaster.subscribers.add(queue)
+    cache.set(check.cache_key, (utcnow() - timedelta(seconds=90), True, 0, 0), 160)
+
+    with mock.patch.object(check, "run", wraps=check.run) as mocked:
+        broadcaster.start()
+        # Much less than the back off of the watcher.
+        await asyncio.sleep(0.1)
+        await broadcaster.stop()
+
+    # Served stale, and then the refreshed result from the cache.
+    assert mocked.call_count == 2
+    assert module.calls == 1
+    assert broadcaster.results[check.cache_key][2] == 1
+
+
+async def test_new_subscribers_receive_current_staleness(counting_module):
+    fresh = Check("p", "fresh", "", module=counting_module(), ttl=600)
+    stale = Check("p", "stale", "", module=counting_module(), ttl=60, stale_ttl=100)
+    expired = Check("p", "expired", "", module=counting_module(), ttl=60)
+
+    async def render(check, result):
+        return {"name": check.name, "stale": check.is_stale(result)}
+
+    broadcaster = Broadcaster([fresh, stale, expired], render=render)
+    broadcaster.subscribers.add(asyncio.Queue())
+    now = utcnow()
+    for check in (fresh, stale, expired):
+        await broadcaster.publish(check, (now, True, 0, 0))
+
+    later = now + timedelta(seconds=90)
+    with mock.patch("telescope.utils.utcnow", return_value=later):
+        messages = await broadcaster.latest_messages()
+
+    assert messages == [
+        b'event: check\ndata: {"name":"fresh","stale":false}\n\n',
+        b'event: check\ndata: {"name":"stale","stale":true}\n\n',
+    ]
+
+
+async def test_errors_are_logged(caplog, counting_module):
+    check = Check("p", "n", "", module=counting_module())
+    broadcaster = Broadcaster([check], render=render)
+
+    with mock.patch.object(check, "run", side_effect=ValueError("boom")):
+        broadcaster.start()
+        await asyncio.sleep(0.01)
+        await broadcaster.stop()
+
+    assert "boom" in caplog.text
+
+
+async def test_results_are_published_once(counting_module):
+    check = Check("p", "n", "", module=counting_module())
+    broadcaster = Broadcaster([check], render=render)
+    queue: asyncio.Queue = asyncio.Queue()
+    broadcaster.subscribers.add(queue)
+    result = (utcnow(), True, 42, 0)
+
+    await broadcaster.publish(check, result)
+    await broadcaster.publish(check, result)
+
+    assert queue.qsize() == 1
+    assert queue.get_nowait() == b'event: check\ndata: {"name":"n","data":42}\n\n'
+
+
+async def test_older_results_are_not_published(counting_module):
+    check = Check("p", "n", "", module=counting_module())
+    newer = (utcnow(), True, "newer", 0)
+    older = (newer[0].replace(year=2000), True, "older", 0)
+    rendered = asyncio.Event()
+
+    async def slow_render(check, result):
+        if result[2] == "older":
+            await rendered.wait()
+        return await render(check, result)
+
+    broadcaster = Broadcaster([check], render=slow_render)
+    broadcaster.subscribers.add(asyncio.Queue())
+    task = asyncio.create_task(broadcaster.publish(check, older))
+    await asyncio.sleep(0)
+    await broadcaster.publish(check, newer)
+    rendered.set()
+    await task
+
+    assert b"newer" in broadcaster.messages[check.cache_key]
+
+
+async def test_results_are_not_rendered_without_subscribers(counting_module):
+    check = Check("p", "n", "", module=counting_module())
+    events = EventEmitter()
+    render = mock.AsyncMock()
+    broadcaster = Broadcaster([check], render=render, events=events)
+    events.on("check:run", broadcaster.on_check_run)
+
+    await check.run(events=events)
+    await asyncio.sleep(0)
+
+    assert not render.called
+
+
+async def test_results_of_overriden_checks_are_ignored():
+    class ParamModule:
+        __name__ = "param"
+        __doc__ = ""
+        URL_PARAMETERS = ["a"]
+
+        async def run(self, a: int):
+            return True, a
+
+    check = Check("p", "n", "", module=ParamModule(), params={"a": 1})
+    events = EventEmitter()
+    broadcaster = Broadcaster([check], render=render, events=events)
+    broadcaster.subscribers.add(asyncio.Queue())
+    events.on("check:run", broadcaster.on_check_run)
+
+    await check.override_params({"a": 2}).run(events=events)
+    await asyncio.sleep(0)
+
+    assert broadcaster.messages == {}
+
+
+async def test_slow_subscribers_are_disconnected(counting_module):
+    check = Check("p", "n", "", module=counting_module())
+    broadcaster = Broadcaster([check], render=render)
+    broadcaster.MAX_PENDING_EVENTS = 2
+    queue: asyncio.Queue = asyncio.Queue(maxsize=3)
+    broadcaster.subscribers.add(queue)
+
+    for i in range(3):
+        await broadcaster.publish(check, (utcnow(), True, i, 0))
+
+    assert queue not in broadcaster.subscribers
+    assert queue.qsize() == 3
+    assert [queue.get_nowait() for _ in range(3)][-1] is None
+
+
+async def test_keepalive_is_sent(client):
+    with mock.patch.object(Broadcaster, "KEEPALIVE_SECONDS", 0.01):
+        response = await client.get("/events")
+        await read_event(response)
+        await read_event(response)
+        chunk = await response.content.readuntil(b"\n\n")
+
+    assert chunk == b": keepalive\n\n"
+
+
+async def test_watchers_stop_without_subscribers(client):
+    broadcaster = client.server.app["telescope.broadcaster"]
+    response = await client.get("/events")
+    await read_event(response)
+    assert len(broadcaster._watchers) == 2
+
+    response.close()
+    with mock.patch.object(Broadcaster, "KEEPALIVE_SECONDS", 0.01):
+        for _ in range(100):
+            if not broadcaster.subscribers:
+                break
+            await asyncio.sleep(0.01)
+    await asyncio.sleep(0.05)
+
+    assert broadcaster._watchers == []
+
+
+async def test_streams_are_closed_on_shutdown(client):
+    broadcaster = client.server.app["telescope.broadcaster"]
+    response = await client.get("/events")
+    await read_event(response)
+    await read_event(response)
+
+    await broadcaster.close()
+
+    assert await response.content.read() == b""
+    assert broadcaster._watchers == []
@@ -1,15 +1,51 @@
-from collections import namedtuple
+import asyncio
+import gzip
+import inspect
+import sqlite3
+import threading
+import time
+from collections import Counter, namedtuple
+from datetime import date, datetime, timedelta, timezone
 from unittest import mock
 
 import pytest
+from yarl import URL
 
+from telescope import utils
+from telescope.app import Check
 from telescope.utils import (
     BugTracker,
     Cache,
+    CacheBackend,
+    CircuitBreaker,
+    CircuitOpenError,
+    ClientSession,
+    ConcurrencyBudget,
+    DeadlineExceeded,
     History,
+    RateLimiter,
+    SQLiteCache,
+    create_cache,
+    deadline,
     extract_json,
     fetch_bigquery,
+    fetch_head,
+    fetch_json,
+    iter_parallel,
+    json_decode,
+    json_dumps,
+    json_encode,
+    json_loads,
+    load_snapshot,
+    negotiate_encoding,
+    negotiate_media_types,
+    request_slot,
+    run_in_pool,
     run_parallel,
+    save_snapshot,
+    shared_session,
+    shutdown_pools,
+    utcnow,
 )
 
 
@@ -21,6 +57,425 @@ def test_cache_set_get():
     assert cache.get("b") is None
 
 
+def test_cache_max_entries_evicts_least_recently_used():
+    cache = Cache(max_entries=2)
+    cache.set("a", 1, ttl=10)
+    cache.set("b", 2, ttl=10)
+    cache.get("a")
+    cache.set("c", 3, ttl=10)
+
+    assert len(cache._content) == 2
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_cache_max_bytes():
+    cache = Cache(max_bytes=1000)
+    cache.set("a", "a" * 400, ttl=10)
+    cache.set("b", "b" * 400, ttl=10)
+    assert cache.get("a") is not None
+
+    cache.set("c", "c" * 400, ttl=10)
+    assert cache.get("b") is None
+    assert cache.size <= 1000
+
+    # A single entry bigger than the budget is kept anyway.
+    cache.set("d", "d" * 2000, ttl=10)
+    assert len(cache._content) == 1
+    assert cache.get("d") is not None
+
+
+def test_cache_overwrite_updates_size():
+    cache = Cache()
+    cache.set("a", "a" * 400, ttl=10)
+    size = cache.size
+    cache.set("a", "a" * 400, ttl=10)
+
+    assert cache.size == size
+
+
+def test_cache_sweeps_expired_entries():
+    cache = Cache(sweep_interval=60)
+    cache.set("a", 1, ttl=1)
+    cache.set("b", 2, ttl=1000)
+
+    later = utcnow() + timedelta(seconds=120)
+    with mock.patch("telescope.utils.utcnow", return_value=later):
+        cache.set("c", 3, ttl=1000)
+
+    assert len(cache._content) == 2
+    assert cache.get("b") == 2
+
+
+async def test_cache_locks_are_released():
+    cache = Cache()
+
+    async with cache.lock("a"):
+        assert cache.lock("a").locked()
+    async with cache.lock("b"):
+        pass
+
+    assert cache._locks == {}
+
+
+async def test_cache_locks_are_released_on_cancel():
+    cache = Cache()
+
+    async def wait_for_lock():
+        async with cache.lock("a"):
+            pass  # pragma: nocover
+
+    async with cache.lock("a"):
+        task = asyncio.create_task(wait_for_lock())
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    assert cache._locks == {}
+
+
+async def test_cache_backend_interface():
+    with pytest.raises(TypeError):
+        CacheBackend()  # type: ignore[abstract]
+
+    class Backend(CacheBackend):
+        lock = set = get = ttl = mock.Mock()
+
+    backend = Backend()
+    assert await backend.normalize((1, 2)) == (1, 2)
+    backend.close()
+
+
+async def test_sqlite_cache_normalize(sqlite_path):
+    cache = SQLiteCache(sqlite_path)
+    value = (datetime(2020, 1, 2), {1: (2, 2**70 + 1)})
+
+    assert await cache.normalize(value) == [datetime(2020, 1, 2), {"1": [2, 2**70 + 1]}]
+    cache.close()
+
+
+def test_create_cache(config, tmp_path):
+    assert isinstance(create_cache(), Cache)
+
+    config.CACHE_BACKEND = "sqlite"
+    config.CACHE_SQLITE_PATH = str(tmp_path / "cache.sqlite")
+    cache = create_cache()
+    assert isinstance(cache, SQLiteCache)
+    cache.close()
+
+    config.CACHE_BACKEND = "unknown"
+    with pytest.raises(ValueError):
+        create_cache()
+
+
+@pytest.fixture
+def sqlite_path(tmp_path):
+    return str(tmp_path / "cache.sqlite")
+
+
+def test_sqlite_cache_set_get(sqlite_path):
+    cache = SQLiteCache(sqlite_path)
+    now = utcnow()
+    cache.set("a", (now, True, {"b": [1, 2]}, 0.5), ttl=10)
+
+    assert cache.get("a") == [now, True, {"b": [1, 2]}, 0.5]
+    assert cache.get("b") is None
+
+
+def test_sqlite_cache_is_shared(sqlite_path):
+    cache = SQLiteCache(sqlite_path)
+    other = SQLiteCache(sqlite_path)
+    cache.set("a", 42, ttl=10)
+
+    assert other.get("a") == 42
+
+
+def test_sqlite_cache_expiration(sqlite_path):
+    cache = SQLiteCache(sqlite_path)
+    cache.set("a", 42, ttl=-1)
+
+    assert cache.get("a") is None
+
+
+def test_sqlite_cache_unserializable(sqlite_path):
+    cache = SQLiteCache(sqlite_path)
+
+    with pytest.raises(TypeError):
+        cache.set("a", object(), ttl=10)
+
+
+def test_sqlite_cache_sweep(sqlite_path):
+    cache = SQLiteCache(sqlite_path, max_entries=2, sweep_interval=-1)
+    cache.set("a", 1, ttl=-1)
+    cache.set("b", 2, ttl=10)
+    cache.set("c", 3, ttl=20)
+    cache.set("d", 4, ttl=30)
+
+    (count,) = cache._conn.execute("SELECT COUNT(*) FROM cache").fetchone()
+    assert count == 2
+    assert cache.get("b") is None
+    assert cache.get("d") == 4
+
+
+@pytest.fixture(params=["orjson", "json"])
+def json_library(config, request):
+    config.JSON_LIBRARY = request.param
+    return request.param
+
+
+def test_json_dumps_loads(json_library):
+    now = utcnow()
+    value = [now, True, {"b": [1, 2], "c": {"d": now}}, 0.5]
+
+    assert json_loads(json_dumps(value)) == value
+    assert json_loads(json_dumps({"a": 1})) == {"a": 1}
+
+
+def test_json_encode_decode(json_library):
+    value = {"a": [1, 2.5, None, "é"], 3: {"b": True}}
+
+    assert json_decode(json_encode(value)) == {
+        "a": [1, 2.5, None, "é"],
+        "3": {"b": True},
+    }
+    assert json_decode(json_encode(value).encode()) == json_decode(json_encode(value))
+    assert json_encode({"a": 1}, indent=True) == '{\n  "a": 1\n}'
+
+
+def test_json_encode_large_integers(json_library):
+    # Not representable as floats.
+    big = 2**70 + 1
+    assert json_decode(json_encode({"a": big})) == {"a": big}
+    assert json_decode(json_encode({"a": -big}).encode()) == {"a": -big}
+    assert json_loads(json_dumps({"a": big})) == {"a": big}
+    assert isinstance(json_decode(json_encode({"a": 2**63})), dict)
+
+
+def test_json_encode_default(json_library):
+    assert json_encode({"a": {1}}, default=list) in ('{"a":[1]}', '{"a": [1]}')
+    with pytest.raises(TypeError):
+        json_encode({"a": object()})
+
+
+def test_json_encode_datetimes(json_library):
+    value = {
+        "a": datetime(2020, 1, 2, 3, 4, 5, 6, tzinfo=timezone.utc),
+        "b": datetime(2020, 1, 2),
+        "c": date(2020, 1, 2),
+    }
+
+    assert json_decode(json_encode(value)) == {
+        "a": "2020-01-02T03:04:05.000006+00:00",
+        "b": "2020-01-02T00:00:00",
+        "c": "2020-01-02",
+    }
+    # Also when falling back to the standard library.
+    assert json_decode(json_encode({**value, "d": 2**70}))["a"] == (
+        "2020-01-02T03:04:05.000006+00:00"
+    )
+
+
+async def test_sqlite_cache_lock_is_shared_between_processes(sqlite_path):
+    cache = SQLiteCache(sqlite_path)
+    other = SQLiteCache(sqlite_path)
+    other.LOCK_POLL_INTERVAL_SECONDS = 0.01
+    events = []
+
+    async def compute(backend, name):
+        async with backend.lock("a"):
+            events.append(f"{name} start")
+            await asyncio.sleep(0.05)
+            events.append(f"{name} end")
+
+    await asyncio.gather(compute(cache, "first"), compute(other, "second"))
+
+    assert events == ["first start", "first end", "second start", "second end"]
+    (count,) = cache._conn.execute("SELECT COUNT(*) FROM locks").fetchone()
+    assert count == 0
+    assert cache._locks == {} and other._locks == {}
+
+
+async def test_sqlite_cache_lock_waiters_queue_locally(sqlite_path):
+    cache = SQLiteCache(sqlite_path)
+    events = []
+
+    async def compute(name):
+        async with cache.lock("a"):
+            events.append(name)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(compute("first"), compute("second"))
+
+    assert events == ["first", "second"]
+
+
+def test_sqlite_cache_expired_lock_is_taken_over(sqlite_path):
+    cache = SQLiteCache(sqlite_path, lock_ttl=-1)
+    other = SQLiteCache(sqlite_path)
+
+    assert cache.try_acquire("a")
+    assert other.try_acquire("a")
+    assert not cache.try_acquire("a")
+
+
+async def test_sqlite_cache_lock_released_on_cancel(sqlite_path):
+    cache = SQLiteCache(sqlite_path)
+    other = SQLiteCache(sqlite_path)
+    assert other.try_acquire("a")
+
+    async def wait_for_lock():
+        async with cache.lock("a"):
+            pass  # pragma: nocover
+
+    task = asyncio.create_task(wait_for_lock())
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert cache._locks == {}
+    other.release("a")
+    assert cache.try_acquire("a")
+
+
+async def test_sqlite_cache_does_not_block_event_loop(sqlite_path):
+    cache = SQLiteCache(sqlite_path)
+    # Another process is writing.
+    other = sqlite3.connect(sqlite_path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+
+    write = asyncio.create_task(cache.aset("a", 1, ttl=10))
+    lock = asyncio.create_task(cache.lock("b").__aenter__())
+    before = time.monotonic()
+    await asyncio.sleep(0.05)
+
+    assert time.monotonic() - before < 0.5
+    assert not write.done() and not lock.done()
+
+    other.execute("COMMIT")
+    await write
+    await (await lock).__aexit__()
+    assert await cache.aget("a") == 1
+    assert await cache.apeek("a") == 1
+    assert 0 < await cache.attl("a") <= 10
+
+
+async def test_cache_async_methods():
+    cache = Cache()
+
+    await cache.aset("a", 1, ttl=10)
+
+    assert await cache.aget("a") == 1
+    assert await cache.apeek("a") == 1
+    assert 0 < await cache.attl("a") <= 10
+
+
+def test_cache_ttl(sqlite_path):
+    for cache in (Cache(), SQLiteCache(sqlite_path)):
+        cache.set("a", 1, ttl=100)
+        cache.set("b", 1, ttl=-1)
+
+        assert 99 < cache.ttl("a") <= 100
+        assert cache.ttl("b") is None
+        assert cache.ttl("c") is None
+
+
+def fake_check(**kwargs):
+    return Check(
+        "p",
+        "n",
+        "",
+        module="tests.conftest",
+        ttl=kwargs.pop("ttl", 100),
+        params={"max_age": 1, "from_conf": 2, **kwargs},
+    )
+
+
+async def test_snapshot_roundtrip(tmp_path):
+    path = str(tmp_path / "snapshot.json.gz")
+    check = fake_check()
+    unknown = fake_check(max_age=42)
+    cache = Cache()
+    result = (utcnow(), True, {"a": [1, 2]}, 0.5)
+    cache.set(check.cache_key, result, ttl=100)
+
+    await save_snapshot(path, [check, unknown], cache)
+
+    restored = Cache()
+    await load_snapshot(path, [check], restored)
+    assert restored.get(check.cache_key) == result
+    assert 98 < restored.ttl(check.cache_key) <= 100
+
+
+async def test_snapshot_is_written_off_the_event_loop(tmp_path):
+    path = str(tmp_path / "snapshot.json.gz")
+    check = fake_check()
+    cache = Cache()
+    cache.set(check.cache_key, (utcnow(), True, None, 0.5), ttl=100)
+    loop = asyncio.get_running_loop()
+
+    with mock.patch.object(
+        loop, "run_in_executor", wraps=loop.run_in_executor
+    ) as mocked:
+        await save_snapshot(path, [check], cache)
+
+    assert mocked.call_args.args[1] is utils._write_snapshot
+
+
+async def test_snapshot_does_not_change_eviction_order(tmp_path):
+    check = fake_check()
+    cache = Cache()
+    cache.set(check.cache_key, (utcnow(), True, None, 0.5), ttl=100)
+    cache.set("other", 1, ttl=100)
+
+    await save_snapshot(str(tmp_path / "snapshot.json.gz"), [check], cache)
+
+    assert list(cache._content) == [check.cache_key, "other"]
+
+
+async def test_snapshot_skips_changed_configuration(tmp_path):
+    path = str(tmp_path / "snapshot.json.gz")
+    check = fake_check()
+    cache = Cache()
+    cache.set(check.cache_key, (utcnow(), True, None, 0.5), ttl=100)
+    await save_snapshot(path, [check], cache)
+
+    changed = fake_check(ttl=200)
+    assert changed.cache_key == check.cache_key
+    restored = Cache()
+    await load_snapshot(path, [changed], restored)
+
+    assert restored.get(check.cache_key) is None
+
+
+async def test_snapshot_skips_expired_entries(tmp_path):
+    path = str(tmp_path / "snapshot.json.gz")
+    check = fake_check()
+    cache = Cache()
+    cache.set(check.cache_key, (utcnow(), True, None, 0.5), ttl=100)
+    await save_snapshot(path, [check], cache)
+
+    later = time.time() + 200
+    restored = Cache()
+    with mock.patch("telescope.utils.time.time", return_value=later):
+        await load_snapshot(path, [check], restored)
+
+    assert restored.get(check.cache_key) is None
+
+
+async def test_snapshot_missing_or_corrupted_file(tmp_path, caplog):
+    path = tmp_path / "snapshot.json.gz"
+    cache = Cache()
+    await load_snapshot(str(path), [], cache)
+
+    path.write_text("not gzip")
+    await load_snapshot(str(path), [], cache)
+
+    assert "Could not load snapshot" in caplog.text
+
+
 async def test_fetch_bigquery(mock_aioresponses):
     with mock.patch("telescope.utils.bigquery.Client") as mocked:
         mocked.return_value.project = "wip"
@@ -49,6 +504,283 @@ async def test_fetch_bigquery_without_specific_project(mock_aioresponses):
         mocked.assert_called_with(project=None)
 
 
+def test_circuit_breaker_opens_after_threshold():
+    breaker = CircuitBreaker("host", threshold=2, recovery=10, max_recovery=30)
+    breaker.record_failure()
+    breaker.before_request()
+    assert breaker.state == "closed"
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+
+def test_circuit_breaker_probes_with_backoff():
+    breaker = CircuitBreaker("host", threshold=1, recovery=10, max_recovery=30)
+    now = time.monotonic()
+    breaker.record_failure()
+
+    with mock.patch("telescope.utils.time.monotonic", return_value=now + 11):
+        assert breaker.state == "half-open"
+        # Only one probe is let through.
+        breaker.before_request()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+        # Probe fails.
+        breaker.record_failure()
+        assert breaker.recovery == 20
+
+    with mock.patch("telescope.utils.time.monotonic", return_value=now + 25):
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+
+    with mock.patch("telescope.utils.time.monotonic", return_value=now + 32):
+        breaker.before_request()
+        breaker.record_failure()
+        assert breaker.recovery == 30  # max
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.recovery == 10
+
+
+def test_circuit_breaker_disabled():
+    breaker = CircuitBreaker("host", threshold=0)
+    for _ in range(10):
+        breaker.record_failure()
+    breaker.before_request()
+
+
+def test_circuit_breaker_by_host():
+    a = CircuitBreaker.for_url("http://a.local/foo")
+    assert CircuitBreaker.for_url("http://a.local/bar") is a
+    assert CircuitBreaker.for_url("http://b.local/foo") is not a
+    assert CircuitBreaker.states() == {"a.local": "closed", "b.local": "closed"}
+
+
+async def test_rate_limiter_paces_requests():
+    limiter = RateLimiter("host", rate=20)
+    limiter.tokens = 1
+    before = time.monotonic()
+
+    for _ in range(3):
+        async with limiter.request():
+            pass
+
+    # The first token is available right away.
+    assert time.monotonic() - before >= 0.09
+    assert limiter.active == 0
+
+
+async def test_rate_limiter_limits_concurrency():
+    limiter = RateLimiter("host", max_concurrency=2)
+    running = 0
+    max_running = 0
+
+    async def request():
+        nonlocal running, max_running
+        async with limiter.request():
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.001)
+            running -= 1
+
+    await asyncio.gather(*[request() for _ in range(10)])
+
+    assert max_running == 2
+
+
+def test_rate_limiter_aimd():
+    limiter = RateLimiter("host", max_concurrency=8)
+
+    limiter.record(429, {}, elapsed=0.01)
+    assert limiter.limit == 4
+    # Requests sent together fail together.
+    limiter.record(503, {}, elapsed=0.01)
+    assert limiter.limit == 4
+
+    for _ in range(4):
+        limiter.record(200, {}, elapsed=0.01)
+    assert 4.9 < limiter.limit < 5
+
+    limiter.decreased_at = 0
+    for _ in range(5):
+        limiter.record(200, {}, elapsed=2)
+    assert limiter.limit < 3
+
+
+def test_rate_limiter_honors_retry_after():
+    limiter = RateLimiter("host", max_pause=30)
+
+    limiter.record(429, {"Retry-After": "10"}, elapsed=0.01)
+    assert 9 < limiter.state["paused_seconds"] <= 10
+
+    limiter.record(503, {"Retry-After": "3600"}, elapsed=0.01)
+    assert limiter.state["paused_seconds"] <= 30
+
+
+def test_rate_limiter_honors_retry_after_dates():
+    limiter = RateLimiter("host", max_pause=30)
+    later = utcnow() + timedelta(seconds=20)
+
+    limiter.record(
+        503, {"Retry-After": later.strftime("%a, %d %b %Y %H:%M:%S GMT")}, elapsed=0.01
+    )
+
+    assert 18 < limiter.state["paused_seconds"] <= 20
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        {"Retry-After": "soon"},
+        {"Retry-After": "Mon, 01 Jan 2001 00:00:00 GMT"},
+        {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "soon"},
+    ],
+)
+def test_rate_limiter_ignores_invalid_or_past_pauses(headers):
+    limiter = RateLimiter("host")
+
+    limiter.record(429, headers, elapsed=0.01)
+
+    assert limiter.state["paused_seconds"] == 0
+
+
+async def test_rate_limiter_waits_while_paused():
+    limiter = RateLimiter("host")
+    limiter.record(429, {"Retry-After": "0.05"}, elapsed=0.01)
+    before = time.monotonic()
+
+    async with limiter.request():
+        pass
+
+    assert time.monotonic() - before >= 0.05
+
+
+async def test_rate_limiter_slows_down_on_connection_errors():
+    limiter = RateLimiter("host", max_concurrency=8)
+
+    with pytest.raises(asyncio.TimeoutError):
+        async with limiter.request():
+            raise asyncio.TimeoutError()
+
+    assert limiter.limit == 4
+    assert limiter.active == 0
+
+
+def test_rate_limiter_ignores_latency_of_server_errors():
+    limiter = RateLimiter("host", max_concurrency=8)
+
+    limiter.record(500, {}, elapsed=10)
+
+    assert limiter.limit == 8
+    assert limiter.latency is None
+
+
+def test_rate_limiter_honors_github_headers():
+    limiter = RateLimiter("api.github.com")
+    reset = str(int(time.time()) + 20)
+
+    limiter.record(
+        200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset}, elapsed=0.1
+    )
+
+    assert 18 < limiter.state["paused_seconds"] <= 20
+
+
+async def test_rate_limiter_configured_by_host(config):
+    config.RATE_LIMIT_REQUESTS_PER_SECOND = {"api.github.com": 1, "*": 50}
+
+    assert RateLimiter.for_url("https://api.github.com/repos").rate == 1
+    assert RateLimiter.for_url("https://cdn.local/file").rate == 50
+
+
+async def test_fetch_adapts_rate_limiter(mock_aioresponses, config):
+    url = "http://limited.local/"
+    mock_aioresponses.head(url, status=429, headers={"Retry-After": "5"})
+
+    await fetch_head(url)
+
+    state = RateLimiter.states()["limited.local"]
+    assert state["paused_seconds"] > 4
+    assert state["limit"] == config.REQUESTS_MAX_CONNECTIONS_PER_HOST / 2
+
+
+async def test_fetch_fails_fast_when_host_is_down(mock_aioresponses, config):
+    url = "http://down.local/"
+    mock_aioresponses.get(url, status=503, payload={}, repeat=True)
+    breaker = CircuitBreaker.for_url(url)
+    breaker.threshold = 2
+
+    await fetch_json(url)
+    await fetch_json(url)
+    assert breaker.state == "open"
+
+    with pytest.raises(CircuitOpenError):
+        await fetch_json(url)
+    # No retry on open circuit.
+    assert len(mock_aioresponses.requests[("GET", URL(url))]) == 2
+
+
+async def test_fetch_connection_errors_open_circuit(mock_aioresponses):
+    url = "http://unreachable.local/"
+    breaker = CircuitBreaker.for_url(url)
+    breaker.threshold = 1
+
+    with pytest.raises(CircuitOpenError):
+        # First attempt fails, retry fails fast.
+        await fetch_head(url)
+
+    mock_aioresponses.head(url)
+    breaker.opened_until = 0
+    status, _ = await fetch_head(url)
+    assert status == 200
+    assert breaker.state == "closed"
+
+
+async def test_client_session_is_short_lived_by_default():
+    async with ClientSession() as session:
+        pass
+    assert session.closed
+
+
+async def test_shared_session_is_reused(config):
+    config.REQUESTS_MAX_CONNECTIONS_PER_HOST = 3
+    async with shared_session() as shared:
+        async with ClientSession() as first:
+            pass
+        async with ClientSession() as second:
+            pass
+        assert first is second is shared
+        assert not shared.closed
+        assert shared.connector.limit_per_host == 3
+    assert shared.closed
+    assert utils._shared_session is None
+
+
+def test_shared_session_is_not_used_in_other_loops():
+    async def open_session():
+        await utils.open_shared_session()
+        return utils._shared_session
+
+    async def use_session():
+        async with ClientSession() as session:
+            return session
+
+    shared = asyncio.run(open_session())
+    try:
+        assert asyncio.run(use_session()) is not shared
+    finally:
+        utils._shared_session = None
+
+
+async def test_shared_session_in_app(cli):
+    assert utils._shared_session is not None
+    async with ClientSession() as session:
+        assert session is utils._shared_session
+
+
 async def test_run_parallel():
     async def success():
         return 42
@@ -60,6 +792,223 @@ async def test_run_parallel():
         await run_parallel(success(), failure(), success())
 
 
+async def test_run_parallel_closes_futures_never_started():
+    async def success():
+        return 42
+
+    async def failure():
+        raise ValueError()
+
+    futures = [failure(), success(), success()]
+    with pytest.raises(ValueError):
+        await run_parallel(*futures, parallel_workers=1)
+
+    # Not left behind as "never awaited" coroutines.
+    assert all(inspect.getcoroutinestate(f) == inspect.CORO_CLOSED for f in futures)
+
+
+async def test_run_parallel_keeps_order():
+    async def sleep(delay):
+        await asyncio.sleep(delay)
+        return delay
+
+    results = await run_parallel(sleep(0.03), sleep(0.01), sleep(0.02))
+
+    assert results == [0.03, 0.01, 0.02]
+
+
+async def test_run_parallel_nested_calls_stay_within_budget():
+    budget = ConcurrencyBudget.current()
+    budget.max_workers = 2
+    running = 0
+    max_running = 0
+
+    async def leaf():
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.001)
+        running -= 1
+
+    async def branch():
+        return await run_parallel(*[leaf() for _ in range(5)])
+
+    # Does not dead lock, even if workers are exhausted.
+    await asyncio.wait_for(run_parallel(*[branch() for _ in range(5)]), timeout=5)
+
+    # The top-level caller, plus the workers of the budget.
+    assert max_running <= 1 + budget.max_workers
+    assert budget.workers == 0
+
+
+async def test_iter_parallel_yields_as_completed():
+    async def sleep(delay):
+        await asyncio.sleep(delay)
+        return delay
+
+    factories = [lambda d=d: sleep(d) for d in (0.03, 0.01, 0.02)]
+    results = [item async for item in iter_parallel(factories)]
+
+    assert results == [(1, 0.01), (2, 0.02), (0, 0.03)]
+
+
+async def test_iter_parallel_pulls_factories_lazily():
+    pulled = 0
+
+    async def factories():
+        nonlocal pulled
+        for i in range(1000):
+            pulled += 1
+            yield lambda i=i: asyncio.sleep(0, result=i)
+
+    results = iter_parallel(factories(), parallel_workers=4)
+    first = await results.__anext__()
+    await results.aclose()
+
+    assert first[1] < 1000
+    assert pulled < 100
+
+
+async def test_iter_parallel_fail_fast_cancels_pending():
+    cancelled = False
+
+    async def slow():
+        nonlocal cancelled
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+
+    async def failure():
+        raise ValueError()
+
+    with pytest.raises(ValueError):
+        async for _ in iter_parallel([slow, failure], fail_fast=True):
+            pass
+
+    assert cancelled
+    assert ConcurrencyBudget.current().workers == 0
+
+
+async def test_iter_parallel_raises_first_error_at_the_end():
+    async def failure():
+        raise ValueError()
+
+    results = []
+    with pytest.raises(ValueError):
+        async for item in iter_parallel(
+            [failure, lambda: asyncio.sleep(0.01, result=42)]
+        ):
+            results.append(item)
+
+    assert results == [(1, 42)]
+
+
+async def test_iter_parallel_raises_errors_of_the_factories_iterable():
+    async def factories():
+        yield lambda: asyncio.sleep(0, result=42)
+        raise ValueError()
+
+    results = []
+    with pytest.raises(ValueError):
+        async for item in iter_parallel(factories()):
+            results.append(item)
+
+    assert results == [(0, 42)]
+
+
+async def test_iter_parallel_without_workers_available():
+    budget = ConcurrencyBudget.current()
+    budget.max_workers = 0
+
+    async def failure():
+        raise ValueError()
+
+    results = []
+    with pytest.raises(ValueError):
+        async for item in iter_parallel([failure, lambda: asyncio.sleep(0, result=42)]):
+            results.append(item)
+
+    # Consumed sequentially, the first error raised at the end.
+    assert results == [(1, 42)]
+
+
+async def test_iter_parallel_stops_at_deadline():
+    async def sleep(delay):
+        await asyncio.sleep(delay)
+        return delay
+
+    results = []
+    with deadline(0.05):
+        with pytest.raises(DeadlineExceeded):
+            async for _, result in iter_parallel(
+                [lambda d=d: sleep(d) for d in (0.01, 10, 10)]
+            ):
+                results.append(result)
+
+    assert results == [0.01]
+    assert ConcurrencyBudget.current().workers == 0
+
+
+async def test_nested_deadlines_can_only_be_shorter():
+    with deadline(0.01):
+        with deadline(10):
+            with pytest.raises(DeadlineExceeded):
+                await asyncio.sleep(0.02)
+                async with request_slot("http://a.local"):
+                    pass
+
+
+async def test_request_slot_is_cancelled_at_deadline():
+    with deadline(0.01):
+        with pytest.raises(DeadlineExceeded):
+            async with request_slot("http://a.local"):
+                await asyncio.sleep(10)
+
+
+async def test_concurrency_budget_limits_requests_per_host():
+    budget = ConcurrencyBudget(max_requests=3, max_requests_per_host=2)
+    running = Counter()
+    max_running = Counter()
+
+    async def request(url):
+        host = URL(url).host
+        async with budget.request(url):
+            running[host] += 1
+            running["total"] += 1
+            max_running[host] = max(max_running[host], running[host])
+            max_running["total"] = max(max_running["total"], running["total"])
+            await asyncio.sleep(0.001)
+            running[host] -= 1
+            running["total"] -= 1
+
+    await asyncio.gather(
+        *[request("http://a/") for _ in range(5)],
+        *[request("http://b/") for _ in range(5)],
+    )
+
+    assert max_running["a"] == 2
+    assert max_running["b"] == 2
+    assert max_running["total"] == 3
+
+
+async def test_run_in_pool():
+    try:
+        assert await run_in_pool(sum, [1, 2, 3]) == 6
+        assert await run_in_pool(sum, [1, 2], threads=True) == 3
+    finally:
+        shutdown_pools()
+
+
+async def test_run_in_pool_threads_only(config):
+    config.CPU_POOL = "thread"
+    thread_name = await run_in_pool(lambda: threading.current_thread().name)
+
+    assert thread_name.startswith("telescope-cpu")
+    shutdown_pools()
+
+
 def test_extract_json():
     data = {
         "min_timestamp": "2020-09-24T10:29:44.925",
@@ -324,6 +1273,34 @@ async def test_bugzilla_fetch_with_empty_cache(mock_aioresponses, config):
     assert len(results) == 1
 
 
+async def test_bugzilla_generation_changes_when_fetched(mock_aioresponses, config):
+    config.BUGTRACKER_URL = "https://bugzilla.mozilla.org"
+    mock_aioresponses.get(
+        config.BUGTRACKER_URL + "/rest/bug?whiteboard=telescope ",
+        payload={"bugs": []},
+        repeat=True,
+    )
+    cache = Cache()
+    tracker = BugTracker(cache=cache)
+
+    await tracker.fetch(project="telemetry", name="pipeline")
+    first = await tracker.generation()
+    await tracker.fetch(project="telemetry", name="other")
+    assert await tracker.generation() == first
+
+    cache.set("bugtracker-list", None, ttl=0)
+    await tracker.fetch(project="telemetry", name="pipeline")
+
+    assert first is not None
+    assert await tracker.generation() != first
+
+
+async def test_bugzilla_generation_without_cache():
+    tracker = BugTracker()
+
+    assert await tracker.generation() != await tracker.generation()
+
+
 async def test_history_fetch_fallsback_to_empty_list(event_loop, config):
     config.HISTORY_DAYS = 1
     history = History()
@@ -431,3 +1408,78 @@ async def test_history_fetch_with_empty_cache(event_loop, config):
         results = await history.fetch(project="crlite", name="filter-age")
 
     assert len(results) == 1
+
+
+async def test_history_generation_changes_when_fetched(config):
+    config.HISTORY_DAYS = 0
+    cache = Cache()
+    history = History(cache=cache)
+
+    await history.fetch(project="crlite", name="filter-age")
+    first = await history.generation()
+    cache.set("scalar-history", None, ttl=0)
+    await history.fetch(project="crlite", name="filter-age")
+
+    assert first is not None
+    assert await history.generation() != first
+
+
+async def test_generations_ignore_age():
+    request = mock.MagicMock()
+    request.app = {
+        "telescope.tracker": mock.MagicMock(
+            generation=mock.AsyncMock(return_value="a")
+        ),
+        "telescope.history": mock.MagicMock(
+            generation=mock.AsyncMock(return_value="b")
+        ),
+    }
+    result = {"name": "fake", "datetime": "2020-01-01T00:00:00", "stale": True}
+
+    first = await utils._generations(request, [{**result, "age": 70}])
+    second = await utils._generations(request, [{**result, "age": 75}])
+
+    assert first == second
+
+
+def test_negotiate_encoding(config):
+    config.COMPRESSION_ENCODINGS = ["zstd", "br", "gzip"]
+
+    assert negotiate_encoding("") is None
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("deflate, gzip") == "gzip"
+    assert negotiate_encoding("GZIP;q=0.5") == "gzip"
+    assert negotiate_encoding("gzip;q=0") is None
+    assert negotiate_encoding("gzip;q=abc") is None
+    assert negotiate_encoding("*") == "gzip"
+    assert negotiate_encoding("*, gzip;q=0") is None
+
+
+def test_negotiate_encoding_prefers_highest_quality(config):
+    config.COMPRESSION_ENCODINGS = ["zstd", "br", "gzip"]
+
+    with mock.patch(
+        "telescope.utils.compressors",
+        return_value={"gzip": gzip.compress, "br": gzip.compress},
+    ):
+        assert negotiate_encoding("gzip, br") == "br"
+        assert negotiate_encoding("gzip, br;q=0.5") == "gzip"
+
+
+def test_negotiate_media_types():
+    offers = ["text/plain", "application/x-ndjson", "application/json"]
+    explicit = ["text/plain", "application/x-ndjson"]
+
+    assert negotiate_media_types("", offers, explicit) == []
+    assert negotiate_media_types("*/*", offers, explicit) == ["application/json"]
+    assert negotiate_media_types("application/*", offers, explicit) == [
+        "application/json"
+    ]
+    assert negotiate_media_types("application/x-ndjson;q=0", offers, explicit) == []
+    assert negotiate_media_types(
+        "application/x-ndjson;q=0.5, application/json", offers, explicit
+    ) == ["application/json", "application/x-ndjson"]
+    assert negotiate_media_types(
+        "Application/JSON, text/plain; charset=utf-8", offers, explicit
+    ) == ["text/plain", "application/json"]
+    assert negotiate_media_types("*/*, application/json;q=0", offers, explicit) == []
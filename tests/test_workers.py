@@ -0,0 +1,195 @@
+import asyncio
+import os
+from unittest import mock
+
+from telescope.app import Checks, init_app, main, serve_worker
+from telescope.utils import Cache, SQLiteCache
+from telescope.workers import Supervisor, WorkerHeartbeat, workers_status
+
+
+async def test_workers_status():
+    cache = Cache()
+    await WorkerHeartbeat(cache, 1, interval=5).beat()
+
+    assert await workers_status(cache, 3) == {
+        "worker-0": "unresponsive",
+        "worker-1": "ok",
+        "worker-2": "unresponsive",
+    }
+
+
+async def test_workers_status_is_shared_between_processes(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    await WorkerHeartbeat(SQLiteCache(path), 0, interval=5).beat()
+
+    status = await workers_status(SQLiteCache(path), 1)
+
+    assert status == {"worker-0": "ok"}
+
+
+async def test_worker_beats_periodically():
+    cache = Cache()
+    heartbeat = WorkerHeartbeat(cache, 0, interval=0.01)
+
+    def fail_second_beat(*args, **kwargs):
+        if mocked.call_count == 2:
+            raise ValueError("boom")
+
+    with mock.patch.object(cache, "set", side_effect=fail_second_beat) as mocked:
+        await heartbeat.start()
+        # Wait for a few beats, even on a busy machine.
+        for _ in range(100):
+            if mocked.call_count > 2:
+                break
+            await asyncio.sleep(0.01)
+        await heartbeat.stop()
+
+    assert mocked.call_count > 2
+
+
+async def test_heartbeat_reports_workers(aiohttp_client, config):
+    config.WORKERS = 2
+    app = init_app(Checks([]), worker=0)
+    client = await aiohttp_client(app)
+    cache = app["telescope.cache"]
+
+    response = await client.get("/__heartbeat__")
+    body = await response.json()
+
+    assert body["worker-0"] == "ok"
+    assert body["worker-1"] == "unresponsive"
+    assert response.status == 503
+
+    await WorkerHeartbeat(cache, 1).beat()
+    response = await client.get("/__heartbeat__")
+    body = await response.json()
+
+    assert body["worker-1"] == "ok"
+
+
+async def test_heartbeat_does_not_wait_for_slow_cache(aiohttp_client, config):
+    config.WORKERS = 2
+    config.HEARTBEAT_TIMEOUT_SECONDS = 0.01
+    app = init_app(Checks([]), worker=0)
+    client = await aiohttp_client(app)
+
+    async def slow_get(key):
+        await asyncio.sleep(1)
+
+    with mock.patch.object(app["telescope.cache"], "aget", side_effect=slow_get):
+        response = await client.get("/__heartbeat__")
+    body = await response.json()
+
+    assert body["worker-0"] == "Worker status timed out"
+    assert body["worker-1"] == "Worker status timed out"
+    assert response.status == 503
+
+
+async def test_heartbeat_without_workers(cli):
+    response = await cli.get("/__heartbeat__")
+    body = await response.json()
+
+    assert not any(k.startswith("worker-") for k in body)
+
+
+async def test_only_first_worker_runs_checks_in_background(config, tmp_path):
+    config.SCHEDULER_ENABLED = True
+    config.SNAPSHOT_FILE = str(tmp_path / "snapshot.json.gz")
+
+    runner = init_app(Checks([]), worker=0)
+    other = init_app(Checks([]), worker=1)
+
+    assert "telescope.scheduler" in runner
+    assert "telescope.scheduler" not in other
+    assert len(other.on_startup) < len(runner.on_startup)
+
+
+def test_supervisor_restarts_exited_workers():
+    supervisor = Supervisor(os._exit, workers=2)
+    supervisor.RESTART_DELAY_SECONDS = 0
+    supervisor.start()
+    try:
+        first = supervisor.processes[1]
+        restarted = []
+        while 1 not in restarted:
+            restarted += supervisor.watch(timeout=10)
+    finally:
+        supervisor.stop()
+
+    assert supervisor.processes[1] is not first
+    assert first.exitcode == 1
+
+
+def test_supervisor_does_not_restart_workers_when_stopping():
+    supervisor = Supervisor(os._exit, workers=1)
+    supervisor.RESTART_DELAY_SECONDS = 0
+    supervisor.start()
+    try:
+        first = supervisor.processes[0]
+        first.join(timeout=10)
+        supervisor._stopping = True
+
+        restarted = supervisor.watch(timeout=10)
+    finally:
+        supervisor.stop()
+
+    assert restarted == []
+    assert supervisor.processes[0] is first
+
+
+def test_supervisor_stops_workers_on_sigterm():
+    supervisor = Supervisor(os._exit, workers=1)
+
+    def watch(timeout):
+        supervisor._on_sigterm(None, None)
+
+    with mock.patch("telescope.workers.signal.signal"):
+        with mock.patch.object(supervisor, "start"):
+            with mock.patch.object(supervisor, "watch", side_effect=watch):
+                with mock.patch.object(supervisor, "stop") as mocked:
+                    supervisor.run()
+
+    assert mocked.called
+
+
+def test_supervisor_stops_workers_on_interrupt():
+    supervisor = Supervisor(os._exit, workers=1)
+
+    with mock.patch("telescope.workers.signal.signal"):
+        with mock.patch.object(supervisor, "start"):
+            with mock.patch.object(supervisor, "watch", side_effect=KeyboardInterrupt):
+                with mock.patch.object(supervisor, "stop") as mocked:
+                    supervisor.run()
+
+    assert mocked.called
+
+
+def test_serve_worker(config, test_config_toml):
+    with mock.patch("telescope.app.web.run_app") as mocked:
+        serve_worker(1)
+
+    app = mocked.call_args[0][0]
+    assert app["telescope.worker"].worker == 1
+    assert mocked.call_args[1]["reuse_port"] is True
+
+
+def test_main_requires_shared_cache_with_workers(config, test_config_toml):
+    config.WORKERS = 2
+    config.CACHE_BACKEND = "memory"
+
+    with mock.patch("telescope.app.workers.Supervisor") as mocked:
+        result = main([])
+
+    assert result == 2
+    assert not mocked.called
+
+
+def test_main_runs_workers(config, test_config_toml):
+    config.WORKERS = 3
+    config.CACHE_BACKEND = "sqlite"
+
+    with mock.patch("telescope.app.workers.Supervisor") as mocked:
+        main([])
+
+    mocked.assert_called_with(mock.ANY, 3)
+    assert mocked.return_value.run.called